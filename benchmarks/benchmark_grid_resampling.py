@@ -0,0 +1,82 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants import processing
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor
+
+ROWS_COUNTS = (1_000, 10_000, 100_000)
+NAN_SHARE = 0.1
+REPEATS_COUNT = 5
+
+
+def make_heating_obj_df(rows_count: int) -> pd.DataFrame:
+    random_state = np.random.RandomState(42)
+    start_timestamp = pd.Timestamp("2021-01-01", tz=gettz("Asia/Yekaterinburg"))
+    seconds = np.sort(random_state.randint(0, rows_count * int(TIME_TICK.total_seconds()), rows_count))
+    heating_obj_df = pd.DataFrame({column_names.TIMESTAMP: start_timestamp + pd.to_timedelta(seconds, unit="s")})
+    for column_name in processing.BOILER_NEED_INTERPOLATE_COLUMNS:
+        values = random_state.uniform(0, 100, rows_count)
+        values[random_state.rand(rows_count) < NAN_SHARE] = np.nan
+        heating_obj_df[column_name] = values
+    return heating_obj_df
+
+
+def make_processor(**kwargs) -> SoftMHeatingObjProcessor:
+    timestamp_round_algorithm = CeilTimestampRoundAlgorithm(round_step=TIME_TICK)
+    return SoftMHeatingObjProcessor(
+        columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+        timestamp_round_algorithm=timestamp_round_algorithm,
+        timestamp_interpolation_algorithm=TimestampInterpolationAlgorithm(timestamp_round_algorithm, TIME_TICK),
+        border_values_interpolation_algorithm=LinearInsideValueInterpolationAlgorithm(),
+        internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm(),
+        timestamp_filter_algorithm=LeftClosedTimestampFilterAlgorithm(),
+        **kwargs
+    )
+
+
+def main() -> None:
+    chained_processor = make_processor()
+    fused_processor = make_processor(
+        grid_resampler=SoftMGridResampler(CeilTimestampRoundAlgorithm(round_step=TIME_TICK), TIME_TICK)
+    )
+    for rows_count in ROWS_COUNTS:
+        heating_obj_df = make_heating_obj_df(rows_count)
+        timestamps = heating_obj_df[column_names.TIMESTAMP]
+        # Narrow window in the middle of the data is the usual request of the scheduler
+        min_timestamp = timestamps.iloc[rows_count // 4]
+        max_timestamp = timestamps.iloc[rows_count // 2]
+        for window_name, window in (("full", (None, None)), ("quarter", (min_timestamp, max_timestamp))):
+            pd.testing.assert_frame_equal(
+                fused_processor.process_heating_obj(heating_obj_df, *window),
+                chained_processor.process_heating_obj(heating_obj_df, *window),
+                check_index_type=False,
+                check_freq=False
+            )
+            chained_time = min(timeit.repeat(
+                lambda: chained_processor.process_heating_obj(heating_obj_df, *window),
+                number=1,
+                repeat=REPEATS_COUNT
+            ))
+            fused_time = min(timeit.repeat(
+                lambda: fused_processor.process_heating_obj(heating_obj_df, *window),
+                number=1,
+                repeat=REPEATS_COUNT
+            ))
+            print(f"{rows_count} rows, {window_name} window")
+            print(f"  Chained algorithms: {chained_time * 1000:.2f} ms")
+            print(f"  SoftMGridResampler: {fused_time * 1000:.2f} ms ({chained_time / fused_time:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import io
+import json
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder, get_available_json_backends
+
+RECORDS_COUNTS = (1_000, 100_000, 500_000)
+REPEATS_COUNT = 3
+
+
+def make_weather_forecast_content(records_count: int) -> bytes:
+    random_state = np.random.RandomState(42)
+    temps = random_state.uniform(-40, 30, records_count).round(1)
+    return json.dumps([
+        {"date": f"2021-03-{record_number % 28 + 1:02}", "time": f"{record_number % 24:02}:00", "temp": temp}
+        for record_number, temp in enumerate(temps.tolist())
+    ]).encode("utf-8")
+
+
+def benchmark(name: str, decode, content: bytes) -> None:
+    decoding_time = min(timeit.repeat(lambda: decode(io.BytesIO(content)), number=1, repeat=REPEATS_COUNT))
+    print(f"  {name:<24} {decoding_time * 1000:10.2f} ms")
+
+
+def main() -> None:
+    for records_count in RECORDS_COUNTS:
+        content = make_weather_forecast_content(records_count)
+        print(f"{records_count} records, {len(content) / 1024 / 1024:.1f} MiB")
+        benchmark("pandas.read_json", lambda stream: pd.read_json(stream, convert_dates=False), content)
+        benchmark("json.load + DataFrame", lambda stream: pd.DataFrame(json.load(stream)), content)
+        for backend in get_available_json_backends():
+            decoder = SoftMJSONColumnsDecoder(backend=backend)
+            benchmark(f"decoder ({backend})", decoder.decode_from_binary_stream, content)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from dateutil.tz import gettz
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_loader import \
+    SoftMChernushkaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_loader import SoftMLysvaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+
+# The stand-in server lives with the tests, it is not a part of the package
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tests"))
+from soft_m_api_stand_in_server import SoftMAPIStandInServer  # noqa: E402
+
+LOADER_NAMES = ("weather", "lysva_temp_graph", "chernushka_temp_graph")
+PERCENTILES = (50, 95, 99)
+
+
+def make_load_functions(api_base: str,
+                        transport: SoftMSyncHTTPTransport,
+                        boiler_ids_count: int
+                        ) -> Dict[str, Callable[[int], Any]]:
+    weather_loader = SoftMSyncWeatherForecastOnlineLoader(
+        reader=SoftMSyncWeatherForecastJSONReader(weather_data_timezone=gettz("Asia/Yekaterinburg")),
+        server_address=api_base,
+        transport=transport
+    )
+    lysva_temp_graph_loader = SoftMLysvaSyncTempGraphOnlineLoader(
+        reader=SoftMLysvaSyncTempGraphOnlineReader(),
+        api_base=api_base,
+        transport=transport
+    )
+    chernushka_temp_graph_loaders = [
+        SoftMChernushkaSyncTempGraphOnlineLoader(
+            reader=SoftMChernushkaSyncTempGraphOnlineReader(),
+            boiler_id=boiler_id,
+            api_base=api_base,
+            transport=transport
+        )
+        for boiler_id in range(1, boiler_ids_count + 1)
+    ]
+    return {
+        "weather": lambda request_number: weather_loader.load_weather(),
+        "lysva_temp_graph": lambda request_number: lysva_temp_graph_loader.load_temp_graph(),
+        "chernushka_temp_graph": lambda request_number: chernushka_temp_graph_loaders[
+            request_number % boiler_ids_count
+        ].load_temp_graph()
+    }
+
+
+def measure_latency(load_function: Callable[[int], Any],
+                    requests_count: int,
+                    concurrency: int
+                    ) -> Dict[str, float]:
+    latencies: List[float] = []
+    failures: List[Exception] = []
+    lock = threading.Lock()
+
+    def load(request_number: int) -> None:
+        start_time = time.perf_counter()
+        try:
+            load_function(request_number)
+        except Exception as e:
+            with lock:
+                failures.append(e)
+            return
+        latency = time.perf_counter() - start_time
+        with lock:
+            latencies.append(latency)
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(load, range(requests_count)))
+    elapsed = time.perf_counter() - start_time
+
+    report = {
+        "requests": requests_count,
+        "failures": len(failures),
+        "throughput": len(latencies) / elapsed
+    }
+    percentiles = [float("nan")] * len(PERCENTILES)
+    if latencies:
+        percentiles = np.percentile(latencies, PERCENTILES)
+    for percentile, latency in zip(PERCENTILES, percentiles):
+        report[f"p{percentile}"] = latency
+    return report
+
+
+def run(api_base: str, args: argparse.Namespace, stand_in: Optional[SoftMAPIStandInServer]) -> None:
+    transport = SoftMSyncHTTPTransport(
+        max_retries=args.max_retries,
+        pool_max_size=args.concurrency
+    )
+    try:
+        load_functions = make_load_functions(api_base, transport, args.boiler_ids)
+        print(f"{args.requests} requests per loader at concurrency {args.concurrency} to {api_base}")
+        for loader_name in args.loaders:
+            report = measure_latency(load_functions[loader_name], args.requests, args.concurrency)
+            print(
+                f"{loader_name:<24}"
+                f" p50 {report['p50'] * 1000:8.1f} ms"
+                f" p95 {report['p95'] * 1000:8.1f} ms"
+                f" p99 {report['p99'] * 1000:8.1f} ms"
+                f" {report['throughput']:8.1f} req/s"
+                f" {report['failures']} failed"
+            )
+    finally:
+        transport.close()
+    if stand_in is not None:
+        print(
+            f"Stand-in served {stand_in.requests_count} requests,"
+            f" {stand_in.errors_count} errors, {stand_in.throttled_count} throttled"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Latency of SoftM online loaders under concurrent load")
+    parser.add_argument("--api-base", help="Load this server instead of a local stand-in")
+    parser.add_argument("--loaders", nargs="+", choices=LOADER_NAMES, default=list(LOADER_NAMES))
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--boiler-ids", type=int, default=4, help="Chernushka boilers to rotate through")
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.02, help="Stand-in latency, seconds")
+    parser.add_argument("--latency-jitter", type=float, default=0.01, help="Stand-in latency jitter, seconds")
+    parser.add_argument("--weather-rows", type=int, default=72, help="Stand-in weather forecast rows")
+    parser.add_argument("--temp-graph-rows", type=int, default=51, help="Stand-in temp graph rows")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stand-in share of failed requests")
+    parser.add_argument("--max-rps", type=float, help="Stand-in throttling, requests per second")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if args.api_base is not None:
+        run(args.api_base, args, None)
+        return 0
+
+    with SoftMAPIStandInServer(
+            latency=args.latency,
+            latency_jitter=args.latency_jitter,
+            weather_forecast_rows_count=args.weather_rows,
+            temp_graph_rows_count=args.temp_graph_rows,
+            error_rate=args.error_rate,
+            max_requests_per_second=args.max_rps,
+            seed=args.seed
+    ) as stand_in:
+        run(stand_in.api_base, args, stand_in)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,60 @@
+import timeit
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+
+from boiler_softm.temp_graph.temp_graph_lookup import SoftMTempGraphLookup
+
+TEMP_GRAPH_POINTS_COUNT = 51
+WEATHER_TEMPS_COUNT = 10_000
+REPEATS_COUNT = 5
+
+
+def make_temp_graph_df() -> pd.DataFrame:
+    weather_temps = np.linspace(10, -40, TEMP_GRAPH_POINTS_COUNT)
+    return pd.DataFrame({
+        column_names.WEATHER_TEMP: weather_temps,
+        column_names.FORWARD_PIPE_COOLANT_TEMP: 60 - weather_temps,
+        column_names.BACKWARD_PIPE_COOLANT_TEMP: 45 - weather_temps / 2
+    })
+
+
+def lookup_by_filtering(temp_graph_df: pd.DataFrame, weather_temps: pd.Series) -> pd.DataFrame:
+    required_temps = []
+    for weather_temp in weather_temps:
+        distances = (temp_graph_df[column_names.WEATHER_TEMP] - weather_temp).abs()
+        point = temp_graph_df[distances == distances.min()].iloc[-1]
+        required_temps.append((
+            point[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            point[column_names.BACKWARD_PIPE_COOLANT_TEMP]
+        ))
+    return pd.DataFrame(
+        required_temps,
+        columns=[column_names.FORWARD_PIPE_COOLANT_TEMP, column_names.BACKWARD_PIPE_COOLANT_TEMP],
+        index=weather_temps.index
+    )
+
+
+def main() -> None:
+    temp_graph_df = make_temp_graph_df()
+    weather_temps = pd.Series(np.random.RandomState(42).uniform(-45, 15, WEATHER_TEMPS_COUNT))
+    temp_graph_lookup = SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df)
+
+    filtering_time = min(timeit.repeat(
+        lambda: lookup_by_filtering(temp_graph_df, weather_temps),
+        number=1,
+        repeat=REPEATS_COUNT
+    ))
+    lookup_time = min(timeit.repeat(
+        lambda: temp_graph_lookup.lookup(weather_temps),
+        number=1,
+        repeat=REPEATS_COUNT
+    ))
+    print(f"{WEATHER_TEMPS_COUNT} weather temps, {TEMP_GRAPH_POINTS_COUNT} temp graph points")
+    print(f"DataFrame filtering: {filtering_time * 1000:.2f} ms")
+    print(f"SoftMTempGraphLookup: {lookup_time * 1000:.2f} ms ({filtering_time / lookup_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
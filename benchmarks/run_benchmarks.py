@@ -0,0 +1,271 @@
+import argparse
+import gc
+import io
+import json
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from boiler.constants import circuit_types, column_names
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters, processing
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.batch_processing import SoftMHeatingObjBatchProcessor
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.temp_graph_lookup import SoftMTempGraphLookup
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+from boiler_softm.weather.processing import SoftMWeatherProcessor
+from boiler_softm.weather.processing_cache import SoftMWeatherProcessingCache
+
+import soft_m_data_generators
+
+TIMEZONE = gettz("Asia/Yekaterinburg")
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_REPEATS_COUNT = 3
+DEFAULT_TOLERANCE = 0.25
+# Hourly forecasts of more rows do not fit into the pandas timestamp range
+MAX_HOURLY_WEATHER_FORECAST_ROWS_COUNT = 1_000_000
+TEMP_GRAPH_POINTS_COUNT = 51
+
+
+def measure(stage_function: Callable[[], Any], repeats_count: int) -> Tuple[float, int, Any]:
+    seconds = float("inf")
+    for _ in range(repeats_count):
+        gc.collect()
+        start_time = time.perf_counter()
+        stage_function()
+        seconds = min(seconds, time.perf_counter() - start_time)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = stage_function()
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return seconds, peak_memory_bytes, result
+
+
+def make_heating_obj_reader() -> SoftMSyncHeatingObjCSVReader:
+    return SoftMSyncHeatingObjCSVReader(
+        timestamp_parser=SoftMVectorizedTimestampParsingAlgorithm(timezone=TIMEZONE),
+        need_columns=converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS,
+        float_columns=converting_parameters.LYSVA_BOILER_FLOAT_COLUMNS,
+        water_temp_columns=[column_names.FORWARD_PIPE_COOLANT_TEMP],
+        need_circuit=circuit_types.HOT_WATER
+    )
+
+
+def make_processor_algorithms() -> Dict[str, Any]:
+    timestamp_round_algorithm = CeilTimestampRoundAlgorithm(round_step=TIME_TICK)
+    return {
+        "timestamp_round_algorithm": timestamp_round_algorithm,
+        "timestamp_interpolation_algorithm": TimestampInterpolationAlgorithm(timestamp_round_algorithm, TIME_TICK),
+        "border_values_interpolation_algorithm": LinearInsideValueInterpolationAlgorithm(),
+        "internal_values_interpolation_algorithm": LinearOutsideValueInterpolationAlgorithm(),
+        "timestamp_filter_algorithm": LeftClosedTimestampFilterAlgorithm()
+    }
+
+
+def make_grid_resampler() -> SoftMGridResampler:
+    return SoftMGridResampler(CeilTimestampRoundAlgorithm(round_step=TIME_TICK), TIME_TICK)
+
+
+def get_heating_obj_stages(rows_count: int) -> List[Tuple[str, int, Callable[[], Any]]]:
+    content = soft_m_data_generators.generate_heating_obj_csv(rows_count)
+    reader = make_heating_obj_reader()
+    # Stages of the reader are measured one by one on the output of the previous stage
+    raw_df = reader._read_csv(io.BytesIO(content))
+    circuit_df = reader._exclude_unused_circuits(raw_df)
+    renamed_df = reader._rename_equal_columns(circuit_df)
+    parsed_df = reader._parse_timestamp(renamed_df)
+    float_df = reader._convert_values_to_float(parsed_df)
+    cleaned_df = reader._apply_data_quality_rules(float_df)
+    heating_obj_df = reader._exclude_unused_columns(cleaned_df)
+
+    processor = SoftMHeatingObjProcessor(
+        columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+        **make_processor_algorithms()
+    )
+    fused_processor = SoftMHeatingObjProcessor(
+        columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+        grid_resampler=make_grid_resampler(),
+        **make_processor_algorithms()
+    )
+    batch_processor = SoftMHeatingObjBatchProcessor(
+        columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+        timestamp_round_algorithm=CeilTimestampRoundAlgorithm(round_step=TIME_TICK)
+    )
+    min_timestamp = heating_obj_df[column_names.TIMESTAMP].min()
+    max_timestamp = heating_obj_df[column_names.TIMESTAMP].max()
+    heating_objs_dfs = {f"heating_obj_{number}": heating_obj_df for number in range(4)}
+
+    circuit_rows_count = len(circuit_df)
+    return [
+        ("heating_obj_reader.read_csv", rows_count, lambda: reader._read_csv(io.BytesIO(content))),
+        ("heating_obj_reader.exclude_unused_circuits", rows_count, lambda: reader._exclude_unused_circuits(raw_df)),
+        ("heating_obj_reader.rename_columns", circuit_rows_count, lambda: reader._rename_equal_columns(circuit_df)),
+        ("heating_obj_reader.parse_timestamp", circuit_rows_count, lambda: reader._parse_timestamp(renamed_df)),
+        ("heating_obj_reader.convert_values_to_float", circuit_rows_count,
+         lambda: reader._convert_values_to_float(parsed_df)),
+        ("heating_obj_reader.apply_data_quality_rules", circuit_rows_count,
+         lambda: reader._apply_data_quality_rules(float_df)),
+        ("heating_obj_reader.exclude_unused_columns", circuit_rows_count,
+         lambda: reader._exclude_unused_columns(cleaned_df)),
+        ("heating_obj_reader.read_heating_obj", rows_count,
+         lambda: reader.read_heating_obj_from_binary_stream(io.BytesIO(content))),
+        ("heating_obj_processor.process_heating_obj", circuit_rows_count,
+         lambda: processor.process_heating_obj(heating_obj_df, min_timestamp, max_timestamp)),
+        ("heating_obj_processor.process_heating_obj_fused", circuit_rows_count,
+         lambda: fused_processor.process_heating_obj(heating_obj_df, min_timestamp, max_timestamp)),
+        ("heating_obj_batch_processor.process_heating_objs", 4 * circuit_rows_count,
+         lambda: batch_processor.process_heating_objs(heating_objs_dfs, min_timestamp, max_timestamp))
+    ]
+
+
+def get_weather_stages(rows_count: int) -> List[Tuple[str, int, Callable[[], Any]]]:
+    time_step = soft_m_data_generators.WEATHER_FORECAST_TIME_STEP
+    if rows_count > MAX_HOURLY_WEATHER_FORECAST_ROWS_COUNT:
+        time_step = pd.Timedelta(minutes=10)
+    content = soft_m_data_generators.generate_weather_forecast_json(rows_count, time_step=time_step)
+    decoder = SoftMJSONColumnsDecoder()
+    reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=TIMEZONE)
+    decoded_df = decoder.decode_from_binary_stream(io.BytesIO(content))
+    weather_df = reader.read_weather_from_binary_stream(io.BytesIO(content))
+    processor = SoftMWeatherProcessor(**make_processor_algorithms())
+    fused_processor = SoftMWeatherProcessor(grid_resampler=make_grid_resampler(), **make_processor_algorithms())
+    caching_processor = SoftMWeatherProcessor(
+        processing_cache=SoftMWeatherProcessingCache(),
+        **make_processor_algorithms()
+    )
+    min_timestamp = weather_df[column_names.TIMESTAMP].min()
+    max_timestamp = weather_df[column_names.TIMESTAMP].max()
+
+    def convert_date_and_time_to_timestamp():
+        df = decoded_df.copy()
+        reader._convert_date_and_time_to_timestamp(df)
+        return df
+
+    return [
+        ("weather_reader.decode_json", rows_count, lambda: decoder.decode_from_binary_stream(io.BytesIO(content))),
+        ("weather_reader.convert_date_and_time_to_timestamp", rows_count, convert_date_and_time_to_timestamp),
+        ("weather_reader.read_weather", rows_count,
+         lambda: reader.read_weather_from_binary_stream(io.BytesIO(content))),
+        ("weather_processor.process_weather_df", rows_count,
+         lambda: processor.process_weather_df(weather_df, min_timestamp, max_timestamp)),
+        ("weather_processor.process_weather_df_fused", rows_count,
+         lambda: fused_processor.process_weather_df(weather_df, min_timestamp, max_timestamp)),
+        # Measured time is the time of a cache hit, the first call fills the cache
+        ("weather_processor.process_weather_df_cached", rows_count,
+         lambda: caching_processor.process_weather_df(weather_df, min_timestamp, max_timestamp))
+    ]
+
+
+def get_temp_graph_stages(rows_count: int) -> List[Tuple[str, int, Callable[[], Any]]]:
+    lysva_content = soft_m_data_generators.generate_lysva_temp_graph_json(rows_count)
+    chernushka_content = soft_m_data_generators.generate_chernushka_temp_graph_json(rows_count)
+    lysva_reader = SoftMLysvaSyncTempGraphOnlineReader()
+    chernushka_reader = SoftMChernushkaSyncTempGraphOnlineReader()
+    temp_graph_lookup = SoftMTempGraphLookup.from_temp_graph_df(
+        lysva_reader.read_temp_graph_from_binary_stream(
+            io.BytesIO(soft_m_data_generators.generate_lysva_temp_graph_json(TEMP_GRAPH_POINTS_COUNT))
+        )
+    )
+    weather_temps = pd.Series(np.random.RandomState(42).uniform(-45, 15, rows_count))
+    return [
+        ("lysva_temp_graph_reader.read_temp_graph", rows_count,
+         lambda: lysva_reader.read_temp_graph_from_binary_stream(io.BytesIO(lysva_content))),
+        ("chernushka_temp_graph_reader.read_temp_graph", rows_count,
+         lambda: chernushka_reader.read_temp_graph_from_binary_stream(io.BytesIO(chernushka_content))),
+        ("temp_graph_lookup.lookup", rows_count, lambda: temp_graph_lookup.lookup(weather_temps))
+    ]
+
+
+def run_benchmarks(sizes: List[int], repeats_count: int, stage_filter: str) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for rows_count in sizes:
+        for get_stages in (get_heating_obj_stages, get_weather_stages, get_temp_graph_stages):
+            for stage_name, stage_rows_count, stage_function in get_stages(rows_count):
+                if stage_filter not in stage_name:
+                    continue
+                seconds, peak_memory_bytes, _ = measure(stage_function, repeats_count)
+                result_name = f"{stage_name}[{rows_count}]"
+                results[result_name] = {
+                    "seconds": seconds,
+                    "rows_per_second": stage_rows_count / seconds if seconds > 0 else float("inf"),
+                    "peak_memory_bytes": peak_memory_bytes
+                }
+                print(
+                    f"{result_name:<64} {seconds * 1000:12.2f} ms "
+                    f"{results[result_name]['rows_per_second']:14.0f} rows/s "
+                    f"{peak_memory_bytes / 1024 / 1024:10.2f} MiB"
+                )
+    return results
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, float]],
+                          baseline: Dict[str, Dict[str, float]],
+                          tolerance: float
+                          ) -> List[str]:
+    regressions = []
+    for result_name, result in results.items():
+        baseline_result = baseline.get(result_name)
+        if baseline_result is None:
+            continue
+        for metric_name in ("seconds", "peak_memory_bytes"):
+            if result[metric_name] > baseline_result[metric_name] * (1 + tolerance):
+                regressions.append(
+                    f"{result_name} {metric_name}: {result[metric_name]:.6g} "
+                    f"(baseline {baseline_result[metric_name]:.6g})"
+                )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks of SoftM readers and processors")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS_COUNT)
+    parser.add_argument("--stages", default="", help="Run only stages containing this substring")
+    parser.add_argument("--save-baseline", help="Save results to this JSON file")
+    parser.add_argument("--baseline", help="Compare results with this JSON file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.sizes, args.repeats, args.stages)
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline is saved to {args.save_baseline}")
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_with_baseline(results, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
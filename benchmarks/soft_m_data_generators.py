@@ -0,0 +1,104 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from boiler_softm.constants import circuit_ids
+from boiler_softm.constants import column_names as soft_m_column_names
+
+HEATING_OBJ_START_TIMESTAMP = pd.Timestamp("2021-01-01 00:00")
+HEATING_OBJ_TIME_STEP = pd.Timedelta(minutes=3)
+WEATHER_FORECAST_START_TIMESTAMP = pd.Timestamp("2021-01-01 00:00")
+WEATHER_FORECAST_TIME_STEP = pd.Timedelta(hours=1)
+
+
+def _format_decimals(values: np.ndarray) -> pd.Series:
+    return pd.Series(values.round(2)).astype(str).str.replace(".", ",", regex=False)
+
+
+def generate_heating_obj_csv(rows_count: int, seed: int = 42) -> bytes:
+    random_state = np.random.RandomState(seed)
+    # Rows of both circuits are interleaved, each circuit has a row per time step
+    circuit_ids_array = np.where(
+        np.arange(rows_count) % 2 == 0,
+        circuit_ids.LYSVA_HEATING_CIRCUIT,
+        circuit_ids.LYSVA_HOT_WATER_CIRCUIT
+    )
+    timestamps = pd.Series(HEATING_OBJ_START_TIMESTAMP + HEATING_OBJ_TIME_STEP * (np.arange(rows_count) // 2))
+
+    # Exports mix ISO timestamps with milliseconds and day-first timestamps without leading zero hours
+    is_iso_timestamp = random_state.rand(rows_count) < 0.5
+    iso_timestamps = timestamps.dt.strftime("%Y-%m-%d %H:%M:%S.000")
+    day_first_timestamps = (
+            timestamps.dt.strftime("%d.%m.%Y ")
+            + timestamps.dt.hour.astype(str)
+            + timestamps.dt.strftime(":%M")
+    )
+    timestamps_as_str = iso_timestamps.where(is_iso_timestamp, day_first_timestamps)
+
+    forward_temps = random_state.uniform(40, 95, rows_count)
+    is_hot_water = circuit_ids_array == circuit_ids.LYSVA_HOT_WATER_CIRCUIT
+    # Hot water temps are sometimes exported multiplied by 100
+    is_incorrect_temp = is_hot_water & (random_state.rand(rows_count) < 0.3)
+    forward_temps[is_incorrect_temp] *= 100
+
+    df = pd.DataFrame({
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_TIMESTAMP: timestamps_as_str,
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_CIRCUIT_ID: circuit_ids_array,
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_FORWARD_PIPE_COOLANT_TEMP: _format_decimals(forward_temps),
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_BACKWARD_PIPE_COOLANT_TEMP:
+            _format_decimals(random_state.uniform(30, 60, rows_count)),
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_FORWARD_PIPE_COOLANT_VOLUME:
+            _format_decimals(random_state.uniform(0, 10, rows_count)),
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_BACKWARD_PIPE_COOLANT_VOLUME:
+            _format_decimals(random_state.uniform(0, 10, rows_count)),
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_FORWARD_PIPE_COOLANT_PRESSURE:
+            _format_decimals(random_state.uniform(3, 7, rows_count)),
+        soft_m_column_names.LYSVA_HEATING_SYSTEM_BACKWARD_PIPE_COOLANT_PRESSURE:
+            _format_decimals(random_state.uniform(2, 6, rows_count)),
+        "nUnused": np.zeros(rows_count, dtype=np.int64)
+    })
+    return df.to_csv(sep=";", index=False).encode("utf-8")
+
+
+def generate_weather_forecast_json(rows_count: int,
+                                   seed: int = 42,
+                                   time_step: pd.Timedelta = WEATHER_FORECAST_TIME_STEP
+                                   ) -> bytes:
+    random_state = np.random.RandomState(seed)
+    timestamps = pd.Series(WEATHER_FORECAST_START_TIMESTAMP + time_step * np.arange(rows_count))
+    df = pd.DataFrame({
+        soft_m_column_names.LYSVA_WEATHER_DATE: timestamps.dt.strftime("%Y-%m-%d"),
+        soft_m_column_names.LYSVA_WEATHER_TIME: timestamps.dt.strftime("%H:%M"),
+        soft_m_column_names.LYSVA_WEATHER_TEMP: random_state.uniform(-40, 30, rows_count).round(1)
+    })
+    return df.to_json(orient="records").encode("utf-8")
+
+
+def _generate_temp_graph(rows_count: int):
+    weather_temps = np.linspace(10, -40, rows_count).round(3)
+    forward_temps = (60 - weather_temps).round(3)
+    backward_temps = (45 - weather_temps / 2).round(3)
+    return weather_temps.tolist(), forward_temps.tolist(), backward_temps.tolist()
+
+
+def generate_lysva_temp_graph_json(rows_count: int) -> bytes:
+    return json.dumps([
+        {
+            soft_m_column_names.LYSVA_TEMP_GRAPH_WEATHER_TEMP: weather_temp,
+            soft_m_column_names.LYSVA_TEMP_GRAPH_TEMP_AT_IN: forward_temp,
+            soft_m_column_names.LYSVA_TEMP_GRAPH_TEMP_AT_OUT: backward_temp
+        }
+        for weather_temp, forward_temp, backward_temp in zip(*_generate_temp_graph(rows_count))
+    ]).encode("utf-8")
+
+
+def generate_chernushka_temp_graph_json(rows_count: int) -> bytes:
+    return json.dumps({"data": [
+        {
+            soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_WEATHER_TEMP: weather_temp,
+            soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_TEMP_AT_IN: forward_temp,
+            soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_TEMP_AT_OUT: backward_temp
+        }
+        for weather_temp, forward_temp, backward_temp in zip(*_generate_temp_graph(rows_count))
+    ]}).encode("utf-8")
@@ -1,2 +1,12 @@
 LYSVA_API_BASE = "https://lysva.agt.town"
 CHERNUSHKA_API_BASE = "https://chern.agt.town"
+
+HTTP_CONNECT_TIMEOUT = 5.0
+HTTP_READ_TIMEOUT = 30.0
+HTTP_MAX_RETRIES = 3
+HTTP_BACKOFF_FACTOR = 0.5
+HTTP_MAX_BACKOFF = 10.0
+HTTP_MAX_RETRY_AFTER = 60.0
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+HTTP_POOL_MAX_SIZE = 4
+HTTP_MAX_CONCURRENT_REQUESTS_PER_SERVER = HTTP_POOL_MAX_SIZE
@@ -1,3 +1,5 @@
+import datetime
+
 from boiler.constants import column_names
 
 BOILER_NEED_INTERPOLATE_COLUMNS = [
@@ -14,3 +16,22 @@ APARTMENT_HOUSE_NEED_INTERPOLATE_COLUMNS = [
     column_names.FORWARD_PIPE_COOLANT_TEMP,
     column_names.BACKWARD_PIPE_COOLANT_TEMP,
 ]
+
+HEATING_OBJ_READING_CHUNK_SIZE = 100_000
+INCORRECT_WATER_TEMP_THRESHOLD = 100
+INCORRECT_WATER_TEMP_DIVISOR = 100
+HEATING_OBJ_CACHE_MAX_SIZE_BYTES = 1024 ** 3
+HEATING_OBJ_CACHE_STALE_TEMP_ENTRY_AGE = datetime.timedelta(hours=1)
+WEATHER_FORECAST_CACHE_TTL = datetime.timedelta(minutes=30)
+WEATHER_FORECAST_CACHE_STALE_TTL = datetime.timedelta(hours=6)
+WEATHER_FORECAST_CACHE_REFRESH_RETRY_INTERVAL = datetime.timedelta(minutes=5)
+TEMP_GRAPH_CACHE_REFRESH_INTERVAL = datetime.timedelta(hours=1)
+TEMP_GRAPH_CACHE_REFRESH_RETRY_INTERVAL = datetime.timedelta(minutes=5)
+WEATHER_PROCESSING_CACHE_MAX_ENTRIES_COUNT = 32
+
+TEMP_GRAPH_LOOKUP_NEAREST = "nearest"
+TEMP_GRAPH_LOOKUP_FLOOR = "floor"
+TEMP_GRAPH_LOOKUP_LINEAR = "linear"
+
+WEATHER_AMBIGUOUS_TIMESTAMP_POLICY = False
+WEATHER_NONEXISTENT_TIMESTAMP_POLICY = "shift_forward"
@@ -0,0 +1,41 @@
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+# Attributes holding statistics of the last call do not change output,
+# classes list other runtime state attributes in _volatile_attributes
+_VOLATILE_ATTRIBUTE_PREFIX = "_last_"
+
+
+def describe_config(obj) -> str:
+    if isinstance(obj, (list, tuple)):
+        return "[" + ", ".join(describe_config(item) for item in obj) + "]"
+    if isinstance(obj, dict):
+        items = sorted((repr(key), describe_config(value)) for key, value in obj.items())
+        return "{" + ", ".join(f"{key}: {value}" for key, value in items) + "}"
+    if hasattr(obj, "__dict__") and not isinstance(obj, type):
+        volatile_attributes = getattr(obj, "_volatile_attributes", ())
+        attributes = {
+            key: value for key, value in vars(obj).items()
+            if not key.startswith(_VOLATILE_ATTRIBUTE_PREFIX) and key not in volatile_attributes
+        }
+        return f"{type(obj).__module__}.{type(obj).__qualname__}{describe_config(attributes)}"
+    return repr(obj)
+
+
+def fingerprint_df(df: pd.DataFrame) -> str:
+    # Hashes raw column buffers, it is much cheaper than hashing rows
+    df_hash = hashlib.blake2b(digest_size=16)
+    df_hash.update(repr((df.shape, list(df.columns), [str(dtype) for dtype in df.dtypes])).encode("utf-8"))
+    _update_hash(df_hash, df.index.to_numpy())
+    for column_number in range(df.shape[1]):
+        _update_hash(df_hash, df.iloc[:, column_number].values)
+    return df_hash.hexdigest()
+
+
+def _update_hash(df_hash, values) -> None:
+    if isinstance(values, np.ndarray) and values.dtype != np.dtype(object):
+        df_hash.update(np.ascontiguousarray(values).view(np.uint8))
+    else:
+        df_hash.update(pd.util.hash_array(np.asarray(values, dtype=object)).view(np.uint8))
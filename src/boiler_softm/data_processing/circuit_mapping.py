@@ -0,0 +1,17 @@
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def map_circuit_ids(circuit_ids: pd.Series,
+                    circuit_id_equals: Dict[str, str]
+                    ) -> pd.Series:
+    # Only unique circuit ids are looked up, rows are mapped by their factorized codes
+    codes, unique_circuit_ids = pd.factorize(circuit_ids)
+    unique_circuits = [str(circuit_id) for circuit_id in unique_circuit_ids]
+    unique_circuits = [circuit_id_equals.get(circuit_id, circuit_id) for circuit_id in unique_circuits]
+    # Missing ids have code -1 and are mapped to the last item like apply(str) does
+    unique_circuits.append(str(np.nan))
+    circuits = np.array(unique_circuits, dtype=object)[codes]
+    return pd.Series(circuits, index=circuit_ids.index)
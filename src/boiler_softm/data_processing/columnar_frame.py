@@ -0,0 +1,30 @@
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64tz_dtype
+
+
+def split_df_to_columns(df: pd.DataFrame) -> Tuple[Dict[str, Any], List[np.ndarray]]:
+    meta = {
+        "columns": list(df.columns),
+        "dtypes": list(df.dtypes),
+        "index_name": df.index.name
+    }
+    # Timezone aware timestamps are kept as UTC datetime64 values
+    arrays = [df.index.to_numpy()] + [df[column_name].values for column_name in df.columns]
+    return meta, arrays
+
+
+def join_columns_to_df(meta: Dict[str, Any], arrays: List[np.ndarray]) -> pd.DataFrame:
+    index = pd.Index(arrays[0], name=meta["index_name"])
+    columns = []
+    for column_name, dtype, values in zip(meta["columns"], meta["dtypes"], arrays[1:]):
+        if is_datetime64tz_dtype(dtype):
+            values = pd.DatetimeIndex(values).tz_localize("UTC").tz_convert(dtype.tz)
+        columns.append(pd.Series(values, index=index, name=column_name, copy=False))
+    if not columns:
+        return pd.DataFrame(index=index)
+    # DataFrame constructor consolidates columns of one dtype into a single block and copies
+    # memory-mapped arrays, concatenation without copying keeps a block per column
+    return pd.concat(columns, axis=1, copy=False)
@@ -0,0 +1,238 @@
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from boiler_softm.logging import logger
+
+
+class AbstractDataQualityRule:
+
+    def __init__(self, column_name: str, name: Optional[str] = None) -> None:
+        self._column_name = column_name
+        if name is None:
+            name = f"{self.rule_type}:{column_name}"
+        self._name = name
+
+    @property
+    def rule_type(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def column_name(self) -> str:
+        return self._column_name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        # Changes values in place and returns the mask of affected rows
+        raise NotImplementedError
+
+
+class ScaleIfAboveRule(AbstractDataQualityRule):
+
+    def __init__(self,
+                 column_name: str,
+                 threshold: float,
+                 divisor: float,
+                 name: Optional[str] = None
+                 ) -> None:
+        self._threshold = threshold
+        self._divisor = divisor
+        super().__init__(column_name, name)
+
+        logger.debug(
+            f"Creating instance:"
+            f"column_name: {self._column_name}"
+            f"threshold: {self._threshold}"
+            f"divisor: {self._divisor}"
+        )
+
+    @property
+    def rule_type(self) -> str:
+        return "scale_if_above"
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        is_affected = values > self._threshold
+        np.divide(values, self._divisor, out=values, where=is_affected)
+        return is_affected
+
+
+class ClipRule(AbstractDataQualityRule):
+
+    def __init__(self,
+                 column_name: str,
+                 min_value: Optional[float] = None,
+                 max_value: Optional[float] = None,
+                 name: Optional[str] = None
+                 ) -> None:
+        self._min_value = min_value
+        self._max_value = max_value
+        super().__init__(column_name, name)
+
+        logger.debug(
+            f"Creating instance:"
+            f"column_name: {self._column_name}"
+            f"min_value: {self._min_value}"
+            f"max_value: {self._max_value}"
+        )
+
+    @property
+    def rule_type(self) -> str:
+        return "clip"
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        is_affected = _is_out_of_range(values, self._min_value, self._max_value)
+        np.clip(
+            values,
+            -np.inf if self._min_value is None else self._min_value,
+            np.inf if self._max_value is None else self._max_value,
+            out=values
+        )
+        return is_affected
+
+
+class RangeToNaNRule(AbstractDataQualityRule):
+
+    def __init__(self,
+                 column_name: str,
+                 min_value: Optional[float] = None,
+                 max_value: Optional[float] = None,
+                 name: Optional[str] = None
+                 ) -> None:
+        self._min_value = min_value
+        self._max_value = max_value
+        super().__init__(column_name, name)
+
+        logger.debug(
+            f"Creating instance:"
+            f"column_name: {self._column_name}"
+            f"min_value: {self._min_value}"
+            f"max_value: {self._max_value}"
+        )
+
+    @property
+    def rule_type(self) -> str:
+        return "range_to_nan"
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        is_affected = _is_out_of_range(values, self._min_value, self._max_value)
+        values[is_affected] = np.nan
+        return is_affected
+
+
+class SpikeSuppressionRule(AbstractDataQualityRule):
+
+    def __init__(self,
+                 column_name: str,
+                 max_jump: float,
+                 name: Optional[str] = None
+                 ) -> None:
+        self._max_jump = max_jump
+        super().__init__(column_name, name)
+
+        logger.debug(
+            f"Creating instance:"
+            f"column_name: {self._column_name}"
+            f"max_jump: {self._max_jump}"
+        )
+
+    @property
+    def rule_type(self) -> str:
+        return "spike_suppression"
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        # A spike jumps away from both neighbours in the same direction, it is replaced with NaN
+        is_affected = np.zeros(len(values), dtype=np.bool_)
+        if len(values) < 3:
+            return is_affected
+        middle_values = values[1:-1]
+        previous_jumps = middle_values - values[:-2]
+        next_jumps = middle_values - values[2:]
+        is_affected[1:-1] = (
+                (np.abs(previous_jumps) > self._max_jump)
+                & (np.abs(next_jumps) > self._max_jump)
+                & (np.sign(previous_jumps) == np.sign(next_jumps))
+        )
+        values[is_affected] = np.nan
+        return is_affected
+
+
+def _is_out_of_range(values: np.ndarray, min_value: Optional[float], max_value: Optional[float]) -> np.ndarray:
+    is_out_of_range = np.zeros(len(values), dtype=np.bool_)
+    if min_value is not None:
+        is_out_of_range |= values < min_value
+    if max_value is not None:
+        is_out_of_range |= values > max_value
+    return is_out_of_range
+
+
+class SoftMDataQualityStage:
+    # Counters and their lock are not a part of the stage config
+    _volatile_attributes = ("_counts_lock", "_affected_rows_counts", "_last_affected_rows_counts")
+
+    def __init__(self, rules: List[AbstractDataQualityRule]) -> None:
+        rules_names = [rule.name for rule in rules]
+        if len(set(rules_names)) != len(rules_names):
+            raise ValueError(f"Data quality rules names must be unique, got {rules_names}")
+        self._rules = list(rules)
+        self._rules_by_column: Dict[str, List[AbstractDataQualityRule]] = {}
+        for rule in self._rules:
+            self._rules_by_column.setdefault(rule.column_name, []).append(rule)
+
+        self._counts_lock = threading.Lock()
+        self._affected_rows_counts = {rule.name: 0 for rule in self._rules}
+        self._last_affected_rows_counts = dict(self._affected_rows_counts)
+
+        logger.debug(
+            f"Creating instance:"
+            f"rules: {rules_names}"
+        )
+
+    def __getstate__(self) -> Dict:
+        # Readers with their stage are sent to ingestion worker processes, locks can not be pickled
+        state = self.__dict__.copy()
+        del state["_counts_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._counts_lock = threading.Lock()
+
+    @property
+    def rules(self) -> List[AbstractDataQualityRule]:
+        return list(self._rules)
+
+    @property
+    def affected_rows_counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return dict(self._affected_rows_counts)
+
+    @property
+    def last_affected_rows_counts(self) -> Dict[str, int]:
+        with self._counts_lock:
+            return dict(self._last_affected_rows_counts)
+
+    def reset_counts(self) -> None:
+        with self._counts_lock:
+            self._affected_rows_counts = {rule.name: 0 for rule in self._rules}
+            self._last_affected_rows_counts = dict(self._affected_rows_counts)
+
+    def apply_to_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        # Each column is taken out once, all its rules are applied to the same array
+        counts = {}
+        for column_name, rules in self._rules_by_column.items():
+            values = df[column_name].to_numpy(dtype=np.float64, copy=True)
+            for rule in rules:
+                counts[rule.name] = int(np.count_nonzero(rule.apply(values)))
+            df[column_name] = values
+
+        logger.debug(f"Data quality rules affected rows: {counts}")
+        with self._counts_lock:
+            for rule_name, count in counts.items():
+                self._affected_rows_counts[rule_name] += count
+            self._last_affected_rows_counts = counts
+        return df
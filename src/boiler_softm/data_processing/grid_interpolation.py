@@ -0,0 +1,65 @@
+from typing import Optional
+
+import numpy as np
+
+
+def interpolate_regular_grid(values: np.ndarray,
+                             left_positions: Optional[np.ndarray] = None,
+                             left_values: Optional[np.ndarray] = None,
+                             right_positions: Optional[np.ndarray] = None,
+                             right_values: Optional[np.ndarray] = None
+                             ) -> np.ndarray:
+    # values is a (objects, time, columns) array on a regular grid, NaN marks unknown values.
+    # Known values outside of the grid are passed as (objects, columns) anchors with positions
+    # in grid steps (negative on the left, not less than grid length on the right), NaN if absent.
+    # Unknown values between known ones are interpolated linearly, values outside of
+    # the known ones are filled with the nearest known value.
+    objects_count, grid_length, columns_count = values.shape
+    anchors_shape = (objects_count, columns_count)
+    if left_positions is None:
+        left_positions = np.full(anchors_shape, np.nan)
+        left_values = np.full(anchors_shape, np.nan)
+    if right_positions is None:
+        right_positions = np.full(anchors_shape, np.nan)
+        right_values = np.full(anchors_shape, np.nan)
+
+    is_known = ~np.isnan(values)
+    grid_positions = np.arange(grid_length, dtype=np.float64)[np.newaxis, :, np.newaxis]
+
+    previous_positions = np.where(is_known, grid_positions, -np.inf)
+    previous_positions = np.maximum.accumulate(previous_positions, axis=1)
+    next_positions = np.where(is_known, grid_positions, np.inf)
+    next_positions = np.minimum.accumulate(next_positions[:, ::-1], axis=1)[:, ::-1]
+
+    previous_values = np.take_along_axis(
+        values,
+        np.clip(previous_positions, 0, grid_length - 1).astype(np.int64),
+        axis=1
+    )
+    next_values = np.take_along_axis(
+        values,
+        np.clip(next_positions, 0, grid_length - 1).astype(np.int64),
+        axis=1
+    )
+
+    has_left_anchor = ~np.isnan(left_positions)[:, np.newaxis, :]
+    use_left_anchor = np.isinf(previous_positions) & has_left_anchor
+    previous_positions = np.where(use_left_anchor, left_positions[:, np.newaxis, :], previous_positions)
+    previous_values = np.where(use_left_anchor, left_values[:, np.newaxis, :], previous_values)
+
+    has_right_anchor = ~np.isnan(right_positions)[:, np.newaxis, :]
+    use_right_anchor = np.isinf(next_positions) & has_right_anchor
+    next_positions = np.where(use_right_anchor, right_positions[:, np.newaxis, :], next_positions)
+    next_values = np.where(use_right_anchor, right_values[:, np.newaxis, :], next_values)
+
+    has_previous = np.isfinite(previous_positions)
+    has_next = np.isfinite(next_positions)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        slopes = (next_values - previous_values) / (next_positions - previous_positions)
+        interpolated = slopes * (grid_positions - previous_positions) + previous_values
+
+    result = np.where(has_previous & has_next, interpolated, np.nan)
+    result = np.where(has_previous & ~has_next, previous_values, result)
+    result = np.where(~has_previous & has_next, next_values, result)
+    result = np.where(is_known, values, result)
+    return result
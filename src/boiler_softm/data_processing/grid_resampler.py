@@ -0,0 +1,109 @@
+import datetime
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+from boiler.data_processing.timestamp_round_algorithm import AbstractTimestampRoundAlgorithm
+
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+
+
+class SoftMGridResampler:
+
+    def __init__(self,
+                 timestamp_round_algorithm: AbstractTimestampRoundAlgorithm,
+                 time_tick: datetime.timedelta = TIME_TICK
+                 ) -> None:
+        self._timestamp_round_algorithm = timestamp_round_algorithm
+        self._time_tick = pd.Timedelta(time_tick)
+
+        logger.debug(
+            f"Creating instance:"
+            f"timestamp_round_algorithm: {self._timestamp_round_algorithm}"
+            f"time_tick: {self._time_tick}"
+        )
+
+    @instrumented_stage("grid_resampler.resample_df")
+    def resample_df(self,
+                    df: pd.DataFrame,
+                    columns_to_interpolate: List[str],
+                    min_required_timestamp: Optional[pd.Timestamp],
+                    max_required_timestamp: Optional[pd.Timestamp]
+                    ) -> pd.DataFrame:
+        # Does rounding, deduplication, reindexing to the grid and linear inside and outside
+        # interpolation in one pass over sorted rows. Only grid points that can pass the timestamp
+        # filter are computed, the index is the position in the full grid like after the reindexing.
+        logger.debug(f"Resampling {len(df)} rows to grid {min_required_timestamp}, {max_required_timestamp}")
+        timestamps = self._timestamp_round_algorithm.round_series(df[column_names.TIMESTAMP])
+        timezone = timestamps.dt.tz
+        tick = self._time_tick.value
+
+        # Rows without timestamp do not land on the grid, NaT would also break the int64 grid arithmetic
+        valid_rows = np.flatnonzero(timestamps.notna().to_numpy())
+        if len(valid_rows) == 0:
+            logger.debug("There are no rows with timestamp to resample")
+            return df.iloc[0:0].reset_index(drop=True)
+        valid_timestamps = timestamps.values.view(np.int64)[valid_rows]
+        sorted_order = np.argsort(valid_timestamps, kind="stable")
+        sorted_rows = valid_rows[sorted_order]
+        sorted_timestamps = valid_timestamps[sorted_order]
+        # Last row of equal rounded timestamps wins like in drop_duplicates(keep="last")
+        is_last = np.append(sorted_timestamps[1:] != sorted_timestamps[:-1], True)
+        rows = sorted_rows[is_last]
+        rows_timestamps = sorted_timestamps[is_last]
+
+        grid_start = rows_timestamps[0]
+        grid_end = rows_timestamps[-1]
+        window_start = grid_start
+        window_end = grid_end
+        if min_required_timestamp is not None:
+            rounded_min_timestamp = self._timestamp_round_algorithm.round_value(min_required_timestamp).value
+            grid_start = min(grid_start, rounded_min_timestamp)
+            window_start = rounded_min_timestamp
+        if max_required_timestamp is not None:
+            rounded_max_timestamp = self._timestamp_round_algorithm.round_value(max_required_timestamp).value
+            grid_end = max(grid_end, rounded_max_timestamp)
+            window_end = rounded_max_timestamp
+
+        first_position = (window_start - grid_start) // tick
+        positions_count = max((window_end - window_start) // tick + 1, 0)
+        window_positions = first_position + np.arange(positions_count)
+        rows_positions = (rows_timestamps - grid_start) // tick
+
+        columns = {
+            column_names.TIMESTAMP: self._make_timestamps(grid_start + window_positions * tick, timezone)
+        }
+        window_positions_as_float = window_positions.astype(np.float64)
+        for column_name in columns_to_interpolate:
+            values = df[column_name].to_numpy(dtype=np.float64)[rows]
+            is_known = ~np.isnan(values)
+            if is_known.any():
+                columns[column_name] = np.interp(
+                    window_positions_as_float,
+                    rows_positions[is_known].astype(np.float64),
+                    values[is_known]
+                )
+            else:
+                columns[column_name] = np.full(positions_count, np.nan)
+        resampled_df = pd.DataFrame(columns, index=window_positions)
+
+        other_columns = [
+            column_name for column_name in df.columns
+            if column_name != column_names.TIMESTAMP and column_name not in columns_to_interpolate
+        ]
+        if other_columns:
+            # Columns without interpolation only keep values of rows that land on the grid
+            other_df = df[other_columns].iloc[rows]
+            other_df.index = rows_positions
+            resampled_df = resampled_df.join(other_df.reindex(window_positions))
+        return resampled_df[list(df.columns)]
+
+    # noinspection PyMethodMayBeStatic
+    def _make_timestamps(self, timestamps: np.ndarray, timezone) -> pd.DatetimeIndex:
+        timestamps = pd.DatetimeIndex(timestamps.astype("datetime64[ns]"))
+        if timezone is not None:
+            timestamps = timestamps.tz_localize("UTC").tz_convert(timezone)
+        return timestamps
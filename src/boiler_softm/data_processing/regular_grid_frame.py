@@ -0,0 +1,115 @@
+import datetime
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+
+from boiler_softm.constants.time_tick import TIME_TICK
+
+
+class SoftMRegularGridFrame:
+
+    def __init__(self,
+                 start: pd.Timestamp,
+                 values: np.ndarray,
+                 columns: List[str],
+                 time_tick: datetime.timedelta = TIME_TICK,
+                 dtype: Union[type, np.dtype] = np.float64
+                 ) -> None:
+        values = np.ascontiguousarray(values, dtype=dtype)
+        if values.ndim != 2 or values.shape[1] != len(columns):
+            raise ValueError(f"Values of shape {values.shape} do not match {len(columns)} columns")
+        time_tick = pd.Timedelta(time_tick)
+        if time_tick <= pd.Timedelta(0):
+            raise ValueError(f"Time tick must be positive, got {time_tick}")
+        self._start = pd.Timestamp(start)
+        self._time_tick = time_tick
+        self._values = values
+        self._columns = list(columns)
+
+    @classmethod
+    def from_df(cls,
+                df: pd.DataFrame,
+                time_tick: datetime.timedelta = TIME_TICK,
+                dtype: Union[type, np.dtype] = np.float64,
+                start: Optional[pd.Timestamp] = None
+                ) -> "SoftMRegularGridFrame":
+        time_tick = pd.Timedelta(time_tick)
+        timestamps = df[column_names.TIMESTAMP]
+        columns = [column_name for column_name in df.columns if column_name != column_names.TIMESTAMP]
+        if len(timestamps) == 0:
+            # Empty df has no timestamps, so the start of the empty frame is given by the caller
+            if start is None:
+                raise ValueError("Start is required to make regular grid frame from empty df")
+            return cls(start, np.empty((0, len(columns))), columns, time_tick, dtype)
+        timestamp_steps = np.diff(timestamps.values.astype(np.int64))
+        if timestamps.isna().any() or (timestamp_steps != time_tick.value).any():
+            raise ValueError(f"Timestamps do not lie on a regular grid with time tick {time_tick}")
+        return cls(timestamps.iloc[0], df[columns].to_numpy(dtype=dtype), columns, time_tick, dtype)
+
+    @property
+    def start(self) -> pd.Timestamp:
+        return self._start
+
+    @property
+    def end(self) -> pd.Timestamp:
+        return self._start + self._time_tick * len(self)
+
+    @property
+    def time_tick(self) -> pd.Timedelta:
+        return self._time_tick
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._values.dtype
+
+    @property
+    def nbytes(self) -> int:
+        return self._values.nbytes
+
+    @property
+    def timestamps(self) -> pd.DatetimeIndex:
+        return pd.date_range(self._start, periods=len(self), freq=self._time_tick, name=column_names.TIMESTAMP)
+
+    def __len__(self) -> int:
+        return self._values.shape[0]
+
+    def get_column(self, column_name: str) -> np.ndarray:
+        return self._values[:, self._columns.index(column_name)]
+
+    def get_position(self, timestamp: pd.Timestamp) -> int:
+        # Position of the first grid point that is not earlier than the timestamp
+        return -((self._start - pd.Timestamp(timestamp)).value // self._time_tick.value)
+
+    def slice_by_timestamp(self,
+                           min_timestamp: Optional[pd.Timestamp] = None,
+                           max_timestamp: Optional[pd.Timestamp] = None
+                           ) -> "SoftMRegularGridFrame":
+        # Same bounds as LeftClosedTimestampFilterAlgorithm, the result shares values with the frame
+        start_position = 0
+        if min_timestamp is not None:
+            start_position = min(max(self.get_position(min_timestamp), 0), len(self))
+        stop_position = len(self)
+        if max_timestamp is not None:
+            stop_position = min(max(self.get_position(max_timestamp), start_position), len(self))
+        return SoftMRegularGridFrame(
+            self._start + self._time_tick * start_position,
+            self._values[start_position:stop_position],
+            self._columns,
+            self._time_tick,
+            self._values.dtype
+        )
+
+    def to_df(self) -> pd.DataFrame:
+        df = pd.DataFrame(self._values, columns=self._columns, copy=True)
+        df.insert(0, column_names.TIMESTAMP, self.timestamps)
+        return df
@@ -0,0 +1,117 @@
+import re
+from datetime import tzinfo
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+from boiler.data_processing.timestamp_parsing_algorithm import AbstractTimestampParsingAlgorithm
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.logging import logger
+
+
+class SoftMVectorizedTimestampParsingAlgorithm(AbstractTimestampParsingAlgorithm):
+
+    def __init__(self,
+                 timezone: Optional[tzinfo] = None,
+                 parsing_patterns: Iterable[str] = converting_parameters.LYSVA_HEATING_OBJ_TIMESTAMP_PARSING_PATTERNS,
+                 fallback_parser: Optional[AbstractTimestampParsingAlgorithm] = None
+                 ) -> None:
+        self._timezone = timezone
+        self._parsing_patterns = tuple(parsing_patterns)
+        self._compiled_patterns = [re.compile(pattern) for pattern in self._parsing_patterns]
+        self._anchored_patterns = [re.compile(f"^(?:{pattern})") for pattern in self._parsing_patterns]
+        self._fallback_parser = fallback_parser
+
+        self._last_pattern_match_counts = {pattern: 0 for pattern in self._parsing_patterns}
+        self._last_fallback_count = 0
+
+        logger.debug(
+            f"Creating instance:"
+            f"timezone: {self._timezone}"
+            f"parsing_patterns: {self._parsing_patterns}"
+            f"fallback_parser: {self._fallback_parser}"
+        )
+
+    @property
+    def last_pattern_match_counts(self) -> Dict[str, int]:
+        return dict(self._last_pattern_match_counts)
+
+    @property
+    def last_fallback_count(self) -> int:
+        return self._last_fallback_count
+
+    def parse_datetime(self, datetime_as_str: str) -> pd.Timestamp:
+        for pattern in self._compiled_patterns:
+            parsed = pattern.match(datetime_as_str)
+            if parsed is not None:
+                return pd.Timestamp(
+                    year=int(parsed.group("year")),
+                    month=int(parsed.group("month")),
+                    day=int(parsed.group("day")),
+                    hour=int(parsed.group("hours")),
+                    minute=int(parsed.group("minutes")),
+                    tz=self._timezone
+                )
+        if self._fallback_parser is not None:
+            return self._fallback_parser.parse_datetime(datetime_as_str)
+        raise ValueError(f"Datetime {datetime_as_str} does not match any of parsing patterns")
+
+    def parse_series(self, datetime_series: pd.Series) -> pd.Series:
+        logger.debug("Parsing datetime series")
+        datetime_as_str = datetime_series.astype(str)
+        naive_values = np.full(len(datetime_as_str), np.datetime64("NaT"), dtype="datetime64[ns]")
+        not_matched = np.ones(len(datetime_as_str), dtype=bool)
+
+        for pattern, anchored_pattern in zip(self._parsing_patterns, self._anchored_patterns):
+            positions = np.flatnonzero(not_matched)
+            if len(positions) == 0:
+                self._last_pattern_match_counts[pattern] = 0
+                continue
+            datetime_parts = datetime_as_str.iloc[positions].str.extract(anchored_pattern)
+            is_matched = datetime_parts["year"].notna().to_numpy()
+            self._last_pattern_match_counts[pattern] = int(is_matched.sum())
+            if not is_matched.any():
+                continue
+            datetime_parts = datetime_parts[is_matched].astype(np.int64).rename(
+                columns={"hours": "hour", "minutes": "minute"}
+            )
+            matched_positions = positions[is_matched]
+            naive_values[matched_positions] = pd.to_datetime(
+                datetime_parts[["year", "month", "day", "hour", "minute"]]
+            ).to_numpy()
+            not_matched[matched_positions] = False
+
+        parsed = pd.DatetimeIndex(naive_values)
+        if self._timezone is not None:
+            parsed = parsed.tz_localize(self._timezone, ambiguous="NaT", nonexistent="NaT")
+        parsed = pd.Series(parsed, index=datetime_series.index)
+        if self._timezone is not None:
+            # Ambiguous or nonexistent local times are resolved by the per-row parser
+            is_not_localized = parsed.isna().to_numpy() & ~not_matched
+            if is_not_localized.any():
+                positions = np.flatnonzero(is_not_localized)
+                parsed.iloc[positions] = [
+                    self.parse_datetime(datetime_str) for datetime_str in datetime_as_str.iloc[positions]
+                ]
+
+        self._last_fallback_count = int(not_matched.sum())
+        if self._last_fallback_count:
+            positions = np.flatnonzero(not_matched)
+            fallback_values = datetime_as_str.iloc[positions].apply(self._parse_not_matched_datetime)
+            fallback_values = pd.to_datetime(fallback_values, utc=self._timezone is not None)
+            if self._timezone is not None:
+                fallback_values = fallback_values.dt.tz_convert(self._timezone)
+            parsed.iloc[positions] = fallback_values.to_numpy()
+
+        logger.debug(
+            f"Datetime series is parsed: "
+            f"pattern match counts: {self._last_pattern_match_counts} "
+            f"fallback count: {self._last_fallback_count}"
+        )
+        return parsed
+
+    def _parse_not_matched_datetime(self, datetime_as_str: str) -> pd.Timestamp:
+        if self._fallback_parser is None:
+            raise ValueError(f"Datetime {datetime_as_str} does not match any of parsing patterns")
+        return self._fallback_parser.parse_datetime(datetime_as_str)
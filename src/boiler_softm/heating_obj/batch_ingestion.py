@@ -0,0 +1,137 @@
+import io
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Dict, Iterable, Optional, Union
+
+import pandas as pd
+
+from boiler_softm.data_processing.columnar_frame import split_df_to_columns, join_columns_to_df
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor
+from boiler_softm.logging import logger
+
+try:
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+class SoftMHeatingObjIngestionJob:
+
+    def __init__(self,
+                 heating_obj_id: str,
+                 source: Union[str, bytes, BinaryIO],
+                 reader: SoftMSyncHeatingObjCSVReader,
+                 processor: Optional[SoftMHeatingObjProcessor] = None,
+                 min_required_timestamp: Optional[pd.Timestamp] = None,
+                 max_required_timestamp: Optional[pd.Timestamp] = None
+                 ) -> None:
+        self.heating_obj_id = heating_obj_id
+        self.source = source
+        self.reader = reader
+        self.processor = processor
+        self.min_required_timestamp = min_required_timestamp
+        self.max_required_timestamp = max_required_timestamp
+
+
+class SoftMHeatingObjIngestionResult:
+
+    def __init__(self,
+                 heating_obj_id: str,
+                 heating_obj_df: Optional[pd.DataFrame] = None,
+                 error: Optional[str] = None
+                 ) -> None:
+        self.heating_obj_id = heating_obj_id
+        self.heating_obj_df = heating_obj_df
+        self.error = error
+
+    @property
+    def is_successful(self) -> bool:
+        return self.error is None
+
+
+def _limit_worker_memory(max_worker_memory_bytes: Optional[int]) -> None:
+    if max_worker_memory_bytes is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (max_worker_memory_bytes, max_worker_memory_bytes))
+
+
+def _ingest_heating_obj(source: Union[str, bytes],
+                        reader: SoftMSyncHeatingObjCSVReader,
+                        processor: Optional[SoftMHeatingObjProcessor],
+                        min_required_timestamp: Optional[pd.Timestamp],
+                        max_required_timestamp: Optional[pd.Timestamp]):
+    try:
+        if isinstance(source, bytes):
+            heating_obj_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(source))
+        else:
+            with open(source, "rb") as f:
+                heating_obj_df = reader.read_heating_obj_from_binary_stream(f)
+        if processor is not None:
+            heating_obj_df = processor.process_heating_obj(
+                heating_obj_df,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+        # Columns are sent back as contiguous arrays, each of them is pickled as a single buffer
+        return split_df_to_columns(heating_obj_df), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+
+class SoftMHeatingObjBatchIngestor:
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 max_worker_memory_bytes: Optional[int] = None
+                 ) -> None:
+        self._max_workers = max_workers
+        self._max_worker_memory_bytes = max_worker_memory_bytes
+
+        logger.debug(
+            f"Creating instance:"
+            f"max_workers: {self._max_workers}"
+            f"max_worker_memory_bytes: {self._max_worker_memory_bytes}"
+        )
+
+    def ingest(self, jobs: Iterable[SoftMHeatingObjIngestionJob]) -> Dict[str, SoftMHeatingObjIngestionResult]:
+        jobs = list(jobs)
+        logger.debug(f"Ingesting {len(jobs)} heating objs")
+        heating_objs_ids = set()
+        for job in jobs:
+            # Results are reported by heating obj id, so a duplicate would hide the result of another job
+            if job.heating_obj_id in heating_objs_ids:
+                raise ValueError(f"Heating obj id {job.heating_obj_id} is duplicated in ingestion jobs")
+            heating_objs_ids.add(job.heating_obj_id)
+        results = {}
+        with ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                initializer=_limit_worker_memory,
+                initargs=(self._max_worker_memory_bytes,)
+        ) as executor:
+            futures = {}
+            for job in jobs:
+                source = job.source
+                if not isinstance(source, (str, bytes)):
+                    source = source.read()
+                futures[job.heating_obj_id] = executor.submit(
+                    _ingest_heating_obj,
+                    source,
+                    job.reader,
+                    job.processor,
+                    job.min_required_timestamp,
+                    job.max_required_timestamp
+                )
+
+            for heating_obj_id, future in futures.items():
+                try:
+                    columns, error = future.result()
+                except Exception as e:
+                    # Broken pool or job arguments that can not be sent to the worker
+                    columns, error = None, f"{type(e).__name__}: {e}"
+                if error is not None:
+                    logger.debug(f"Heating obj {heating_obj_id} is not ingested: {error}")
+                    results[heating_obj_id] = SoftMHeatingObjIngestionResult(heating_obj_id, error=error)
+                else:
+                    heating_obj_df = join_columns_to_df(*columns)
+                    results[heating_obj_id] = SoftMHeatingObjIngestionResult(heating_obj_id, heating_obj_df)
+        return results
@@ -0,0 +1,193 @@
+import datetime
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm \
+    import AbstractTimestampFilterAlgorithm, LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import AbstractTimestampRoundAlgorithm
+
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_interpolation import interpolate_regular_grid
+from boiler_softm.data_processing.regular_grid_frame import SoftMRegularGridFrame
+from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+
+_HEATING_OBJ_CODE = "heating_obj_code"
+_GRID_POSITION = "grid_position"
+
+
+class SoftMHeatingObjBatchProcessor:
+
+    def __init__(self,
+                 columns_to_interpolate: List[str],
+                 timestamp_round_algorithm: AbstractTimestampRoundAlgorithm,
+                 time_tick: datetime.timedelta = TIME_TICK,
+                 timestamp_filter_algorithm: AbstractTimestampFilterAlgorithm =
+                 LeftClosedTimestampFilterAlgorithm(),
+                 heating_obj_id_column_name: str = "heating_obj_id"
+                 ) -> None:
+        self._columns_to_process = columns_to_interpolate
+        self._timestamp_round_algorithm = timestamp_round_algorithm
+        self._time_tick = pd.Timedelta(time_tick)
+        self._timestamp_filter_algorithm = timestamp_filter_algorithm
+        self._heating_obj_id_column_name = heating_obj_id_column_name
+
+        logger.debug(
+            f"Creating instance:"
+            f"columns_to_interpolate: {self._columns_to_process}"
+            f"timestamp_round_algorithm: {self._timestamp_round_algorithm}"
+            f"time_tick: {self._time_tick}"
+            f"timestamp_filter_algorithm: {self._timestamp_filter_algorithm}"
+            f"heating_obj_id_column_name: {self._heating_obj_id_column_name}"
+        )
+
+    @instrumented_stage("heating_obj_batch_processor.process_heating_objs")
+    def process_heating_objs(self,
+                             heating_objs_dfs: Dict[str, pd.DataFrame],
+                             min_required_timestamp: pd.Timestamp,
+                             max_required_timestamp: pd.Timestamp
+                             ) -> Dict[str, pd.DataFrame]:
+        heating_objs_ids = list(heating_objs_dfs)
+        grid, values = self._process_to_array(heating_objs_dfs, min_required_timestamp, max_required_timestamp)
+        processed_dfs = {}
+        for heating_obj_number, heating_obj_id in enumerate(heating_objs_ids):
+            # Values of each heating obj are a view of the shared array
+            processed_df = pd.DataFrame(values[heating_obj_number], columns=self._columns_to_process, copy=False)
+            processed_df.insert(0, column_names.TIMESTAMP, grid)
+            processed_dfs[heating_obj_id] = self._filter_by_timestamp(
+                processed_df,
+                max_required_timestamp,
+                min_required_timestamp
+            )
+        return processed_dfs
+
+    @instrumented_stage("heating_obj_batch_processor.process_heating_objs_to_stacked_df")
+    def process_heating_objs_to_stacked_df(self,
+                                           heating_objs_dfs: Dict[str, pd.DataFrame],
+                                           min_required_timestamp: pd.Timestamp,
+                                           max_required_timestamp: pd.Timestamp
+                                           ) -> pd.DataFrame:
+        heating_objs_ids = list(heating_objs_dfs)
+        grid, values = self._process_to_array(heating_objs_dfs, min_required_timestamp, max_required_timestamp)
+        objects_count, grid_length, columns_count = values.shape
+        stacked_df = pd.DataFrame(
+            values.reshape(objects_count * grid_length, columns_count),
+            columns=self._columns_to_process,
+            copy=False
+        )
+        stacked_df.insert(0, column_names.TIMESTAMP, np.tile(grid, objects_count))
+        stacked_df.insert(0, self._heating_obj_id_column_name, np.repeat(heating_objs_ids, grid_length))
+        return self._filter_by_timestamp(stacked_df, max_required_timestamp, min_required_timestamp)
+
+    @instrumented_stage("heating_obj_batch_processor.process_heating_objs_to_regular_grid")
+    def process_heating_objs_to_regular_grid(self,
+                                             heating_objs_dfs: Dict[str, pd.DataFrame],
+                                             min_required_timestamp: pd.Timestamp,
+                                             max_required_timestamp: pd.Timestamp,
+                                             dtype: Union[type, np.dtype] = np.float64
+                                             ) -> Dict[str, SoftMRegularGridFrame]:
+        heating_objs_ids = list(heating_objs_dfs)
+        grid, values = self._process_to_array(heating_objs_dfs, min_required_timestamp, max_required_timestamp)
+        # Filter algorithm is applied to the grid once, the kept points of a regular grid are contiguous
+        grid_df = pd.DataFrame({column_names.TIMESTAMP: grid})
+        kept_positions = self._filter_by_timestamp(grid_df, max_required_timestamp, min_required_timestamp).index
+        start_position = 0
+        stop_position = 0
+        if len(kept_positions) > 0:
+            start_position = kept_positions[0]
+            stop_position = kept_positions[-1] + 1
+        return {
+            heating_obj_id: SoftMRegularGridFrame(
+                grid[0] + self._time_tick * start_position,
+                values[heating_obj_number, start_position:stop_position],
+                self._columns_to_process,
+                self._time_tick,
+                dtype
+            )
+            for heating_obj_number, heating_obj_id in enumerate(heating_objs_ids)
+        }
+
+    def _process_to_array(self,
+                          heating_objs_dfs: Dict[str, pd.DataFrame],
+                          min_required_timestamp: pd.Timestamp,
+                          max_required_timestamp: pd.Timestamp
+                          ) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+        logger.debug(
+            f"Processing {len(heating_objs_dfs)} heating objs {min_required_timestamp}, {max_required_timestamp}"
+        )
+        if min_required_timestamp is None or max_required_timestamp is None:
+            raise ValueError("Batch processing requires both min and max required timestamps")
+
+        grid_start = self._timestamp_round_algorithm.round_value(min_required_timestamp)
+        grid_end = self._timestamp_round_algorithm.round_value(max_required_timestamp)
+        grid = pd.date_range(grid_start, grid_end, freq=self._time_tick)
+        objects_count = len(heating_objs_dfs)
+        grid_length = len(grid)
+        columns_count = len(self._columns_to_process)
+        if objects_count == 0:
+            logger.debug("There are no heating objs to process")
+            return grid, np.empty((0, grid_length, columns_count))
+
+        rows_df = self._concat_heating_objs(heating_objs_dfs)
+        rows_df[column_names.TIMESTAMP] = self._timestamp_round_algorithm.round_series(
+            rows_df[column_names.TIMESTAMP]
+        )
+        # Rows without timestamp do not land on the grid like in the per heating obj processing
+        rows_df = rows_df[rows_df[column_names.TIMESTAMP].notna()]
+        rows_df = rows_df.drop_duplicates([_HEATING_OBJ_CODE, column_names.TIMESTAMP], keep="last")
+        rows_df[_GRID_POSITION] = (rows_df[column_names.TIMESTAMP] - grid_start) // self._time_tick
+        rows_df = rows_df.sort_values([_HEATING_OBJ_CODE, _GRID_POSITION], kind="stable")
+
+        values = np.full((objects_count, grid_length, columns_count), np.nan)
+        positions = rows_df[_GRID_POSITION].to_numpy()
+        codes = rows_df[_HEATING_OBJ_CODE].to_numpy()
+        is_inside = (positions >= 0) & (positions < grid_length)
+        values[codes[is_inside], positions[is_inside]] = rows_df[self._columns_to_process].to_numpy(
+            dtype=np.float64
+        )[is_inside]
+
+        left_positions, left_values = self._get_anchors(rows_df[positions < 0], objects_count, keep="last")
+        right_positions, right_values = self._get_anchors(
+            rows_df[positions >= grid_length],
+            objects_count,
+            keep="first"
+        )
+        values = interpolate_regular_grid(values, left_positions, left_values, right_positions, right_values)
+        return grid, values
+
+    def _concat_heating_objs(self, heating_objs_dfs: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        rows_dfs = []
+        for heating_obj_code, heating_obj_df in enumerate(heating_objs_dfs.values()):
+            rows_df = heating_obj_df[[column_names.TIMESTAMP] + self._columns_to_process].copy()
+            rows_df[_HEATING_OBJ_CODE] = heating_obj_code
+            rows_dfs.append(rows_df)
+        return pd.concat(rows_dfs, ignore_index=True)
+
+    def _get_anchors(self,
+                     rows_df: pd.DataFrame,
+                     objects_count: int,
+                     keep: str
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+        anchors_shape = (objects_count, len(self._columns_to_process))
+        anchor_positions = np.full(anchors_shape, np.nan)
+        anchor_values = np.full(anchors_shape, np.nan)
+        for column_number, column_name in enumerate(self._columns_to_process):
+            known_rows_df = rows_df[rows_df[column_name].notna()]
+            known_rows_df = known_rows_df.drop_duplicates(_HEATING_OBJ_CODE, keep=keep)
+            codes = known_rows_df[_HEATING_OBJ_CODE].to_numpy()
+            anchor_positions[codes, column_number] = known_rows_df[_GRID_POSITION].to_numpy()
+            anchor_values[codes, column_number] = known_rows_df[column_name].to_numpy()
+        return anchor_positions, anchor_values
+
+    def _filter_by_timestamp(self,
+                             df: pd.DataFrame,
+                             max_required_timestamp: pd.Timestamp,
+                             min_required_timestamp: pd.Timestamp
+                             ) -> pd.DataFrame:
+        return self._timestamp_filter_algorithm.filter_df_by_min_max_timestamp(
+            df,
+            min_required_timestamp,
+            max_required_timestamp
+        )
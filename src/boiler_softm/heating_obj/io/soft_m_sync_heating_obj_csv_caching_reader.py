@@ -0,0 +1,132 @@
+import hashlib
+import io
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from typing import BinaryIO, Optional
+
+import numpy as np
+import pandas as pd
+from boiler.heating_obj.io.abstract_sync_heating_obj_reader import AbstractSyncHeatingObjReader
+
+from boiler_softm.constants import processing
+from boiler_softm.data_processing.cache_keys import describe_config
+from boiler_softm.data_processing.columnar_frame import split_df_to_columns, join_columns_to_df
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.logging import logger
+
+_META_FILE_NAME = "meta.pickle"
+
+
+class SoftMSyncHeatingObjCSVCachingReader(AbstractSyncHeatingObjReader):
+
+    def __init__(self,
+                 reader: SoftMSyncHeatingObjCSVReader,
+                 cache_dir: str,
+                 max_cache_size_bytes: int = processing.HEATING_OBJ_CACHE_MAX_SIZE_BYTES
+                 ) -> None:
+        self._reader = reader
+        self._cache_dir = cache_dir
+        self._max_cache_size_bytes = max_cache_size_bytes
+
+        os.makedirs(self._cache_dir, exist_ok=True)
+
+        logger.debug(
+            f"Creating instance:"
+            f"reader: {self._reader}"
+            f"cache_dir: {self._cache_dir}"
+            f"max_cache_size_bytes: {self._max_cache_size_bytes}"
+        )
+
+    def read_heating_obj_from_binary_stream(self,
+                                            binary_stream: BinaryIO
+                                            ) -> pd.DataFrame:
+        if not binary_stream.seekable():
+            binary_stream = io.BytesIO(binary_stream.read())
+        source_hash = self._hash_source(binary_stream)
+        config_hash = hashlib.sha256(describe_config(self._reader).encode("utf-8")).hexdigest()
+        entry_path = os.path.join(self._cache_dir, f"{source_hash}-{config_hash}")
+
+        if os.path.isdir(entry_path):
+            logger.debug(f"Loading heating obj data from cache entry {entry_path}")
+            os.utime(entry_path)
+            return self._load_entry(entry_path)
+
+        logger.debug("Heating obj data is not cached")
+        df = self._reader.read_heating_obj_from_binary_stream(binary_stream)
+        self._store_entry(entry_path, df)
+        self._evict_entries()
+        return df
+
+    # noinspection PyMethodMayBeStatic
+    def _hash_source(self, binary_stream: BinaryIO) -> str:
+        start_position = binary_stream.tell()
+        source_hash = hashlib.sha256()
+        for block in iter(lambda: binary_stream.read(1 << 20), b""):
+            source_hash.update(block)
+        binary_stream.seek(start_position)
+        return source_hash.hexdigest()
+
+    # noinspection PyMethodMayBeStatic
+    def _load_entry(self, entry_path: str) -> pd.DataFrame:
+        with open(os.path.join(entry_path, _META_FILE_NAME), "rb") as f:
+            meta = pickle.load(f)
+
+        arrays = []
+        for array_number in range(len(meta["columns"]) + 1):
+            array_path = os.path.join(entry_path, f"{array_number}.npy")
+            try:
+                arrays.append(np.load(array_path, mmap_mode="r"))
+            except ValueError:
+                # Object arrays are pickled and can not be memory-mapped
+                arrays.append(np.load(array_path, allow_pickle=True))
+        return join_columns_to_df(meta, arrays)
+
+    # noinspection PyMethodMayBeStatic
+    def _store_entry(self, entry_path: str, df: pd.DataFrame) -> None:
+        logger.debug(f"Storing heating obj data to cache entry {entry_path}")
+        temp_entry_path = tempfile.mkdtemp(dir=self._cache_dir, prefix=".")
+        try:
+            meta, arrays = split_df_to_columns(df)
+            with open(os.path.join(temp_entry_path, _META_FILE_NAME), "wb") as f:
+                pickle.dump(meta, f)
+            for array_number, values in enumerate(arrays):
+                np.save(os.path.join(temp_entry_path, f"{array_number}.npy"), values, allow_pickle=True)
+            os.replace(temp_entry_path, entry_path)
+        except OSError:
+            # Same entry may be stored by another process first
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            if not os.path.isdir(entry_path):
+                raise
+        except BaseException:
+            shutil.rmtree(temp_entry_path, ignore_errors=True)
+            raise
+
+    def _evict_entries(self) -> None:
+        entries = []
+        cache_size = 0
+        stale_temp_entry_time = time.time() - processing.HEATING_OBJ_CACHE_STALE_TEMP_ENTRY_AGE.total_seconds()
+        for entry_name in os.listdir(self._cache_dir):
+            entry_path = os.path.join(self._cache_dir, entry_name)
+            if not os.path.isdir(entry_path):
+                continue
+            if entry_name.startswith("."):
+                # Temp entries of killed writers are never renamed, the fresh ones may be still written
+                if os.path.getmtime(entry_path) < stale_temp_entry_time:
+                    logger.debug(f"Removing stale temp cache entry {entry_path}")
+                    shutil.rmtree(entry_path, ignore_errors=True)
+                continue
+            entry_size = sum(
+                os.path.getsize(os.path.join(entry_path, file_name)) for file_name in os.listdir(entry_path)
+            )
+            entries.append((os.path.getmtime(entry_path), entry_path, entry_size))
+            cache_size += entry_size
+
+        for _, entry_path, entry_size in sorted(entries):
+            if cache_size <= self._max_cache_size_bytes:
+                break
+            logger.debug(f"Evicting cache entry {entry_path}")
+            shutil.rmtree(entry_path, ignore_errors=True)
+            cache_size -= entry_size
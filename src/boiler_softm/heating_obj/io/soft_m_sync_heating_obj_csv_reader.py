@@ -1,15 +1,22 @@
-from typing import List, BinaryIO
+from typing import List, BinaryIO, Iterator, Optional, Dict
 
+import numpy as np
 import pandas as pd
 from boiler.constants import column_names
 from boiler.data_processing.timestamp_parsing_algorithm import AbstractTimestampParsingAlgorithm
 from boiler.heating_obj.io.abstract_sync_heating_obj_reader import AbstractSyncHeatingObjReader
+from pandas.api.types import is_float_dtype
 
 import boiler_softm.constants.converting_parameters
 from boiler_softm.constants import circuit_ids
 from boiler_softm.constants import column_names as soft_m_column_names
 from boiler_softm.constants import processing
+from boiler_softm.data_processing.circuit_mapping import map_circuit_ids
+from boiler_softm.data_processing.data_quality import ScaleIfAboveRule, SoftMDataQualityStage
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
 
 
 class SoftMSyncHeatingObjCSVReader(AbstractSyncHeatingObjReader):
@@ -20,14 +27,27 @@ class SoftMSyncHeatingObjCSVReader(AbstractSyncHeatingObjReader):
                  float_columns: List[str],
                  water_temp_columns: List[str],
                  need_circuit: str,
-                 encoding: str = "utf-8"
+                 encoding: str = "utf-8",
+                 chunk_size: Optional[int] = None,
+                 data_quality_stage: Optional[SoftMDataQualityStage] = None
                  ) -> None:
         self._encoding = encoding
+        self._chunk_size = chunk_size
         self._timestamp_parser = timestamp_parser
         self._need_circuit = need_circuit
         self._need_columns = need_columns
         self._float_columns = float_columns
         self._water_temp_columns = water_temp_columns
+        if data_quality_stage is None:
+            data_quality_stage = SoftMDataQualityStage([
+                ScaleIfAboveRule(
+                    column_name,
+                    processing.INCORRECT_WATER_TEMP_THRESHOLD,
+                    processing.INCORRECT_WATER_TEMP_DIVISOR
+                )
+                for column_name in water_temp_columns
+            ])
+        self._data_quality_stage = data_quality_stage
 
         self._circuit_id_equals = boiler_softm.constants.converting_parameters.LYSVA_CIRCUIT_EQUALS
         self._column_names_equals = boiler_softm.constants.converting_parameters.LYSVA_HEATING_OBJ_COLUMN_NAMES_EQUALS
@@ -40,38 +60,119 @@ class SoftMSyncHeatingObjCSVReader(AbstractSyncHeatingObjReader):
             f"need_columns: {self._need_columns}"
             f"float_columns: {self._float_columns}"
             f"water_temp_columns: {self._water_temp_columns}"
+            f"chunk_size: {self._chunk_size}"
+            f"data_quality_stage: {self._data_quality_stage}"
         )
 
+    @property
+    def need_circuit(self) -> str:
+        return self._need_circuit
+
+    @property
+    def data_quality_stage(self) -> SoftMDataQualityStage:
+        return self._data_quality_stage
+
+    @instrumented_stage("heating_obj_csv_reader.read_heating_obj_from_binary_stream")
     def read_heating_obj_from_binary_stream(self,
                                             binary_stream: BinaryIO
                                             ) -> pd.DataFrame:
         logger.debug("Loading heating obj data")
 
-        df = pd.read_csv(
-            binary_stream,
-            sep=";",
-            low_memory=False,
-            parse_dates=False,
-            encoding=self._encoding
-        )
+        if self._chunk_size is not None:
+            chunks = list(self.iter_heating_obj_chunks_from_binary_stream(binary_stream))
+            logger.debug(f"Concatenating {len(chunks)} heating obj chunks")
+            return pd.concat(chunks)
+
+        df = self._read_csv(binary_stream)
 
         logger.debug("Parsing heating obj data")
-        df = self._exclude_unused_circuits(df)
-        df = self._rename_equal_columns(df)
+        df = self._process_raw_df(df)
+
+        return df
+
+    def iter_heating_obj_chunks_from_binary_stream(self,
+                                                   binary_stream: BinaryIO,
+                                                   chunk_size: Optional[int] = None
+                                                   ) -> Iterator[pd.DataFrame]:
+        if chunk_size is None:
+            chunk_size = self._chunk_size
+        if chunk_size is None:
+            chunk_size = processing.HEATING_OBJ_READING_CHUNK_SIZE
+        logger.debug(f"Loading heating obj data by chunks of {chunk_size} rows")
+
+        for chunk in self._iter_csv_chunks(binary_stream, chunk_size):
+            logger.debug(f"Parsing heating obj chunk of {len(chunk)} rows")
+            yield self._process_raw_df(chunk)
+
+    def get_csv_columns_dtypes(self) -> Dict[str, type]:
+        columns_dtypes = {soft_m_column_names.LYSVA_HEATING_SYSTEM_CIRCUIT_ID: str}
+        for soft_m_column_name, target_column_name in self._column_names_equals.items():
+            if target_column_name not in self._need_columns:
+                continue
+            if target_column_name in self._float_columns:
+                columns_dtypes[soft_m_column_name] = np.float64
+            else:
+                columns_dtypes[soft_m_column_name] = str
+        return columns_dtypes
+
+    def process_circuit_df(self, circuit_df: pd.DataFrame) -> pd.DataFrame:
+        df = self._rename_equal_columns(circuit_df)
         df = self._parse_timestamp(df)
         df = self._convert_values_to_float(df)
-        df = self._divide_incorrect_hot_water_temp(df)
+        df = self._apply_data_quality_rules(df)
         df = self._exclude_unused_columns(df)
+        return df
+
+    @instrumented_stage("heating_obj_csv_reader.read_csv")
+    def _read_csv(self, binary_stream: BinaryIO) -> pd.DataFrame:
+        return self._open_csv(binary_stream)
+
+    def _iter_csv_chunks(self, binary_stream: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+        with self._open_csv(binary_stream, chunk_size) as chunks:
+            while True:
+                # Chunks are parsed lazily, so the parsing is measured for each chunk
+                try:
+                    chunk = self._read_csv_chunk(chunks)
+                except StopIteration:
+                    return
+                yield chunk
+
+    @instrumented_stage("heating_obj_csv_reader.read_csv")
+    def _read_csv_chunk(self, chunks) -> pd.DataFrame:
+        return next(chunks)
+
+    def _open_csv(self,
+                  binary_stream: BinaryIO,
+                  chunk_size: Optional[int] = None
+                  ):
+        columns_dtypes = self.get_csv_columns_dtypes()
+        return pd.read_csv(
+            binary_stream,
+            sep=";",
+            decimal=",",
+            usecols=list(columns_dtypes),
+            dtype=columns_dtypes,
+            parse_dates=False,
+            encoding=self._encoding,
+            chunksize=chunk_size
+        )
 
+    def _process_raw_df(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._exclude_unused_circuits(df)
+        df = self.process_circuit_df(df)
         return df
 
+    @instrumented_stage("heating_obj_csv_reader.exclude_unused_circuits")
     def _exclude_unused_circuits(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.debug("Excluding unused circuits")
-        renamed_circuits = \
-            df[soft_m_column_names.LYSVA_HEATING_SYSTEM_CIRCUIT_ID].apply(str).replace(self._circuit_id_equals)
+        renamed_circuits = map_circuit_ids(
+            df[soft_m_column_names.LYSVA_HEATING_SYSTEM_CIRCUIT_ID],
+            self._circuit_id_equals
+        )
         df = df[renamed_circuits == self._need_circuit].copy()
         return df
 
+    @instrumented_stage("heating_obj_csv_reader.rename_equal_columns")
     def _rename_equal_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.debug("Renaming equal columns")
         df = df.copy()
@@ -82,31 +183,36 @@ class SoftMSyncHeatingObjCSVReader(AbstractSyncHeatingObjReader):
         df = df.rename(columns=column_names_equals)
         return df
 
+    @instrumented_stage("heating_obj_csv_reader.parse_timestamp")
     def _parse_timestamp(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.debug("Parsing datetime")
         df = df.copy()
-        df[column_names.TIMESTAMP] = df[column_names.TIMESTAMP].apply(
-            self._timestamp_parser.parse_datetime
-        )
+        if isinstance(self._timestamp_parser, SoftMVectorizedTimestampParsingAlgorithm):
+            df[column_names.TIMESTAMP] = self._timestamp_parser.parse_series(df[column_names.TIMESTAMP])
+        else:
+            df[column_names.TIMESTAMP] = df[column_names.TIMESTAMP].apply(
+                self._timestamp_parser.parse_datetime
+            )
         return df
 
+    @instrumented_stage("heating_obj_csv_reader.convert_values_to_float")
     def _convert_values_to_float(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.debug("Converting values to float")
         df = df.copy()
         for column_name in self._float_columns:
+            if is_float_dtype(df[column_name]):
+                continue
             df[column_name] = df[column_name].str.replace(",", ".", regex=False)
-            df[column_name] = df[column_name].apply(float)
+            df[column_name] = pd.to_numeric(df[column_name]).astype(np.float64)
         return df
 
-    def _divide_incorrect_hot_water_temp(self, df: pd.DataFrame) -> pd.DataFrame:
-        logger.debug("Dividing incorrect water temp")
+    @instrumented_stage("heating_obj_csv_reader.apply_data_quality_rules")
+    def _apply_data_quality_rules(self, df: pd.DataFrame) -> pd.DataFrame:
+        logger.debug("Applying data quality rules")
         df = df.copy()
-        for column_name in self._water_temp_columns:
-            df[column_name] = df[column_name].apply(
-                lambda water_temp: water_temp > 100 and water_temp / 100 or water_temp
-            )
-        return df
+        return self._data_quality_stage.apply_to_df(df)
 
+    @instrumented_stage("heating_obj_csv_reader.exclude_unused_columns")
     def _exclude_unused_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         logger.debug("Excluding unused columns")
         df = df[self._need_columns].copy()
@@ -0,0 +1,97 @@
+import io
+import os
+from typing import BinaryIO, Optional, Tuple
+
+import pandas as pd
+
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.logging import logger
+
+_CHECKED_TAIL_SIZE = 256
+
+
+class SoftMSyncHeatingObjCSVTailReader:
+
+    def __init__(self,
+                 reader: SoftMSyncHeatingObjCSVReader,
+                 file_path: str,
+                 merge_with_previous: bool = False
+                 ) -> None:
+        self._reader = reader
+        self._file_path = file_path
+        self._merge_with_previous = merge_with_previous
+
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._header = b""
+        self._offset = 0
+        self._checked_tail = b""
+        self._read_lines_count = 0
+        self._merged_df: Optional[pd.DataFrame] = None
+
+        logger.debug(
+            f"Creating instance:"
+            f"reader: {self._reader}"
+            f"file_path: {self._file_path}"
+            f"merge_with_previous: {self._merge_with_previous}"
+        )
+
+    def read_heating_obj(self) -> pd.DataFrame:
+        with open(self._file_path, "rb") as f:
+            if self._is_same_file(f):
+                df = self._read_appended_lines(f)
+            else:
+                df = self._read_full_file(f)
+
+        if not self._merge_with_previous:
+            return df
+        if self._merged_df is None:
+            self._merged_df = df
+        elif not df.empty:
+            self._merged_df = pd.concat([self._merged_df, df])
+        return self._merged_df.copy()
+
+    def _is_same_file(self, f: BinaryIO) -> bool:
+        file_stat = os.fstat(f.fileno())
+        if self._file_id != (file_stat.st_dev, file_stat.st_ino):
+            logger.debug("Heating obj file is new or rotated")
+            return False
+        if file_stat.st_size < self._offset:
+            logger.debug("Heating obj file is truncated")
+            return False
+        if f.readline() != self._header:
+            logger.debug("Heating obj file header is changed")
+            return False
+        f.seek(self._offset - len(self._checked_tail))
+        if f.read(len(self._checked_tail)) != self._checked_tail:
+            logger.debug("Heating obj file is rewritten")
+            return False
+        return True
+
+    def _read_full_file(self, f: BinaryIO) -> pd.DataFrame:
+        logger.debug(f"Reading full heating obj file {self._file_path}")
+        file_stat = os.fstat(f.fileno())
+        f.seek(0)
+        self._file_id = (file_stat.st_dev, file_stat.st_ino)
+        self._header = f.readline()
+        self._offset = len(self._header)
+        self._checked_tail = self._header[-_CHECKED_TAIL_SIZE:]
+        self._read_lines_count = 0
+        self._merged_df = None
+        return self._read_appended_lines(f)
+
+    def _read_appended_lines(self, f: BinaryIO) -> pd.DataFrame:
+        f.seek(self._offset)
+        appended = f.read()
+        # Partially written last line is left for the next read
+        complete_size = appended.rfind(b"\n") + 1
+        appended = appended[:complete_size]
+        logger.debug(f"Reading {complete_size} appended bytes of heating obj file")
+
+        df = self._reader.read_heating_obj_from_binary_stream(io.BytesIO(self._header + appended))
+        df.index = df.index + self._read_lines_count
+
+        self._offset += complete_size
+        if appended:
+            self._checked_tail = (self._checked_tail + appended)[-_CHECKED_TAIL_SIZE:]
+        self._read_lines_count += appended.count(b"\n")
+        return df
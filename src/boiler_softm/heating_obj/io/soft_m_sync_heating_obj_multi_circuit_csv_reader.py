@@ -0,0 +1,110 @@
+from typing import BinaryIO, Dict, Iterator, List, Optional
+
+import pandas as pd
+
+import boiler_softm.constants.converting_parameters
+from boiler_softm.constants import column_names as soft_m_column_names
+from boiler_softm.data_processing.circuit_mapping import map_circuit_ids
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+
+
+class SoftMSyncHeatingObjMultiCircuitCSVReader:
+
+    def __init__(self,
+                 circuit_readers: List[SoftMSyncHeatingObjCSVReader],
+                 encoding: str = "utf-8",
+                 chunk_size: Optional[int] = None
+                 ) -> None:
+        self._circuit_readers = {reader.need_circuit: reader for reader in circuit_readers}
+        if len(self._circuit_readers) != len(circuit_readers):
+            raise ValueError("Each circuit reader must read its own circuit")
+        self._encoding = encoding
+        self._chunk_size = chunk_size
+
+        self._circuit_id_equals = boiler_softm.constants.converting_parameters.LYSVA_CIRCUIT_EQUALS
+
+        logger.debug(
+            f"Creating instance:"
+            f"circuit_readers: {self._circuit_readers}"
+            f"encoding: {self._encoding}"
+            f"chunk_size: {self._chunk_size}"
+        )
+
+    @instrumented_stage("heating_obj_multi_circuit_csv_reader.read_heating_obj_circuits_from_binary_stream")
+    def read_heating_obj_circuits_from_binary_stream(self,
+                                                     binary_stream: BinaryIO
+                                                     ) -> Dict[str, pd.DataFrame]:
+        logger.debug("Loading heating obj circuits data")
+
+        if self._chunk_size is None:
+            df = self._read_csv(binary_stream)
+            return self._process_raw_df(df)
+
+        circuits_chunks = {circuit: [] for circuit in self._circuit_readers}
+        for chunk in self._iter_csv_chunks(binary_stream, self._chunk_size):
+            logger.debug(f"Parsing heating obj circuits chunk of {len(chunk)} rows")
+            for circuit, circuit_df in self._process_raw_df(chunk).items():
+                circuits_chunks[circuit].append(circuit_df)
+
+        logger.debug("Concatenating heating obj circuits chunks")
+        return {circuit: pd.concat(chunks) for circuit, chunks in circuits_chunks.items()}
+
+    def _get_csv_columns_dtypes(self) -> Dict[str, type]:
+        columns_dtypes = {}
+        for reader in self._circuit_readers.values():
+            for column_name, dtype in reader.get_csv_columns_dtypes().items():
+                # Columns that are float only for some circuits are converted by those circuit readers
+                if columns_dtypes.get(column_name, dtype) is not dtype:
+                    dtype = str
+                columns_dtypes[column_name] = dtype
+        return columns_dtypes
+
+    @instrumented_stage("heating_obj_multi_circuit_csv_reader.read_csv")
+    def _read_csv(self, binary_stream: BinaryIO) -> pd.DataFrame:
+        return self._open_csv(binary_stream)
+
+    def _iter_csv_chunks(self, binary_stream: BinaryIO, chunk_size: int) -> Iterator[pd.DataFrame]:
+        with self._open_csv(binary_stream, chunk_size) as chunks:
+            while True:
+                # Chunks are parsed lazily, so the parsing is measured for each chunk
+                try:
+                    chunk = self._read_csv_chunk(chunks)
+                except StopIteration:
+                    return
+                yield chunk
+
+    @instrumented_stage("heating_obj_multi_circuit_csv_reader.read_csv")
+    def _read_csv_chunk(self, chunks) -> pd.DataFrame:
+        return next(chunks)
+
+    def _open_csv(self,
+                  binary_stream: BinaryIO,
+                  chunk_size: Optional[int] = None
+                  ):
+        columns_dtypes = self._get_csv_columns_dtypes()
+        return pd.read_csv(
+            binary_stream,
+            sep=";",
+            decimal=",",
+            usecols=list(columns_dtypes),
+            dtype=columns_dtypes,
+            parse_dates=False,
+            encoding=self._encoding,
+            chunksize=chunk_size
+        )
+
+    def _process_raw_df(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        logger.debug("Splitting circuits")
+        renamed_circuits = map_circuit_ids(
+            df[soft_m_column_names.LYSVA_HEATING_SYSTEM_CIRCUIT_ID],
+            self._circuit_id_equals
+        )
+        circuits_positions = renamed_circuits.groupby(renamed_circuits, sort=False).indices
+
+        circuits_dfs = {}
+        for circuit, reader in self._circuit_readers.items():
+            circuit_df = df.iloc[circuits_positions.get(circuit, [])]
+            circuits_dfs[circuit] = reader.process_circuit_df(circuit_df)
+        return circuits_dfs
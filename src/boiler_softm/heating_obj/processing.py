@@ -1,5 +1,9 @@
-from typing import Union, List
+from typing import Union, List, Optional, Tuple, Dict, Any
 
+import datetime
+from datetime import tzinfo
+
+import numpy as np
 import pandas as pd
 from boiler.constants import column_names
 from boiler.data_processing.beetween_filter_algorithm \
@@ -8,7 +12,76 @@ from boiler.data_processing.timestamp_interpolator_algorithm import AbstractTime
 from boiler.data_processing.timestamp_round_algorithm import AbstractTimestampRoundAlgorithm
 from boiler.data_processing.value_interpolation_algorithm import AbstractValueInterpolationAlgorithm
 from boiler.heating_obj.processing import AbstractHeatingObjProcessor
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
+from boiler_softm.data_processing.regular_grid_frame import SoftMRegularGridFrame
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+
+
+class SoftMHeatingObjProcessingState:
+
+    def __init__(self,
+                 anchor_df: Optional[pd.DataFrame] = None,
+                 pending_df: Optional[pd.DataFrame] = None
+                 ) -> None:
+        self._anchor_df = anchor_df
+        self._pending_df = pending_df
+
+    def get_anchor_df(self, timezone: Optional[tzinfo]) -> Optional[pd.DataFrame]:
+        return self._convert_timezone(self._anchor_df, timezone)
+
+    def get_pending_df(self, timezone: Optional[tzinfo]) -> Optional[pd.DataFrame]:
+        return self._convert_timezone(self._pending_df, timezone)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "anchor": self._df_to_dict(self._anchor_df),
+            "pending": self._df_to_dict(self._pending_df)
+        }
+
+    @classmethod
+    def from_dict(cls, state_dict: Dict[str, Any]) -> "SoftMHeatingObjProcessingState":
+        return cls(
+            anchor_df=cls._df_from_dict(state_dict["anchor"]),
+            pending_df=cls._df_from_dict(state_dict["pending"])
+        )
+
+    @staticmethod
+    def _convert_timezone(df: Optional[pd.DataFrame], timezone: Optional[tzinfo]) -> Optional[pd.DataFrame]:
+        if df is None or df[column_names.TIMESTAMP].dt.tz is None:
+            return df
+        df = df.copy()
+        df[column_names.TIMESTAMP] = df[column_names.TIMESTAMP].dt.tz_convert(timezone)
+        return df
+
+    @staticmethod
+    def _df_to_dict(df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
+        if df is None:
+            return None
+        timestamps = df[column_names.TIMESTAMP]
+        is_tz_aware = timestamps.dt.tz is not None
+        if is_tz_aware:
+            timestamps = timestamps.dt.tz_convert("UTC").dt.tz_localize(None)
+        columns = {}
+        for column_name in df.columns:
+            if column_name != column_names.TIMESTAMP:
+                columns[column_name] = [None if pd.isna(value) else value for value in df[column_name].tolist()]
+        return {
+            "column_names": list(df.columns),
+            "timestamps": timestamps.astype("int64").tolist(),
+            "is_tz_aware": is_tz_aware,
+            "columns": columns
+        }
+
+    @staticmethod
+    def _df_from_dict(df_dict: Optional[Dict[str, Any]]) -> Optional[pd.DataFrame]:
+        if df_dict is None:
+            return None
+        timestamps = pd.to_datetime(df_dict["timestamps"], unit="ns", utc=df_dict["is_tz_aware"])
+        df = pd.DataFrame(df_dict["columns"])
+        df[column_names.TIMESTAMP] = timestamps
+        return df[df_dict["column_names"]]
 
 
 class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
@@ -20,7 +93,9 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
                  border_values_interpolation_algorithm: AbstractValueInterpolationAlgorithm,
                  internal_values_interpolation_algorithm: AbstractValueInterpolationAlgorithm,
                  timestamp_filter_algorithm: AbstractTimestampFilterAlgorithm =
-                 LeftClosedTimestampFilterAlgorithm()
+                 LeftClosedTimestampFilterAlgorithm(),
+                 copy_input_df: bool = True,
+                 grid_resampler: Optional[SoftMGridResampler] = None
                  ) -> None:
 
         self._columns_to_process = columns_to_interpolate
@@ -29,6 +104,10 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
         self._border_values_interpolation_algorithm = border_values_interpolation_algorithm
         self._internal_values_interpolation_algorithm = internal_values_interpolation_algorithm
         self._timestamp_filter_algorithm = timestamp_filter_algorithm
+        self._copy_input_df = copy_input_df
+        # Fused replacement of rounding, deduplication, timestamp and value interpolation,
+        # it gives the same result only for TimestampInterpolationAlgorithm with linear value interpolation
+        self._grid_resampler = grid_resampler
 
         logger.debug(
             f"Creating instance:"
@@ -38,8 +117,11 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
             f"border_values_interpolation_algorithm: {self._border_values_interpolation_algorithm}"
             f"internal_values_interpolation_algorithm: {self._internal_values_interpolation_algorithm}"
             f"timestamp_filter_algorithm: {self._timestamp_filter_algorithm}"
+            f"copy_input_df: {self._copy_input_df}"
+            f"grid_resampler: {self._grid_resampler}"
         )
 
+    @instrumented_stage("heating_obj_processor.process_heating_obj")
     def process_heating_obj(self,
                             heating_obj_df: pd.DataFrame,
                             min_required_timestamp: Union[pd.Timestamp, None],
@@ -47,7 +129,17 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
                             ) -> pd.DataFrame:
         logger.debug(f"Processing heating obj {min_required_timestamp}, {max_required_timestamp}")
 
-        heating_obj_df = heating_obj_df.copy()
+        if self._grid_resampler is not None and not heating_obj_df.empty:
+            heating_obj_df = self._grid_resampler.resample_df(
+                heating_obj_df,
+                self._columns_to_process,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+            return self._filter_by_timestamp(heating_obj_df, max_required_timestamp, min_required_timestamp)
+
+        if self._copy_input_df:
+            heating_obj_df = heating_obj_df.copy()
         heating_obj_df = self._round_timestamp(heating_obj_df)
         heating_obj_df = self._drop_duplicates_by_timestamp(heating_obj_df)
         heating_obj_df = self._interpolate_timestamp(heating_obj_df, max_required_timestamp, min_required_timestamp)
@@ -56,21 +148,95 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
 
         return heating_obj_df
 
+    def process_heating_obj_to_regular_grid(self,
+                                            heating_obj_df: pd.DataFrame,
+                                            min_required_timestamp: Union[pd.Timestamp, None],
+                                            max_required_timestamp: Union[pd.Timestamp, None],
+                                            time_tick: datetime.timedelta = TIME_TICK,
+                                            dtype: Union[type, np.dtype] = np.float64
+                                            ) -> SoftMRegularGridFrame:
+        heating_obj_df = self.process_heating_obj(heating_obj_df, min_required_timestamp, max_required_timestamp)
+        heating_obj_df = heating_obj_df[[column_names.TIMESTAMP] + self._columns_to_process]
+        start = None
+        if min_required_timestamp is not None:
+            # Window without rows gives empty frame at the window start like the batch processing
+            start = self._timestamp_round_algorithm.round_value(min_required_timestamp)
+        return SoftMRegularGridFrame.from_df(heating_obj_df, time_tick, dtype, start)
+
+    @instrumented_stage("heating_obj_processor.process_new_heating_obj")
+    def process_new_heating_obj(self,
+                                heating_obj_df: pd.DataFrame,
+                                state: Optional[SoftMHeatingObjProcessingState] = None
+                                ) -> Tuple[pd.DataFrame, SoftMHeatingObjProcessingState]:
+        logger.debug(f"Processing {len(heating_obj_df)} new heating obj rows")
+        if state is None:
+            state = SoftMHeatingObjProcessingState()
+
+        if self._copy_input_df:
+            heating_obj_df = heating_obj_df.copy()
+        heating_obj_df = self._round_timestamp(heating_obj_df)
+        timezone = heating_obj_df[column_names.TIMESTAMP].dt.tz
+        anchor_df = state.get_anchor_df(timezone)
+        pending_df = state.get_pending_df(timezone)
+
+        anchor_timestamp = None
+        if anchor_df is not None:
+            anchor_timestamp = anchor_df[column_names.TIMESTAMP].iloc[0]
+            is_outdated = heating_obj_df[column_names.TIMESTAMP] <= anchor_timestamp
+            if is_outdated.any():
+                logger.debug(f"Skipping {is_outdated.sum()} rows that are already processed")
+                heating_obj_df = heating_obj_df[~is_outdated]
+
+        window_df = pd.concat(
+            [df for df in (anchor_df, pending_df, heating_obj_df) if df is not None],
+            ignore_index=True
+        )
+        window_df = self._drop_duplicates_by_timestamp(window_df)
+
+        # Grid points up to the last row with all values known are not changed by later rows,
+        # the last row itself can still be replaced by a later row with the same rounded timestamp
+        timestamps = window_df[column_names.TIMESTAMP]
+        is_complete = window_df[self._columns_to_process].notna().all(axis=1) & (timestamps < timestamps.max())
+        if anchor_timestamp is not None:
+            is_complete &= timestamps > anchor_timestamp
+        if not is_complete.any():
+            logger.debug("There are no new complete heating obj rows")
+            if anchor_timestamp is not None:
+                window_df = window_df[timestamps > anchor_timestamp]
+            new_state = SoftMHeatingObjProcessingState(anchor_df, window_df)
+            return window_df.iloc[0:0].reset_index(drop=True), new_state
+
+        finalized_timestamp = timestamps[is_complete].max()
+        finalized_df = window_df[timestamps <= finalized_timestamp]
+        pending_df = window_df[timestamps > finalized_timestamp].reset_index(drop=True)
+        finalized_df = self._interpolate_timestamp(finalized_df, None, None)
+        finalized_df = self._interpolate_values(finalized_df)
+
+        anchor_df = finalized_df[finalized_df[column_names.TIMESTAMP] == finalized_timestamp].reset_index(drop=True)
+        if anchor_timestamp is not None:
+            finalized_df = finalized_df[finalized_df[column_names.TIMESTAMP] > anchor_timestamp]
+        finalized_df = finalized_df.reset_index(drop=True)
+        logger.debug(f"Processed heating obj up to {finalized_timestamp}")
+
+        return finalized_df, SoftMHeatingObjProcessingState(anchor_df, pending_df)
+
+    @instrumented_stage("heating_obj_processor.round_timestamp")
     def _round_timestamp(self,
                          heating_obj_df: pd.DataFrame
                          ) -> pd.DataFrame:
-        heating_obj_df = heating_obj_df.copy()
         heating_obj_df[column_names.TIMESTAMP] = self._timestamp_round_algorithm.round_series(
             heating_obj_df[column_names.TIMESTAMP]
         )
         return heating_obj_df
 
     # noinspection PyMethodMayBeStatic
+    @instrumented_stage("heating_obj_processor.drop_duplicates_by_timestamp")
     def _drop_duplicates_by_timestamp(self,
                                       heating_obj_df: pd.DataFrame
                                       ) -> pd.DataFrame:
         return heating_obj_df.drop_duplicates(column_names.TIMESTAMP, ignore_index=True, keep="last")
 
+    @instrumented_stage("heating_obj_processor.interpolate_timestamp")
     def _interpolate_timestamp(self,
                                heating_obj_df: pd.DataFrame,
                                max_required_timestamp: Union[pd.Timestamp, None],
@@ -83,10 +249,10 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
         )
         return heating_obj_df
 
+    @instrumented_stage("heating_obj_processor.interpolate_values")
     def _interpolate_values(self,
                             heating_obj_df: pd.DataFrame
                             ) -> pd.DataFrame:
-        heating_obj_df = heating_obj_df.copy()
         for column_name in self._columns_to_process:
             heating_obj_df[column_name] = self._border_values_interpolation_algorithm.interpolate_series(
                 heating_obj_df[column_name]
@@ -96,6 +262,7 @@ class SoftMHeatingObjProcessor(AbstractHeatingObjProcessor):
             )
         return heating_obj_df
 
+    @instrumented_stage("heating_obj_processor.filter_by_timestamp")
     def _filter_by_timestamp(self,
                              heating_obj_df: pd.DataFrame,
                              max_required_timestamp: Union[pd.Timestamp, None],
@@ -0,0 +1,27 @@
+import asyncio
+from typing import Any, Awaitable, Iterable, List, Tuple
+
+from boiler_softm.constants import api_constants
+from boiler_softm.logging import logger
+
+
+async def gather_with_server_limit(server_awaitables: Iterable[Tuple[str, Awaitable[Any]]],
+                                   max_concurrent_requests_per_server: int =
+                                   api_constants.HTTP_MAX_CONCURRENT_REQUESTS_PER_SERVER,
+                                   return_exceptions: bool = False
+                                   ) -> List[Any]:
+    server_awaitables = list(server_awaitables)
+    logger.debug(f"Gathering {len(server_awaitables)} requests")
+    semaphores = {}
+    for server_address, _ in server_awaitables:
+        if server_address not in semaphores:
+            semaphores[server_address] = asyncio.Semaphore(max_concurrent_requests_per_server)
+
+    async def run_with_limit(server_address: str, awaitable: Awaitable[Any]) -> Any:
+        async with semaphores[server_address]:
+            return await awaitable
+
+    return await asyncio.gather(
+        *(run_with_limit(server_address, awaitable) for server_address, awaitable in server_awaitables),
+        return_exceptions=return_exceptions
+    )
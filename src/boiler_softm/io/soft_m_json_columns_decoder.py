@@ -0,0 +1,166 @@
+import json
+from typing import Any, BinaryIO, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover
+    ijson = None
+
+JSON_BACKEND_ORJSON = "orjson"
+JSON_BACKEND_IJSON = "ijson"
+JSON_BACKEND_JSON = "json"
+
+_READING_BLOCK_SIZE = 1 << 16
+
+
+def get_available_json_backends() -> List[str]:
+    backends = []
+    if orjson is not None:
+        backends.append(JSON_BACKEND_ORJSON)
+    if ijson is not None:
+        backends.append(JSON_BACKEND_IJSON)
+    backends.append(JSON_BACKEND_JSON)
+    return backends
+
+
+def _values_to_array(values: Sequence[Any]) -> np.ndarray:
+    value_types = set(map(type, values))
+    if value_types <= {int}:
+        return np.array(values, dtype=np.int64)
+    if value_types <= {bool}:
+        return np.array(values, dtype=np.bool_)
+    # Numbers with missing values are kept as floats, everything else as objects like pandas does
+    if value_types <= {int, float, type(None)}:
+        return np.array(values, dtype=np.float64)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    if str in value_types and value_types <= {str, int, float, type(None)}:
+        return _convert_numeric_strings(array)
+    return array
+
+
+def _convert_numeric_strings(array: np.ndarray) -> np.ndarray:
+    # Same conversion as pd.read_json(dtype=True) does: SoftM API sometimes sends numbers as strings
+    try:
+        float_array = pd.Series(array, copy=False).astype(np.float64).to_numpy()
+    except (TypeError, ValueError):
+        return array
+    if not np.isnan(float_array).any():
+        int_array = float_array.astype(np.int64)
+        if (int_array == float_array).all():
+            return int_array
+    return float_array
+
+
+class SoftMJSONColumnsDecoder:
+    # Only ijson backend parses records incrementally while the body is read, orjson and json
+    # backends read the whole body into memory first. orjson is the default as it is the fastest one,
+    # pass backend="ijson" when memory of large responses matters more than decoding time.
+
+    def __init__(self,
+                 records_path: Optional[str] = None,
+                 backend: Optional[str] = None,
+                 encoding: str = "utf-8"
+                 ) -> None:
+        if backend is None:
+            backend = get_available_json_backends()[0]
+        if backend not in get_available_json_backends():
+            raise ValueError(f"JSON backend {backend} is not available")
+        self._records_path = records_path
+        self._backend = backend
+        self._encoding = encoding
+
+        logger.debug(
+            f"Creating instance:"
+            f"records_path: {self._records_path}"
+            f"backend: {self._backend}"
+            f"encoding: {self._encoding}"
+        )
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    def decode_from_binary_stream(self, binary_stream: BinaryIO) -> pd.DataFrame:
+        return pd.DataFrame(self.decode_columns_from_binary_stream(binary_stream))
+
+    @instrumented_stage("json_columns_decoder.decode_columns_from_binary_stream")
+    def decode_columns_from_binary_stream(self, binary_stream: BinaryIO) -> Dict[str, np.ndarray]:
+        logger.debug(f"Decoding JSON records with {self._backend}")
+        if self._backend == JSON_BACKEND_IJSON and self._encoding.lower().replace("-", "") == "utf8":
+            prefix = "item" if self._records_path is None else f"{self._records_path}.item"
+            records = ijson.items(binary_stream, prefix, use_float=True)
+        else:
+            records = self._load_records(self._read_bytes(binary_stream))
+        return self._records_to_columns(records)
+
+    # noinspection PyMethodMayBeStatic
+    def _read_bytes(self, binary_stream: BinaryIO) -> bytes:
+        # Blocks are collected as they arrive, without a text layer in between
+        buffer = bytearray()
+        for block in iter(lambda: binary_stream.read(_READING_BLOCK_SIZE), b""):
+            buffer += block
+        return bytes(buffer)
+
+    def _load_records(self, content: bytes) -> Iterable[Dict[str, Any]]:
+        if self._encoding.lower().replace("-", "") != "utf8":
+            document = json.loads(content.decode(self._encoding))
+        elif self._backend == JSON_BACKEND_ORJSON:
+            document = orjson.loads(content)
+        else:
+            document = json.loads(content)
+        if self._records_path is not None:
+            for key in self._records_path.split("."):
+                if not isinstance(document, dict):
+                    raise ValueError(
+                        f"JSON document does not match records path {self._records_path}: "
+                        f"{type(document).__name__} is found instead of object with key {key}"
+                    )
+                document = document.get(key) or []
+        if not isinstance(document, list):
+            raise ValueError(
+                f"JSON records are expected to be a list at records path {self._records_path}, "
+                f"got {type(document).__name__}"
+            )
+        return document
+
+    # noinspection PyMethodMayBeStatic
+    def _records_to_columns(self, records: Iterable[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        if isinstance(records, list):
+            records_keys = list(dict.fromkeys(map(tuple, records)))
+            if len(records_keys) == 1:
+                # Records of the same shape are transposed to columns without per-value lookups
+                columns = dict(zip(records_keys[0], zip(*map(dict.values, records))))
+            else:
+                column_names = list(dict.fromkeys(key for keys in records_keys for key in keys))
+                columns = {
+                    column_name: [record.get(column_name, np.nan) for record in records]
+                    for column_name in column_names
+                }
+        else:
+            # Records from an incremental parser are appended to columns as they are decoded
+            columns: Dict[str, List[Any]] = {}
+            records_count = 0
+            for record in records:
+                for key, value in record.items():
+                    column = columns.get(key)
+                    if column is None:
+                        column = [np.nan] * records_count
+                        columns[key] = column
+                    column.append(value)
+                records_count += 1
+                for column in columns.values():
+                    if len(column) < records_count:
+                        column.append(np.nan)
+        return {key: _values_to_array(values) for key, values in columns.items()}
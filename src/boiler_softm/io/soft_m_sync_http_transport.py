@@ -0,0 +1,167 @@
+import datetime
+import email.utils
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, Optional, Sequence
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from boiler_softm.constants import api_constants
+from boiler_softm.logging import logger
+from boiler_softm.metrics import record_stage
+
+
+class SoftMSyncHTTPTransport:
+
+    def __init__(self,
+                 connect_timeout: float = api_constants.HTTP_CONNECT_TIMEOUT,
+                 read_timeout: float = api_constants.HTTP_READ_TIMEOUT,
+                 max_retries: int = api_constants.HTTP_MAX_RETRIES,
+                 backoff_factor: float = api_constants.HTTP_BACKOFF_FACTOR,
+                 max_backoff: float = api_constants.HTTP_MAX_BACKOFF,
+                 max_retry_after: float = api_constants.HTTP_MAX_RETRY_AFTER,
+                 retry_status_codes: Sequence[int] = api_constants.HTTP_RETRY_STATUS_CODES,
+                 pool_max_size: int = api_constants.HTTP_POOL_MAX_SIZE,
+                 latency_callback: Optional[Callable[[str, int, float], None]] = None
+                 ) -> None:
+        self._connect_timeout = connect_timeout
+        self._read_timeout = read_timeout
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+        self._max_backoff = max_backoff
+        self._max_retry_after = max_retry_after
+        self._retry_status_codes = frozenset(retry_status_codes)
+        self._pool_max_size = pool_max_size
+        self._latency_callback = latency_callback
+
+        self._sessions: Dict[str, requests.Session] = {}
+        self._sessions_lock = threading.Lock()
+        self._last_latency = None
+
+        logger.debug(
+            f"Creating instance:"
+            f"connect_timeout: {self._connect_timeout}"
+            f"read_timeout: {self._read_timeout}"
+            f"max_retries: {self._max_retries}"
+            f"backoff_factor: {self._backoff_factor}"
+            f"max_backoff: {self._max_backoff}"
+            f"max_retry_after: {self._max_retry_after}"
+            f"retry_status_codes: {self._retry_status_codes}"
+            f"pool_max_size: {self._pool_max_size}"
+        )
+
+    # Latency of the last request made through the transport on any thread,
+    # latency_callback should be used to get the latency of a particular request
+    @property
+    def last_latency(self) -> Optional[float]:
+        return self._last_latency
+
+    @contextmanager
+    def get(self,
+            url: str,
+            params: Optional[Dict[str, str]] = None,
+            proxies: Optional[Dict[str, str]] = None,
+            headers: Optional[Dict[str, str]] = None
+            ) -> Iterator[requests.Response]:
+        session = self._get_session(url)
+        attempt = 0
+        while True:
+            retry_after = None
+            start_time = time.perf_counter()
+            try:
+                response = session.get(
+                    url=url,
+                    params=params,
+                    proxies=proxies,
+                    headers=headers,
+                    stream=True,
+                    timeout=(self._connect_timeout, self._read_timeout)
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self._max_retries:
+                    raise
+                logger.debug(f"Request to {url} is failed: {e}")
+            else:
+                latency = time.perf_counter() - start_time
+                self._report_latency(url, response.status_code, latency)
+                if response.status_code not in self._retry_status_codes or attempt >= self._max_retries:
+                    break
+                logger.debug(f"Request to {url} is failed. Status code is {response.status_code}")
+                retry_after = self._get_retry_after(response)
+                response.close()
+            self._sleep_before_retry(attempt, retry_after)
+            attempt += 1
+
+        with response:
+            yield response
+
+    def close(self) -> None:
+        with self._sessions_lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def _get_session(self, url: str) -> requests.Session:
+        split_url = urlsplit(url)
+        api_base = f"{split_url.scheme}://{split_url.netloc}"
+        with self._sessions_lock:
+            session = self._sessions.get(api_base)
+            if session is None:
+                logger.debug(f"Creating session for {api_base}")
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self._pool_max_size)
+                session.mount(f"{api_base}/", adapter)
+                self._sessions[api_base] = session
+        return session
+
+    def _report_latency(self, url: str, status_code: int, latency: float) -> None:
+        logger.debug(f"Request to {url} took {latency:.3f}s. Status code is {status_code}")
+        self._last_latency = latency
+        record_stage("http_transport.request", latency)
+        if self._latency_callback is not None:
+            self._latency_callback(url, status_code, latency)
+
+    def _get_retry_after(self, response: requests.Response) -> Optional[float]:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is None:
+            return None
+        try:
+            seconds = float(retry_after)
+        except ValueError:
+            # Retry-After is either a number of seconds or an HTTP date
+            try:
+                retry_at = email.utils.parsedate_to_datetime(retry_after)
+            except (TypeError, ValueError):
+                logger.debug(f"Retry-After header {retry_after} is not parsed")
+                return None
+            if retry_at.tzinfo is None:
+                retry_at = retry_at.replace(tzinfo=datetime.timezone.utc)
+            seconds = (retry_at - datetime.datetime.now(datetime.timezone.utc)).total_seconds()
+        return min(max(seconds, 0.0), self._max_retry_after)
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[float] = None) -> None:
+        # Full jitter keeps retries of several loaders from hitting the server at once
+        backoff = min(self._max_backoff, self._backoff_factor * (2 ** attempt))
+        delay = random.uniform(0, backoff)
+        if retry_after is not None:
+            # Throttled server is not retried before the time it asked for
+            delay = max(retry_after, delay)
+        logger.debug(f"Retrying request in {delay:.3f}s")
+        time.sleep(delay)
+
+
+_default_transport: Optional[SoftMSyncHTTPTransport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> SoftMSyncHTTPTransport:
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = SoftMSyncHTTPTransport()
+    return _default_transport
@@ -0,0 +1,225 @@
+import functools
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from boiler_softm.logging import logger
+
+
+class AbstractMetricsSink:
+
+    def record_stage(self,
+                     stage_name: str,
+                     seconds: float,
+                     rows_in: Optional[int] = None,
+                     rows_out: Optional[int] = None,
+                     allocated_bytes: Optional[int] = None
+                     ) -> None:
+        raise NotImplementedError
+
+
+class InMemoryMetricsSink(AbstractMetricsSink):
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+
+        logger.debug("Creating instance")
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records)
+
+    def record_stage(self,
+                     stage_name: str,
+                     seconds: float,
+                     rows_in: Optional[int] = None,
+                     rows_out: Optional[int] = None,
+                     allocated_bytes: Optional[int] = None
+                     ) -> None:
+        record = {
+            "stage_name": stage_name,
+            "seconds": seconds,
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "allocated_bytes": allocated_bytes
+        }
+        with self._lock:
+            self._records.append(record)
+
+    def get_stage_records(self, stage_name: str) -> List[Dict[str, Any]]:
+        return [record for record in self.records if record["stage_name"] == stage_name]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+
+class PrometheusTextMetricsSink(AbstractMetricsSink):
+
+    def __init__(self, metrics_prefix: str = "boiler_softm_stage") -> None:
+        self._metrics_prefix = metrics_prefix
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+
+        logger.debug(
+            f"Creating instance:"
+            f"metrics_prefix: {self._metrics_prefix}"
+        )
+
+    def record_stage(self,
+                     stage_name: str,
+                     seconds: float,
+                     rows_in: Optional[int] = None,
+                     rows_out: Optional[int] = None,
+                     allocated_bytes: Optional[int] = None
+                     ) -> None:
+        with self._lock:
+            stage = self._stages.get(stage_name)
+            if stage is None:
+                stage = {"calls": 0, "seconds": 0.0, "rows_in": 0, "rows_out": 0, "allocated_bytes": 0}
+                self._stages[stage_name] = stage
+            stage["calls"] += 1
+            stage["seconds"] += seconds
+            stage["rows_in"] += rows_in or 0
+            stage["rows_out"] += rows_out or 0
+            stage["allocated_bytes"] += allocated_bytes or 0
+
+    def to_prometheus_text(self) -> str:
+        metrics = (
+            ("calls_total", "calls", "Stage calls"),
+            ("seconds_total", "seconds", "Wall time spent in stage"),
+            ("rows_in_total", "rows_in", "Rows passed to stage"),
+            ("rows_out_total", "rows_out", "Rows returned by stage"),
+            ("allocated_bytes_total", "allocated_bytes", "Peak bytes allocated by stage while memory is traced")
+        )
+        with self._lock:
+            stages = {stage_name: dict(stage) for stage_name, stage in self._stages.items()}
+
+        lines = []
+        for metric_suffix, stage_key, metric_help in metrics:
+            metric_name = f"{self._metrics_prefix}_{metric_suffix}"
+            lines.append(f"# HELP {metric_name} {metric_help}")
+            lines.append(f"# TYPE {metric_name} counter")
+            for stage_name in sorted(stages):
+                escaped_stage_name = stage_name.replace("\\", "\\\\").replace("\"", "\\\"")
+                lines.append(f"{metric_name}{{stage=\"{escaped_stage_name}\"}} {stages[stage_name][stage_key]}")
+        return "\n".join(lines) + "\n"
+
+
+_metrics_sink: Optional[AbstractMetricsSink] = None
+_is_need_trace_memory = False
+_is_tracemalloc_started_by_metrics = False
+_tracing_state = threading.local()
+
+
+def set_metrics_sink(sink: Optional[AbstractMetricsSink], trace_memory: bool = False) -> None:
+    global _metrics_sink, _is_need_trace_memory, _is_tracemalloc_started_by_metrics
+    logger.debug(f"Setting metrics sink {sink}, trace_memory: {trace_memory}")
+    trace_memory = trace_memory and sink is not None
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _is_tracemalloc_started_by_metrics = True
+    elif not trace_memory and _is_tracemalloc_started_by_metrics:
+        tracemalloc.stop()
+        _is_tracemalloc_started_by_metrics = False
+    _is_need_trace_memory = trace_memory
+    _metrics_sink = sink
+
+
+def get_metrics_sink() -> Optional[AbstractMetricsSink]:
+    return _metrics_sink
+
+
+def record_stage(stage_name: str,
+                 seconds: float,
+                 rows_in: Optional[int] = None,
+                 rows_out: Optional[int] = None,
+                 allocated_bytes: Optional[int] = None
+                 ) -> None:
+    sink = _metrics_sink
+    if sink is not None:
+        sink.record_stage(stage_name, seconds, rows_in, rows_out, allocated_bytes)
+
+
+def _count_rows(value: Any) -> Optional[int]:
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        return len(value)
+    if isinstance(value, tuple) and value:
+        return _count_rows(value[0])
+    if isinstance(value, dict) and value:
+        values = list(value.values())
+        if all(isinstance(item, pd.DataFrame) for item in values):
+            return sum(map(len, values))
+        # Decoded columns have a value per row
+        if all(isinstance(item, np.ndarray) for item in values):
+            return len(values[0])
+    return None
+
+
+def _count_input_rows(args: tuple, kwargs: Dict[str, Any]) -> Optional[int]:
+    for value in (*args, *kwargs.values()):
+        rows_count = _count_rows(value)
+        if rows_count is not None:
+            return rows_count
+    return None
+
+
+def _start_memory_tracing() -> Optional[List[int]]:
+    if not _is_need_trace_memory or not tracemalloc.is_tracing():
+        return None
+    frames = getattr(_tracing_state, "frames", None)
+    if frames is None:
+        frames = []
+        _tracing_state.frames = frames
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    # Peak of the enclosing stage is kept before the peak is reset for the nested one
+    if frames:
+        frames[-1][1] = max(frames[-1][1], peak_bytes)
+    tracemalloc.reset_peak()
+    frame = [current_bytes, current_bytes]
+    frames.append(frame)
+    return frame
+
+
+def _stop_memory_tracing(frame: Optional[List[int]]) -> Optional[int]:
+    if frame is None:
+        return None
+    frames = _tracing_state.frames
+    frames.pop()
+    if not tracemalloc.is_tracing():
+        return None
+    peak_bytes = max(frame[1], tracemalloc.get_traced_memory()[1])
+    if frames:
+        frames[-1][1] = max(frames[-1][1], peak_bytes)
+    return peak_bytes - frame[0]
+
+
+def instrumented_stage(stage_name: str) -> Callable[[Callable], Callable]:
+    def decorator(function: Callable) -> Callable:
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            sink = _metrics_sink
+            if sink is None:
+                return function(*args, **kwargs)
+
+            rows_in = _count_input_rows(args, kwargs)
+            memory_frame = _start_memory_tracing()
+            start_time = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            finally:
+                seconds = time.perf_counter() - start_time
+                allocated_bytes = _stop_memory_tracing(memory_frame)
+            sink.record_stage(stage_name, seconds, rows_in, _count_rows(result), allocated_bytes)
+            return result
+
+        return wrapper
+
+    return decorator
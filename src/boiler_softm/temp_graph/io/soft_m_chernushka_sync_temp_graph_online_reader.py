@@ -1,23 +1,39 @@
-import json
-from typing import BinaryIO
+from typing import BinaryIO, Optional
 
 import pandas as pd
 from boiler.temp_graph.io.abstract_sync_temp_graph_reader import AbstractSyncTempGraphReader
 
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder
 from boiler_softm.logging import logger
-from boiler_softm.constants import converting_parameters
+from boiler_softm.metrics import instrumented_stage
+from boiler_softm.temp_graph.temp_graph_lookup import SoftMTempGraphLookup
+from boiler_softm.constants import converting_parameters, processing
 
 
 class SoftMChernushkaSyncTempGraphOnlineReader(AbstractSyncTempGraphReader):
 
-    def __init__(self) -> None:
+    def __init__(self,
+                 json_backend: Optional[str] = None
+                 ) -> None:
         self._column_names_equal = converting_parameters.CHERNUSHKA_TEMP_GRAPH_COLUMN_NAMES_EQUALS
-        logger.debug("Creating instance")
+        # Response is parsed incrementally only with json_backend="ijson", other backends buffer it
+        self._json_decoder = SoftMJSONColumnsDecoder(records_path="data", backend=json_backend)
+        logger.debug(
+            f"Creating instance:"
+            f"json_decoder: {self._json_decoder}"
+        )
 
+    @instrumented_stage("chernushka_temp_graph_online_reader.read_temp_graph_from_binary_stream")
     def read_temp_graph_from_binary_stream(self, binary_stream: BinaryIO) -> pd.DataFrame:
         logger.debug("Reading temp graph")
-        temp_graph_server_response = json.load(binary_stream)
-        df = pd.DataFrame(temp_graph_server_response.get("data"))
+        df = self._json_decoder.decode_from_binary_stream(binary_stream)
         df = df.rename(columns=self._column_names_equal)
         logger.debug("Temp graph is read")
         return df
+
+    def read_temp_graph_lookup_from_binary_stream(self,
+                                                  binary_stream: BinaryIO,
+                                                  lookup_method: str = processing.TEMP_GRAPH_LOOKUP_NEAREST
+                                                  ) -> SoftMTempGraphLookup:
+        temp_graph_df = self.read_temp_graph_from_binary_stream(binary_stream)
+        return SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df, lookup_method)
@@ -0,0 +1,46 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional
+
+import pandas as pd
+from boiler.temp_graph.io.abstract_sync_temp_graph_reader import AbstractSyncTempGraphReader
+
+from boiler_softm.constants import api_constants
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.logging import logger
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_loader import SoftMLysvaSyncTempGraphOnlineLoader
+
+
+class SoftMLysvaAsyncTempGraphOnlineLoader:
+
+    def __init__(self,
+                 reader: AbstractSyncTempGraphReader,
+                 api_base: str = api_constants.LYSVA_API_BASE,
+                 http_proxy: Optional[str] = None,
+                 https_proxy: Optional[str] = None,
+                 transport: Optional[SoftMSyncHTTPTransport] = None,
+                 executor: Optional[Executor] = None
+                 ) -> None:
+        self._api_base = api_base
+        self._executor = executor
+        self._sync_loader = SoftMLysvaSyncTempGraphOnlineLoader(
+            reader=reader,
+            api_base=api_base,
+            http_proxy=http_proxy,
+            https_proxy=https_proxy,
+            transport=transport
+        )
+
+        logger.debug(
+            f"Creating instance: "
+            f"sync_loader: {self._sync_loader} "
+            f"executor: {self._executor} "
+        )
+
+    @property
+    def api_base(self) -> str:
+        return self._api_base
+
+    async def load_temp_graph(self) -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._sync_loader.load_temp_graph)
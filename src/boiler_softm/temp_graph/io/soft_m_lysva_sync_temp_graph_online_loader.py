@@ -1,12 +1,13 @@
 from typing import Optional
 
 import pandas as pd
-import requests
 from boiler.temp_graph.io.abstract_sync_temp_graph_loader import AbstractSyncTempGraphLoader
 from boiler.temp_graph.io.abstract_sync_temp_graph_reader import AbstractSyncTempGraphReader
 
 from boiler_softm.constants import api_constants
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport, get_default_transport
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
 
 
 class SoftMLysvaSyncTempGraphOnlineLoader(AbstractSyncTempGraphLoader):
@@ -15,10 +16,14 @@ class SoftMLysvaSyncTempGraphOnlineLoader(AbstractSyncTempGraphLoader):
                  reader: AbstractSyncTempGraphReader,
                  api_base: str = api_constants.LYSVA_API_BASE,
                  http_proxy: Optional[str] = None,
-                 https_proxy: Optional[str] = None
+                 https_proxy: Optional[str] = None,
+                 transport: Optional[SoftMSyncHTTPTransport] = None
                  ) -> None:
         self._temp_graph_reader = reader
         self._api_base = api_base
+        if transport is None:
+            transport = get_default_transport()
+        self._transport = transport
         self._proxies = {}
         if http_proxy is not None:
             self._proxies.update({"http": http_proxy})
@@ -30,15 +35,21 @@ class SoftMLysvaSyncTempGraphOnlineLoader(AbstractSyncTempGraphLoader):
             f"reader: {self._temp_graph_reader} "
             f"api_base: {self._api_base} "
             f"http_proxy: {http_proxy} "
+            f"transport: {self._transport} "
         )
 
+    @property
+    def api_base(self) -> str:
+        return self._api_base
+
+    @instrumented_stage("lysva_temp_graph_online_loader.load_temp_graph")
     def load_temp_graph(self) -> pd.DataFrame:
         logger.debug("Loading temp graph")
         url = f"{self._api_base}/JSON"
         params = {
             "method": "getTempGraphic"
         }
-        with requests.get(url=url, params=params, proxies=self._proxies, stream=True) as response:
+        with self._transport.get(url=url, params=params, proxies=self._proxies) as response:
             logger.debug(f"Temp graph is loaded from server. Status code is {response.status_code}")
             temp_graph_df = self._temp_graph_reader.read_temp_graph_from_binary_stream(response.raw)
         return temp_graph_df
@@ -1,10 +1,13 @@
-from typing import BinaryIO
+from typing import BinaryIO, Optional
 
 import pandas as pd
 from boiler.temp_graph.io.abstract_sync_temp_graph_reader import AbstractSyncTempGraphReader
 
 import boiler_softm.constants.converting_parameters
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+from boiler_softm.temp_graph.temp_graph_lookup import SoftMTempGraphLookup
 
 from boiler_softm.constants import processing
 
@@ -12,25 +15,37 @@ from boiler_softm.constants import processing
 class SoftMLysvaSyncTempGraphOnlineReader(AbstractSyncTempGraphReader):
 
     def __init__(self,
-                 encoding: str = "utf-8"
+                 encoding: str = "utf-8",
+                 json_backend: Optional[str] = None
                  ) -> None:
         self._encoding = encoding
+        # Response is parsed incrementally only with json_backend="ijson", other backends buffer it
+        self._json_decoder = SoftMJSONColumnsDecoder(backend=json_backend, encoding=encoding)
         self._column_names_equal = boiler_softm.constants.converting_parameters.LYSVA_TEMP_GRAPH_COLUMN_NAMES_EQUALS
 
         logger.debug(
             f"Creating instance:"
             f"encoding: {encoding}"
+            f"json_decoder: {self._json_decoder}"
         )
 
+    @instrumented_stage("lysva_temp_graph_online_reader.read_temp_graph_from_binary_stream")
     def read_temp_graph_from_binary_stream(self,
                                            binary_stream: BinaryIO
                                            ) -> pd.DataFrame:
         logger.debug("Reading temp graph")
-        df = pd.read_json(binary_stream, encoding=self._encoding)
+        df = self._json_decoder.decode_from_binary_stream(binary_stream)
         df = self._rename_columns(df)
         logger.debug("Temp graph is read")
         return df
 
+    def read_temp_graph_lookup_from_binary_stream(self,
+                                                  binary_stream: BinaryIO,
+                                                  lookup_method: str = processing.TEMP_GRAPH_LOOKUP_NEAREST
+                                                  ) -> SoftMTempGraphLookup:
+        temp_graph_df = self.read_temp_graph_from_binary_stream(binary_stream)
+        return SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df, lookup_method)
+
     def _rename_columns(self,
                         df: pd.DataFrame
                         ) -> pd.DataFrame:
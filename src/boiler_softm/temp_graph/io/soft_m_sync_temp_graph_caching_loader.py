@@ -0,0 +1,176 @@
+import datetime
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Callable, Optional, Union
+
+import pandas as pd
+from boiler.constants import column_names
+from boiler.temp_graph.io.abstract_sync_temp_graph_loader import AbstractSyncTempGraphLoader
+
+from boiler_softm.constants import processing
+from boiler_softm.logging import logger
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_loader import \
+    SoftMChernushkaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_loader import SoftMLysvaSyncTempGraphOnlineLoader
+
+
+_REQUIRED_TEMP_GRAPH_COLUMNS = (
+    column_names.WEATHER_TEMP,
+    column_names.FORWARD_PIPE_COOLANT_TEMP,
+    column_names.BACKWARD_PIPE_COOLANT_TEMP
+)
+
+
+def _validate_temp_graph(temp_graph_df: pd.DataFrame) -> None:
+    # Loaders do not check response status, so an error payload can be decoded to an empty frame
+    missing_columns = [
+        column_name for column_name in _REQUIRED_TEMP_GRAPH_COLUMNS if column_name not in temp_graph_df.columns
+    ]
+    if missing_columns:
+        raise ValueError(f"Loaded temp graph has no columns {missing_columns}")
+    if temp_graph_df.empty:
+        raise ValueError("Loaded temp graph is empty")
+
+
+def _hash_temp_graph(temp_graph_df: pd.DataFrame) -> str:
+    content_hash = hashlib.sha256(repr(list(temp_graph_df.columns)).encode("utf-8"))
+    content_hash.update(pd.util.hash_pandas_object(temp_graph_df, index=True).values.tobytes())
+    return content_hash.hexdigest()
+
+
+class SoftMSyncTempGraphCachingLoader(AbstractSyncTempGraphLoader):
+
+    def __init__(self,
+                 loader: Union[SoftMLysvaSyncTempGraphOnlineLoader, SoftMChernushkaSyncTempGraphOnlineLoader],
+                 cache_dir: Optional[str] = None,
+                 refresh_interval: datetime.timedelta = processing.TEMP_GRAPH_CACHE_REFRESH_INTERVAL,
+                 refresh_retry_interval: datetime.timedelta =
+                 processing.TEMP_GRAPH_CACHE_REFRESH_RETRY_INTERVAL,
+                 clock: Callable[[], float] = time.time
+                 ) -> None:
+        self._loader = loader
+        self._cache_dir = cache_dir
+        self._refresh_interval = refresh_interval.total_seconds()
+        self._refresh_retry_interval = refresh_retry_interval.total_seconds()
+        self._clock = clock
+
+        # Lysva API serves a single temp graph, so its loader has no boiler id
+        self._cache_key = f"{loader.api_base}|{getattr(loader, 'boiler_id', None)}"
+        self._cache_path = None
+        if self._cache_dir is not None:
+            os.makedirs(self._cache_dir, exist_ok=True)
+            cache_file_name = hashlib.sha256(self._cache_key.encode("utf-8")).hexdigest()
+            self._cache_path = os.path.join(self._cache_dir, f"{cache_file_name}.pickle")
+
+        self._lock = threading.Lock()
+        self._temp_graph_df: Optional[pd.DataFrame] = None
+        self._content_hash = None
+        self._loaded_at = None
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._refresh_failed_at = None
+
+        logger.debug(
+            f"Creating instance: "
+            f"loader: {self._loader} "
+            f"cache_dir: {self._cache_dir} "
+            f"refresh_interval: {refresh_interval} "
+            f"refresh_retry_interval: {refresh_retry_interval} "
+            f"cache_key: {self._cache_key} "
+        )
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        return self._content_hash
+
+    def load_temp_graph(self) -> pd.DataFrame:
+        logger.debug("Loading temp graph")
+        with self._lock:
+            if self._temp_graph_df is None:
+                self._load_cache_file()
+            temp_graph_df = self._temp_graph_df
+            now = self._clock()
+            is_expired = self._loaded_at is None or now - self._loaded_at >= self._refresh_interval
+            is_backing_off = (
+                self._refresh_failed_at is not None
+                and now - self._refresh_failed_at < self._refresh_retry_interval
+            )
+            if temp_graph_df is not None and is_expired and not is_backing_off and self._refresh_thread is None:
+                logger.debug("Temp graph is expired, refreshing it in background")
+                self._refresh_thread = threading.Thread(target=self._refresh_in_background, daemon=True)
+                self._refresh_thread.start()
+
+        if temp_graph_df is None:
+            temp_graph_df = self.refresh()
+        return temp_graph_df.copy()
+
+    def refresh(self) -> pd.DataFrame:
+        try:
+            temp_graph_df = self._loader.load_temp_graph()
+            _validate_temp_graph(temp_graph_df)
+        except Exception:
+            with self._lock:
+                self._refresh_failed_at = self._clock()
+            raise
+        content_hash = _hash_temp_graph(temp_graph_df)
+        with self._lock:
+            self._refresh_failed_at = None
+            if content_hash != self._content_hash:
+                logger.debug(f"Temp graph is changed, content hash is {content_hash}")
+                self._temp_graph_df = temp_graph_df
+                self._content_hash = content_hash
+            self._loaded_at = self._clock()
+            self._store_cache_file()
+            return self._temp_graph_df
+
+    def wait_for_refresh(self, timeout: Optional[float] = None) -> None:
+        refresh_thread = self._refresh_thread
+        if refresh_thread is not None:
+            refresh_thread.join(timeout)
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.debug(f"Temp graph is not refreshed, last loaded temp graph is used: {e}")
+        finally:
+            with self._lock:
+                self._refresh_thread = None
+
+    def _load_cache_file(self) -> None:
+        if self._cache_path is None or not os.path.isfile(self._cache_path):
+            return
+        logger.debug(f"Loading temp graph from {self._cache_path}")
+        try:
+            with open(self._cache_path, "rb") as f:
+                cache_entry = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError) as e:
+            logger.debug(f"Temp graph cache file is not loaded: {e}")
+            return
+        if cache_entry["cache_key"] != self._cache_key:
+            return
+        self._temp_graph_df = cache_entry["temp_graph_df"]
+        self._content_hash = cache_entry["content_hash"]
+        self._loaded_at = cache_entry["loaded_at"]
+
+    def _store_cache_file(self) -> None:
+        if self._cache_path is None:
+            return
+        cache_entry = {
+            "cache_key": self._cache_key,
+            "temp_graph_df": self._temp_graph_df,
+            "content_hash": self._content_hash,
+            "loaded_at": self._loaded_at
+        }
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self._cache_dir, prefix=".")
+        try:
+            with os.fdopen(file_descriptor, "wb") as f:
+                pickle.dump(cache_entry, f)
+            os.replace(temp_path, self._cache_path)
+        except OSError as e:
+            logger.debug(f"Temp graph cache file is not stored: {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,107 @@
+from typing import Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from boiler.constants import column_names
+
+from boiler_softm.constants import processing
+from boiler_softm.logging import logger
+
+
+class SoftMTempGraphLookup:
+
+    def __init__(self,
+                 weather_temps: np.ndarray,
+                 forward_temps: np.ndarray,
+                 backward_temps: np.ndarray,
+                 lookup_method: str = processing.TEMP_GRAPH_LOOKUP_NEAREST
+                 ) -> None:
+        if lookup_method not in (
+                processing.TEMP_GRAPH_LOOKUP_NEAREST,
+                processing.TEMP_GRAPH_LOOKUP_FLOOR,
+                processing.TEMP_GRAPH_LOOKUP_LINEAR
+        ):
+            raise ValueError(f"Unknown temp graph lookup method {lookup_method}")
+        weather_temps = np.asarray(weather_temps, dtype=np.float64)
+        if len(weather_temps) == 0:
+            raise ValueError("Temp graph is empty")
+        order = np.argsort(weather_temps, kind="stable")
+        weather_temps = weather_temps[order]
+        # Only the first point of each weather temp is kept
+        is_unique = np.concatenate(([True], weather_temps[1:] != weather_temps[:-1]))
+        self._weather_temps = weather_temps[is_unique]
+        self._forward_temps = np.asarray(forward_temps, dtype=np.float64)[order][is_unique]
+        self._backward_temps = np.asarray(backward_temps, dtype=np.float64)[order][is_unique]
+        self._lookup_method = lookup_method
+
+        logger.debug(
+            f"Creating instance:"
+            f"points_count: {len(self._weather_temps)}"
+            f"lookup_method: {self._lookup_method}"
+        )
+
+    @classmethod
+    def from_temp_graph_df(cls,
+                           temp_graph_df: pd.DataFrame,
+                           lookup_method: str = processing.TEMP_GRAPH_LOOKUP_NEAREST
+                           ) -> "SoftMTempGraphLookup":
+        return cls(
+            temp_graph_df[column_names.WEATHER_TEMP].to_numpy(dtype=np.float64),
+            temp_graph_df[column_names.FORWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64),
+            temp_graph_df[column_names.BACKWARD_PIPE_COOLANT_TEMP].to_numpy(dtype=np.float64),
+            lookup_method
+        )
+
+    def lookup(self,
+               weather_temps: Union[pd.Series, np.ndarray],
+               lookup_method: Optional[str] = None
+               ) -> pd.DataFrame:
+        forward_temps, backward_temps = self.lookup_arrays(np.asarray(weather_temps, dtype=np.float64), lookup_method)
+        index = weather_temps.index if isinstance(weather_temps, pd.Series) else None
+        return pd.DataFrame(
+            {
+                column_names.FORWARD_PIPE_COOLANT_TEMP: forward_temps,
+                column_names.BACKWARD_PIPE_COOLANT_TEMP: backward_temps
+            },
+            index=index
+        )
+
+    def lookup_arrays(self,
+                      weather_temps: np.ndarray,
+                      lookup_method: Optional[str] = None
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+        if lookup_method is None:
+            lookup_method = self._lookup_method
+        is_nan = np.isnan(weather_temps)
+
+        if lookup_method == processing.TEMP_GRAPH_LOOKUP_LINEAR:
+            forward_temps = np.interp(weather_temps, self._weather_temps, self._forward_temps)
+            backward_temps = np.interp(weather_temps, self._weather_temps, self._backward_temps)
+        else:
+            if lookup_method == processing.TEMP_GRAPH_LOOKUP_FLOOR:
+                positions = self._get_floor_positions(weather_temps)
+            elif lookup_method == processing.TEMP_GRAPH_LOOKUP_NEAREST:
+                positions = self._get_nearest_positions(weather_temps)
+            else:
+                raise ValueError(f"Unknown temp graph lookup method {lookup_method}")
+            forward_temps = self._forward_temps[positions]
+            backward_temps = self._backward_temps[positions]
+
+        forward_temps[is_nan] = np.nan
+        backward_temps[is_nan] = np.nan
+        return forward_temps, backward_temps
+
+    def _get_floor_positions(self, weather_temps: np.ndarray) -> np.ndarray:
+        # Weather temps below the graph are clamped to its first point
+        positions = np.searchsorted(self._weather_temps, weather_temps, side="right") - 1
+        return np.clip(positions, 0, len(self._weather_temps) - 1)
+
+    def _get_nearest_positions(self, weather_temps: np.ndarray) -> np.ndarray:
+        last_position = len(self._weather_temps) - 1
+        right_positions = np.clip(np.searchsorted(self._weather_temps, weather_temps, side="left"), 0, last_position)
+        left_positions = np.clip(right_positions - 1, 0, last_position)
+        with np.errstate(invalid="ignore"):
+            left_distances = np.abs(weather_temps - self._weather_temps[left_positions])
+            right_distances = np.abs(self._weather_temps[right_positions] - weather_temps)
+        # Ties are resolved to the colder point, which requires higher coolant temps
+        return np.where(left_distances <= right_distances, left_positions, right_positions)
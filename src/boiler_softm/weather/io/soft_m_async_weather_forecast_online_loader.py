@@ -0,0 +1,59 @@
+import asyncio
+from concurrent.futures import Executor
+from typing import Optional
+
+import pandas as pd
+from boiler.data_processing.beetween_filter_algorithm \
+    import AbstractTimestampFilterAlgorithm, LeftClosedTimestampFilterAlgorithm
+from boiler.weather.io.abstract_sync_weather_reader import AbstractSyncWeatherReader
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.logging import logger
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+
+
+class SoftMAsyncWeatherForecastOnlineLoader:
+
+    def __init__(self,
+                 reader: AbstractSyncWeatherReader,
+                 timestamp_filter_algorithm: AbstractTimestampFilterAlgorithm =
+                 LeftClosedTimestampFilterAlgorithm(),
+                 server_address: str = "https://lysva.agt.town",
+                 http_proxy: Optional[str] = None,
+                 https_proxy: Optional[str] = None,
+                 transport: Optional[SoftMSyncHTTPTransport] = None,
+                 executor: Optional[Executor] = None
+                 ) -> None:
+        self._server_address = server_address
+        self._executor = executor
+        # Requests and parsing are run in the executor, so the event loop is not blocked
+        self._sync_loader = SoftMSyncWeatherForecastOnlineLoader(
+            reader=reader,
+            timestamp_filter_algorithm=timestamp_filter_algorithm,
+            server_address=server_address,
+            http_proxy=http_proxy,
+            https_proxy=https_proxy,
+            transport=transport
+        )
+
+        logger.debug(
+            f"Creating instance: "
+            f"sync_loader: {self._sync_loader} "
+            f"executor: {self._executor} "
+        )
+
+    @property
+    def server_address(self) -> str:
+        return self._server_address
+
+    async def load_weather(self,
+                           start_datetime: Optional[pd.Timestamp] = None,
+                           end_datetime: Optional[pd.Timestamp] = None
+                           ) -> pd.DataFrame:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            self._sync_loader.load_weather,
+            start_datetime,
+            end_datetime
+        )
@@ -0,0 +1,125 @@
+import datetime
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Optional
+
+import pandas as pd
+from boiler.data_processing.beetween_filter_algorithm \
+    import AbstractTimestampFilterAlgorithm, LeftClosedTimestampFilterAlgorithm
+from boiler.weather.io.abstract_sync_weather_loader import AbstractSyncWeatherLoader
+
+from boiler_softm.constants import processing
+from boiler_softm.logging import logger
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+
+
+class SoftMSyncWeatherForecastCachingLoader(AbstractSyncWeatherLoader):
+
+    def __init__(self,
+                 loader: SoftMSyncWeatherForecastOnlineLoader,
+                 timestamp_filter_algorithm: AbstractTimestampFilterAlgorithm =
+                 LeftClosedTimestampFilterAlgorithm(),
+                 ttl: datetime.timedelta = processing.WEATHER_FORECAST_CACHE_TTL,
+                 stale_ttl: datetime.timedelta = processing.WEATHER_FORECAST_CACHE_STALE_TTL,
+                 refresh_retry_interval: datetime.timedelta =
+                 processing.WEATHER_FORECAST_CACHE_REFRESH_RETRY_INTERVAL,
+                 clock: Callable[[], float] = time.monotonic
+                 ) -> None:
+        self._loader = loader
+        self._timestamp_filter_algorithm = timestamp_filter_algorithm
+        self._ttl = ttl.total_seconds()
+        self._stale_ttl = stale_ttl.total_seconds()
+        self._refresh_retry_interval = refresh_retry_interval.total_seconds()
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._weather_df: Optional[pd.DataFrame] = None
+        self._validators = None
+        self._loaded_at = None
+        self._refresh_future: Optional[Future] = None
+        self._refresh_failed_at = None
+
+        logger.debug(
+            f"Creating instance: "
+            f"loader: {self._loader} "
+            f"timestamp_filter_algorithm: {self._timestamp_filter_algorithm} "
+            f"ttl: {ttl} "
+            f"stale_ttl: {stale_ttl} "
+            f"refresh_retry_interval: {refresh_retry_interval} "
+        )
+
+    def load_weather(self,
+                     start_datetime: Optional[pd.Timestamp] = None,
+                     end_datetime: Optional[pd.Timestamp] = None
+                     ) -> pd.DataFrame:
+        logger.debug(f"Requested weather forecast from {start_datetime} to {end_datetime}")
+        weather_df = self._get_weather_df()
+        filtered_weather_df = self._timestamp_filter_algorithm.filter_df_by_min_max_timestamp(
+            weather_df,
+            start_datetime,
+            end_datetime
+        )
+        if filtered_weather_df is weather_df:
+            filtered_weather_df = weather_df.copy()
+        logger.debug(f"Gathered {len(filtered_weather_df)} weather forecast items")
+        return filtered_weather_df
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._loaded_at = None
+
+    def _get_weather_df(self) -> pd.DataFrame:
+        with self._lock:
+            now = self._clock()
+            age = None
+            if self._loaded_at is not None:
+                age = now - self._loaded_at
+            if age is not None and age < self._ttl:
+                logger.debug("Weather forecast is loaded from cache")
+                return self._weather_df
+
+            is_stale = self._weather_df is not None and age is not None and age < self._ttl + self._stale_ttl
+            is_backing_off = (
+                self._refresh_failed_at is not None
+                and now - self._refresh_failed_at < self._refresh_retry_interval
+            )
+            if is_stale and is_backing_off:
+                logger.debug("Weather forecast refresh failed recently, serving stale one without refreshing")
+                return self._weather_df
+
+            is_leader = self._refresh_future is None
+            if is_leader:
+                self._refresh_future = Future()
+            refresh_future = self._refresh_future
+
+            if is_stale:
+                logger.debug("Weather forecast is stale, serving it while refreshing")
+                if is_leader:
+                    threading.Thread(target=self._refresh, args=(refresh_future,), daemon=True).start()
+                return self._weather_df
+
+        if is_leader:
+            self._refresh(refresh_future)
+        return refresh_future.result()
+
+    def _refresh(self, refresh_future: Future) -> None:
+        try:
+            weather_df, validators = self._loader.load_weather_if_modified(self._validators)
+        except Exception as e:
+            logger.debug(f"Weather forecast is not refreshed: {e}")
+            with self._lock:
+                self._refresh_future = None
+                self._refresh_failed_at = self._clock()
+            refresh_future.set_exception(e)
+            return
+
+        with self._lock:
+            if weather_df is not None:
+                self._weather_df = weather_df
+            self._validators = validators
+            self._loaded_at = self._clock()
+            self._refresh_future = None
+            self._refresh_failed_at = None
+            weather_df = self._weather_df
+        refresh_future.set_result(weather_df)
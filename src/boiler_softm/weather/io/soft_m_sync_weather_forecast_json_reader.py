@@ -1,13 +1,15 @@
-import io
 from datetime import tzinfo
-from typing import BinaryIO
+from typing import BinaryIO, Dict, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
 from boiler.constants import column_names
 from boiler.weather.io.abstract_sync_weather_reader import AbstractSyncWeatherReader
 
 import boiler_softm.constants.converting_parameters
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
 
 import boiler_softm.constants.column_names as soft_m_column_names
 import boiler_softm.constants.processing
@@ -17,10 +19,19 @@ class SoftMSyncWeatherForecastJSONReader(AbstractSyncWeatherReader):
 
     def __init__(self,
                  encoding: str = "utf-8",
-                 weather_data_timezone: tzinfo = None
+                 weather_data_timezone: tzinfo = None,
+                 json_backend: Optional[str] = None,
+                 ambiguous_timestamp_policy: Union[str, bool] =
+                 boiler_softm.constants.processing.WEATHER_AMBIGUOUS_TIMESTAMP_POLICY,
+                 nonexistent_timestamp_policy: str =
+                 boiler_softm.constants.processing.WEATHER_NONEXISTENT_TIMESTAMP_POLICY
                  ) -> None:
         self._weather_data_timezone = weather_data_timezone
+        self._ambiguous_timestamp_policy = ambiguous_timestamp_policy
+        self._nonexistent_timestamp_policy = nonexistent_timestamp_policy
         self._encoding = encoding
+        # Response is parsed incrementally only with json_backend="ijson", other backends buffer it
+        self._json_decoder = SoftMJSONColumnsDecoder(backend=json_backend, encoding=encoding)
 
         self._column_names_equals = boiler_softm.constants.converting_parameters.LYSVA_WEATHER_INFO_COLUMN_EQUALS
 
@@ -28,30 +39,106 @@ class SoftMSyncWeatherForecastJSONReader(AbstractSyncWeatherReader):
             f"Creating instance:"
             f"weather_data_timezone: {self._weather_data_timezone}"
             f"encoding: {self._encoding}"
+            f"json_decoder: {self._json_decoder}"
+            f"ambiguous_timestamp_policy: {self._ambiguous_timestamp_policy}"
+            f"nonexistent_timestamp_policy: {self._nonexistent_timestamp_policy}"
         )
 
-    def read_weather_from_binary_stream(self, binary_stream: BinaryIO) -> pd.DataFrame:
+    @instrumented_stage("weather_forecast_json_reader.read_weather_from_binary_stream")
+    def read_weather_from_binary_stream(self,
+                                        binary_stream: BinaryIO,
+                                        start_datetime: Optional[pd.Timestamp] = None,
+                                        end_datetime: Optional[pd.Timestamp] = None
+                                        ) -> pd.DataFrame:
         logger.debug("Parsing weather")
-        with io.TextIOWrapper(binary_stream, encoding=self._encoding) as text_stream:
-            df = pd.read_json(text_stream, convert_dates=False)
+        columns = self._json_decoder.decode_columns_from_binary_stream(binary_stream)
+        index = None
+        if start_datetime is not None or end_datetime is not None:
+            columns, index = self._exclude_dates_out_of_window(columns, start_datetime, end_datetime)
+        df = pd.DataFrame(columns, index=index)
         self._rename_columns(df)
         self._convert_date_and_time_to_timestamp(df)
         logger.debug("Weather is parsed")
         return df
 
+    @instrumented_stage("weather_forecast_json_reader.exclude_dates_out_of_window")
+    def _exclude_dates_out_of_window(self,
+                                     columns: Dict[str, np.ndarray],
+                                     start_datetime: Optional[pd.Timestamp],
+                                     end_datetime: Optional[pd.Timestamp]
+                                     ) -> Tuple[Dict[str, np.ndarray], Optional[np.ndarray]]:
+        logger.debug(f"Excluding dates out of {start_datetime}, {end_datetime}")
+        dates_as_str = columns.get(soft_m_column_names.LYSVA_WEATHER_DATE)
+        if dates_as_str is None:
+            return columns, None
+        date_codes, unique_dates = pd.factorize(dates_as_str)
+        parsed_dates = pd.to_datetime(unique_dates).normalize()
+
+        # Only whole dates are excluded here with a day of margin, exact filtering is left to the loader
+        is_date_in_window = np.ones(len(parsed_dates), dtype=np.bool_)
+        if start_datetime is not None:
+            is_date_in_window &= parsed_dates >= self._to_local_date(start_datetime) - pd.Timedelta(days=1)
+        if end_datetime is not None:
+            is_date_in_window &= parsed_dates <= self._to_local_date(end_datetime) + pd.Timedelta(days=1)
+        is_row_in_window = (date_codes < 0) | is_date_in_window[date_codes]
+        # Rows keep their positions in the response as index like after filtering of the whole forecast
+        index = np.flatnonzero(is_row_in_window)
+        return {column_name: values[is_row_in_window] for column_name, values in columns.items()}, index
+
+    def _to_local_date(self, timestamp: pd.Timestamp) -> pd.Timestamp:
+        if timestamp.tzinfo is not None:
+            if self._weather_data_timezone is not None:
+                timestamp = timestamp.tz_convert(self._weather_data_timezone)
+            timestamp = timestamp.tz_localize(None)
+        return timestamp.normalize()
+
     def _rename_columns(self, df: pd.DataFrame) -> None:
         logger.debug("Renaming columns")
         df.rename(columns=self._column_names_equals, inplace=True)
 
+    @instrumented_stage("weather_forecast_json_reader.convert_date_and_time_to_timestamp")
     def _convert_date_and_time_to_timestamp(self, df: pd.DataFrame) -> None:
         logger.debug("Converting dates and time to timestamp")
 
-        dates_as_str = df[soft_m_column_names.LYSVA_WEATHER_DATE]
-        time_as_str = df[soft_m_column_names.LYSVA_WEATHER_TIME]
-        datetime_as_str = dates_as_str.str.cat(time_as_str, sep=" ")
-        timestamp = pd.to_datetime(datetime_as_str)
-        timestamp = timestamp.dt.tz_localize(self._weather_data_timezone)
+        # Forecasts repeat a few dates and times, so each unique string is parsed once
+        date_codes, unique_dates = pd.factorize(df[soft_m_column_names.LYSVA_WEATHER_DATE])
+        time_codes, unique_time = pd.factorize(df[soft_m_column_names.LYSVA_WEATHER_TIME])
+        parsed_dates = pd.to_datetime(unique_dates).normalize().values
+        parsed_time = pd.to_datetime(unique_time)
+        parsed_time = (parsed_time - parsed_time.normalize()).values
 
-        df[column_names.TIMESTAMP] = timestamp
+        timestamp = parsed_dates[date_codes] + parsed_time[time_codes]
+        timestamp[(date_codes < 0) | (time_codes < 0)] = np.datetime64("NaT")
+        timestamp = self._localize_timestamp(timestamp, date_codes, parsed_dates)
+
+        df[column_names.TIMESTAMP] = pd.Series(timestamp, index=df.index)
         del df[soft_m_column_names.LYSVA_WEATHER_TIME]
         del df[soft_m_column_names.LYSVA_WEATHER_DATE]
+
+    def _localize_timestamp(self,
+                            timestamp: np.ndarray,
+                            date_codes: np.ndarray,
+                            parsed_dates: np.ndarray
+                            ) -> pd.DatetimeIndex:
+        if self._weather_data_timezone is None:
+            return pd.DatetimeIndex(timestamp)
+
+        # UTC offset is taken once per date, dates with offset changes are localized row by row
+        day_starts = pd.DatetimeIndex(parsed_dates)
+        start_offsets = self._get_utc_offsets(day_starts)
+        end_offsets = self._get_utc_offsets(day_starts + pd.Timedelta(days=1))
+        is_regular_date = start_offsets == end_offsets
+        is_regular_row = (date_codes >= 0) & is_regular_date[date_codes]
+
+        utc_timestamp = timestamp - start_offsets[date_codes]
+        irregular_timestamp = pd.DatetimeIndex(timestamp[~is_regular_row]).tz_localize(
+            self._weather_data_timezone,
+            ambiguous=self._ambiguous_timestamp_policy,
+            nonexistent=self._nonexistent_timestamp_policy
+        )
+        utc_timestamp[~is_regular_row] = irregular_timestamp.tz_convert(None).values
+        return pd.DatetimeIndex(utc_timestamp).tz_localize("UTC").tz_convert(self._weather_data_timezone)
+
+    def _get_utc_offsets(self, timestamp: pd.DatetimeIndex) -> np.ndarray:
+        localized_timestamp = timestamp.tz_localize(self._weather_data_timezone, ambiguous="NaT", nonexistent="NaT")
+        return timestamp.values - localized_timestamp.tz_convert(None).values
@@ -1,13 +1,15 @@
-from typing import Optional
+from typing import Dict, Optional, Tuple
 
 import pandas as pd
-import requests
 from boiler.data_processing.beetween_filter_algorithm \
     import AbstractTimestampFilterAlgorithm, LeftClosedTimestampFilterAlgorithm
 from boiler.weather.io.abstract_sync_weather_loader import AbstractSyncWeatherLoader
 from boiler.weather.io.abstract_sync_weather_reader import AbstractSyncWeatherReader
 
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport, get_default_transport
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
 
 
 class SoftMSyncWeatherForecastOnlineLoader(AbstractSyncWeatherLoader):
@@ -18,11 +20,15 @@ class SoftMSyncWeatherForecastOnlineLoader(AbstractSyncWeatherLoader):
                  LeftClosedTimestampFilterAlgorithm(),
                  server_address: str = "https://lysva.agt.town",
                  http_proxy: Optional[str] = None,
-                 https_proxy: Optional[str] = None
+                 https_proxy: Optional[str] = None,
+                 transport: Optional[SoftMSyncHTTPTransport] = None
                  ) -> None:
         self._weather_reader = reader
         self._weather_data_server_address = server_address
         self._timestamp_filter_algorithm = timestamp_filter_algorithm
+        if transport is None:
+            transport = get_default_transport()
+        self._transport = transport
         self._proxies = {}
         if http_proxy is not None:
             self._proxies.update({"http": http_proxy})
@@ -34,21 +40,16 @@ class SoftMSyncWeatherForecastOnlineLoader(AbstractSyncWeatherLoader):
             f"server_address: {self._weather_data_server_address} "
             f"timestamp_filter_algorithm: {self._timestamp_filter_algorithm} "
             f"http_proxy: {http_proxy} "
+            f"transport: {self._transport} "
         )
 
+    @instrumented_stage("weather_forecast_online_loader.load_weather")
     def load_weather(self,
                      start_datetime: Optional[pd.Timestamp] = None,
                      end_datetime: Optional[pd.Timestamp] = None
                      ) -> pd.DataFrame:
         logger.debug(f"Requested weather forecast from {start_datetime} to {end_datetime}")
-        url = f"{self._weather_data_server_address}/JSON"
-        # noinspection SpellCheckingInspection
-        params = {
-            "method": "getPrognozT"
-        }
-        with requests.get(url=url, params=params, proxies=self._proxies, stream=True) as response:
-            logger.debug(f"Weather forecast is loaded. Status code is {response.status_code}")
-            weather_df = self._weather_reader.read_weather_from_binary_stream(response.raw)
+        weather_df, _ = self._load_weather(None, start_datetime, end_datetime)
         weather_df = self._timestamp_filter_algorithm.filter_df_by_min_max_timestamp(
             weather_df,
             start_datetime,
@@ -56,3 +57,46 @@ class SoftMSyncWeatherForecastOnlineLoader(AbstractSyncWeatherLoader):
         )
         logger.debug(f"Gathered {len(weather_df)} weather forecast items")
         return weather_df
+
+    @instrumented_stage("weather_forecast_online_loader.load_weather_if_modified")
+    def load_weather_if_modified(self,
+                                 validators: Optional[Dict[str, str]] = None
+                                 ) -> Tuple[Optional[pd.DataFrame], Dict[str, str]]:
+        return self._load_weather(validators, None, None)
+
+    def _load_weather(self,
+                      validators: Optional[Dict[str, str]],
+                      start_datetime: Optional[pd.Timestamp],
+                      end_datetime: Optional[pd.Timestamp]
+                      ) -> Tuple[Optional[pd.DataFrame], Dict[str, str]]:
+        url = f"{self._weather_data_server_address}/JSON"
+        # noinspection SpellCheckingInspection
+        params = {
+            "method": "getPrognozT"
+        }
+        headers = {}
+        if validators is not None:
+            if "ETag" in validators:
+                headers["If-None-Match"] = validators["ETag"]
+            if "Last-Modified" in validators:
+                headers["If-Modified-Since"] = validators["Last-Modified"]
+        with self._transport.get(url=url, params=params, proxies=self._proxies, headers=headers) as response:
+            logger.debug(f"Weather forecast is loaded. Status code is {response.status_code}")
+            new_validators = {
+                header_name: response.headers[header_name]
+                for header_name in ("ETag", "Last-Modified")
+                if header_name in response.headers
+            }
+            if response.status_code == 304:
+                logger.debug("Weather forecast is not modified")
+                return None, new_validators or validators
+            if isinstance(self._weather_reader, SoftMSyncWeatherForecastJSONReader):
+                # Reader drops rows that are surely out of the window before building timestamps
+                weather_df = self._weather_reader.read_weather_from_binary_stream(
+                    response.raw,
+                    start_datetime,
+                    end_datetime
+                )
+            else:
+                weather_df = self._weather_reader.read_weather_from_binary_stream(response.raw)
+        return weather_df, new_validators
@@ -1,5 +1,8 @@
-from typing import Union
+import datetime
+import hashlib
+from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 from boiler.constants import column_names
 from boiler.data_processing.beetween_filter_algorithm import AbstractTimestampFilterAlgorithm
@@ -7,7 +10,13 @@ from boiler.data_processing.timestamp_interpolator_algorithm import AbstractTime
 from boiler.data_processing.timestamp_round_algorithm import AbstractTimestampRoundAlgorithm
 from boiler.data_processing.value_interpolation_algorithm import AbstractValueInterpolationAlgorithm
 from boiler.weather.processing import AbstractWeatherProcessor
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.cache_keys import describe_config, fingerprint_df
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
+from boiler_softm.data_processing.regular_grid_frame import SoftMRegularGridFrame
 from boiler_softm.logging import logger
+from boiler_softm.metrics import instrumented_stage
+from boiler_softm.weather.processing_cache import SoftMWeatherProcessingCache, SoftMWeatherProcessingCacheEntry
 
 
 class SoftMWeatherProcessor(AbstractWeatherProcessor):
@@ -17,7 +26,10 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
                  timestamp_interpolation_algorithm: AbstractTimestampInterpolationAlgorithm,
                  timestamp_filter_algorithm: AbstractTimestampFilterAlgorithm,
                  border_values_interpolation_algorithm: AbstractValueInterpolationAlgorithm,
-                 internal_values_interpolation_algorithm: AbstractValueInterpolationAlgorithm
+                 internal_values_interpolation_algorithm: AbstractValueInterpolationAlgorithm,
+                 copy_input_df: bool = True,
+                 grid_resampler: Optional[SoftMGridResampler] = None,
+                 processing_cache: Optional[SoftMWeatherProcessingCache] = None
                  ) -> None:
 
         self._columns_to_interpolate = [column_names.WEATHER_TEMP]
@@ -26,6 +38,21 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
         self._timestamp_filter_algorithm = timestamp_filter_algorithm
         self._border_values_interpolation_algorithm = border_values_interpolation_algorithm
         self._internal_values_interpolation_algorithm = internal_values_interpolation_algorithm
+        self._copy_input_df = copy_input_df
+        # Fused replacement of rounding, deduplication, timestamp and value interpolation,
+        # it gives the same result only for TimestampInterpolationAlgorithm with linear value interpolation
+        self._grid_resampler = grid_resampler
+        self._processing_cache = processing_cache
+        # The cache can be shared by processors, so entries are keyed by everything that changes the output
+        self._config_hash = hashlib.sha256(describe_config([
+            self._columns_to_interpolate,
+            self._timestamp_round_algorithm,
+            self._timestamp_interpolation_algorithm,
+            self._timestamp_filter_algorithm,
+            self._border_values_interpolation_algorithm,
+            self._internal_values_interpolation_algorithm,
+            self._grid_resampler
+        ]).encode("utf-8")).hexdigest()
 
         logger.debug(
             f"Creating instance:"
@@ -35,8 +62,12 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
             f"timestamp_filter_algorithm: {self._timestamp_filter_algorithm}"
             f"border_values_interpolation_algorithm: {self._border_values_interpolation_algorithm}"
             f"internal_values_interpolation_algorithm: {self._internal_values_interpolation_algorithm}"
+            f"copy_input_df: {self._copy_input_df}"
+            f"grid_resampler: {self._grid_resampler}"
+            f"processing_cache: {self._processing_cache}"
         )
 
+    @instrumented_stage("weather_processor.process_weather_df")
     def process_weather_df(self,
                            weather_df: pd.DataFrame,
                            min_required_timestamp: Union[pd.Timestamp, None],
@@ -44,36 +75,118 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
                            ) -> pd.DataFrame:
         logger.debug(f"Processing weather df {min_required_timestamp}, {max_required_timestamp}")
 
-        weather_df = weather_df.copy()
+        if self._processing_cache is not None and not weather_df.empty:
+            return self._process_weather_df_with_cache(weather_df, min_required_timestamp, max_required_timestamp)
+        weather_df = self._process_weather_df_to_grid(weather_df, min_required_timestamp, max_required_timestamp)
+        weather_df = self._filter_by_timestamp(max_required_timestamp, min_required_timestamp, weather_df)
+        return weather_df
+
+    def process_weather_df_to_regular_grid(self,
+                                           weather_df: pd.DataFrame,
+                                           min_required_timestamp: Union[pd.Timestamp, None],
+                                           max_required_timestamp: Union[pd.Timestamp, None],
+                                           time_tick: datetime.timedelta = TIME_TICK,
+                                           dtype: Union[type, np.dtype] = np.float64
+                                           ) -> SoftMRegularGridFrame:
+        weather_df = self.process_weather_df(weather_df, min_required_timestamp, max_required_timestamp)
+        weather_df = weather_df[[column_names.TIMESTAMP] + self._columns_to_interpolate]
+        start = None
+        if min_required_timestamp is not None:
+            # Window without rows gives empty frame at the window start like the batch processing
+            start = self._timestamp_round_algorithm.round_value(min_required_timestamp)
+        return SoftMRegularGridFrame.from_df(weather_df, time_tick, dtype, start)
+
+    def _process_weather_df_to_grid(self,
+                                    weather_df: pd.DataFrame,
+                                    min_required_timestamp: Union[pd.Timestamp, None],
+                                    max_required_timestamp: Union[pd.Timestamp, None]
+                                    ) -> pd.DataFrame:
+        if self._grid_resampler is not None and not weather_df.empty:
+            return self._grid_resampler.resample_df(
+                weather_df,
+                self._columns_to_interpolate,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+
+        if self._copy_input_df:
+            weather_df = weather_df.copy()
         weather_df = self._round_timestamp(weather_df)
         weather_df = self._drop_duplicates_by_timestamp(weather_df)
         weather_df = self._interpolate_timestamp(max_required_timestamp, min_required_timestamp, weather_df)
         weather_df = self._interpolate_values(weather_df)
+        return weather_df
+
+    def _process_weather_df_with_cache(self,
+                                       weather_df: pd.DataFrame,
+                                       min_required_timestamp: Union[pd.Timestamp, None],
+                                       max_required_timestamp: Union[pd.Timestamp, None]
+                                       ) -> pd.DataFrame:
+        # Values of grid points do not depend on the window, so the grid of the widest window seen
+        # is kept and narrower windows are cut from it. The grid is extended when a window is not covered.
+        cache_key = (fingerprint_df(weather_df), self._config_hash)
+        entry = self._processing_cache.get_entry(cache_key)
+        if entry is None:
+            timestamps = weather_df[column_names.TIMESTAMP]
+            data_start = self._timestamp_round_algorithm.round_value(timestamps.min())
+            data_end = self._timestamp_round_algorithm.round_value(timestamps.max())
+        else:
+            data_start = entry.data_start
+            data_end = entry.data_end
+
+        required_grid_start = data_start
+        if min_required_timestamp is not None:
+            required_grid_start = min(data_start, self._timestamp_round_algorithm.round_value(min_required_timestamp))
+        required_grid_end = data_end
+        if max_required_timestamp is not None:
+            required_grid_end = max(data_end, self._timestamp_round_algorithm.round_value(max_required_timestamp))
+
+        is_hit = entry is not None and entry.grid_start <= required_grid_start and required_grid_end <= entry.grid_end
+        self._processing_cache.record_lookup(is_hit)
+        if not is_hit:
+            grid_start = required_grid_start
+            grid_end = required_grid_end
+            if entry is not None:
+                grid_start = min(grid_start, entry.grid_start)
+                grid_end = max(grid_end, entry.grid_end)
+            logger.debug(f"Processing weather df grid {grid_start}, {grid_end} for cache")
+            grid_df = self._process_weather_df_to_grid(weather_df, grid_start, grid_end)
+            entry = SoftMWeatherProcessingCacheEntry(grid_df.reset_index(drop=True), data_start, data_end)
+            self._processing_cache.put_entry(cache_key, entry)
+
+        grid_timestamps = entry.grid_df[column_names.TIMESTAMP]
+        start_position = grid_timestamps.searchsorted(required_grid_start)
+        stop_position = grid_timestamps.searchsorted(required_grid_end, side="right")
+        weather_df = entry.grid_df.iloc[start_position:stop_position]
         weather_df = self._filter_by_timestamp(max_required_timestamp, min_required_timestamp, weather_df)
+        # Index is the position in the grid of the requested window like after a fresh computation
+        weather_df = weather_df.copy()
+        weather_df.index = weather_df.index - start_position
         return weather_df
 
+    @instrumented_stage("weather_processor.round_timestamp")
     def _round_timestamp(self,
                          weather_df: pd.DataFrame
                          ) -> pd.DataFrame:
-        weather_df = weather_df.copy()
         weather_df[column_names.TIMESTAMP] = self._timestamp_round_algorithm.round_series(
             weather_df[column_names.TIMESTAMP]
         )
         return weather_df
 
     # noinspection PyMethodMayBeStatic
+    @instrumented_stage("weather_processor.drop_duplicates_by_timestamp")
     def _drop_duplicates_by_timestamp(self,
                                       weather_df: pd.DataFrame
                                       ) -> pd.DataFrame:
         weather_df = weather_df.drop_duplicates(column_names.TIMESTAMP, keep="last")
         return weather_df
 
+    @instrumented_stage("weather_processor.interpolate_timestamp")
     def _interpolate_timestamp(self,
                                max_required_timestamp: Union[pd.Timestamp, None],
                                min_required_timestamp: Union[pd.Timestamp, None],
                                weather_df: pd.DataFrame
                                ) -> pd.DataFrame:
-        weather_df = weather_df.copy()
         weather_df = self._timestamp_interpolation_algorithm.process_df(
             weather_df,
             min_required_timestamp,
@@ -81,10 +194,10 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
         )
         return weather_df
 
+    @instrumented_stage("weather_processor.interpolate_values")
     def _interpolate_values(self,
                             weather_df: pd.DataFrame
                             ) -> pd.DataFrame:
-        weather_df = weather_df.copy()
         for column_name in self._columns_to_interpolate:
             weather_df[column_name] = self._border_values_interpolation_algorithm.interpolate_series(
                 weather_df[column_name]
@@ -94,6 +207,7 @@ class SoftMWeatherProcessor(AbstractWeatherProcessor):
             )
         return weather_df
 
+    @instrumented_stage("weather_processor.filter_by_timestamp")
     def _filter_by_timestamp(self,
                              max_required_timestamp: Union[pd.Timestamp, None],
                              min_required_timestamp: Union[pd.Timestamp, None],
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+import pandas as pd
+from boiler.constants import column_names
+
+from boiler_softm.constants import processing
+from boiler_softm.logging import logger
+
+
+class SoftMWeatherProcessingCacheEntry:
+
+    def __init__(self,
+                 grid_df: pd.DataFrame,
+                 data_start: pd.Timestamp,
+                 data_end: pd.Timestamp
+                 ) -> None:
+        # grid_df is the processed grid before filtering, its index is the position in the grid
+        self._grid_df = grid_df
+        self._data_start = data_start
+        self._data_end = data_end
+
+    @property
+    def grid_df(self) -> pd.DataFrame:
+        return self._grid_df
+
+    @property
+    def grid_start(self) -> pd.Timestamp:
+        return self._grid_df[column_names.TIMESTAMP].iloc[0]
+
+    @property
+    def grid_end(self) -> pd.Timestamp:
+        return self._grid_df[column_names.TIMESTAMP].iloc[-1]
+
+    @property
+    def data_start(self) -> pd.Timestamp:
+        return self._data_start
+
+    @property
+    def data_end(self) -> pd.Timestamp:
+        return self._data_end
+
+
+class SoftMWeatherProcessingCache:
+
+    def __init__(self,
+                 max_entries_count: int = processing.WEATHER_PROCESSING_CACHE_MAX_ENTRIES_COUNT
+                 ) -> None:
+        if max_entries_count < 1:
+            raise ValueError(f"Max entries count must be positive, got {max_entries_count}")
+        self._max_entries_count = max_entries_count
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, SoftMWeatherProcessingCacheEntry]" = OrderedDict()
+        self._hits_count = 0
+        self._misses_count = 0
+
+        logger.debug(
+            f"Creating instance:"
+            f"max_entries_count: {self._max_entries_count}"
+        )
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def max_entries_count(self) -> int:
+        return self._max_entries_count
+
+    @property
+    def hits_count(self) -> int:
+        with self._lock:
+            return self._hits_count
+
+    @property
+    def misses_count(self) -> int:
+        with self._lock:
+            return self._misses_count
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def get_entry(self, key: Hashable) -> Optional[SoftMWeatherProcessingCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put_entry(self, key: Hashable, entry: SoftMWeatherProcessingCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries_count:
+                evicted_key, _ = self._entries.popitem(last=False)
+                logger.debug(f"Evicting weather processing cache entry {evicted_key}")
+
+    def record_lookup(self, is_hit: bool) -> None:
+        with self._lock:
+            if is_hit:
+                self._hits_count += 1
+            else:
+                self._misses_count += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits_count = 0
+            self._misses_count = 0
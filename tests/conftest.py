@@ -2,6 +2,9 @@ import os
 
 import pytest
 
+from boiler_softm.constants import api_constants
+from soft_m_api_stand_in_server import SoftMAPIStandInServer
+
 
 @pytest.fixture(scope="session")
 def is_need_proxy():
@@ -16,3 +19,37 @@ def proxy_address():
     proxy_host = os.getenv("SOCKS_PROXY_ADDRESS")
     proxy_port = os.getenv("SOCKS_PROXY_PORT")
     return f"socks5://{proxy_host}:{proxy_port}"
+
+
+@pytest.fixture(scope="session")
+def soft_m_api_stand_in_server():
+    with SoftMAPIStandInServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def is_need_soft_m_api_stand_in():
+    need_stand_in = False
+    if os.getenv("TEST_WITH_SOFT_M_API_STAND_IN") is not None:
+        need_stand_in = True
+    return need_stand_in
+
+
+@pytest.fixture(scope="session")
+def lysva_api_base(request, is_need_soft_m_api_stand_in):
+    if is_need_soft_m_api_stand_in:
+        return request.getfixturevalue("soft_m_api_stand_in_server").api_base
+    return api_constants.LYSVA_API_BASE
+
+
+@pytest.fixture(scope="session")
+def chernushka_api_base(request, is_need_soft_m_api_stand_in):
+    if is_need_soft_m_api_stand_in:
+        return request.getfixturevalue("soft_m_api_stand_in_server").api_base
+    return api_constants.CHERNUSHKA_API_BASE
+
+
+@pytest.fixture
+def isolated_soft_m_api_stand_in_server():
+    with SoftMAPIStandInServer() as server:
+        yield server
@@ -0,0 +1,306 @@
+import datetime
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import SplitResult, parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+from dateutil.tz import gettz
+
+from boiler_softm.constants import column_names as soft_m_column_names
+from boiler_softm.logging import logger
+
+WEATHER_FORECAST_ROWS_COUNT = 72
+TEMP_GRAPH_ROWS_COUNT = 51
+ERROR_STATUS_CODE = 500
+THROTTLING_STATUS_CODE = 429
+
+
+class _SoftMAPIStandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, so Nagle's algorithm would add a delayed ACK to each response
+    disable_nagle_algorithm = True
+    server: "_SoftMAPIStandInHTTPServer"
+
+    def do_GET(self) -> None:
+        status_code, body, headers = self.server.stand_in.handle_request(
+            urlsplit(self.path),
+            self.headers.get("If-None-Match"),
+            self.client_address[1]
+        )
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        for header_name, header_value in headers.items():
+            self.send_header(header_name, header_value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class _SoftMAPIStandInHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    stand_in: "SoftMAPIStandInServer"
+
+
+class SoftMAPIStandInServer:
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 latency: float = 0.0,
+                 latency_jitter: float = 0.0,
+                 weather_forecast_rows_count: int = WEATHER_FORECAST_ROWS_COUNT,
+                 temp_graph_rows_count: int = TEMP_GRAPH_ROWS_COUNT,
+                 error_rate: float = 0.0,
+                 error_status_code: int = ERROR_STATUS_CODE,
+                 max_requests_per_second: Optional[float] = None,
+                 weather_data_timezone: datetime.tzinfo = gettz("Asia/Yekaterinburg"),
+                 seed: Optional[int] = None
+                 ) -> None:
+        self._host = host
+        self._port = port
+        self._latency = latency
+        self._latency_jitter = latency_jitter
+        self._weather_forecast_rows_count = weather_forecast_rows_count
+        self._temp_graph_rows_count = temp_graph_rows_count
+        self._error_rate = error_rate
+        self._error_status_code = error_status_code
+        self._max_requests_per_second = max_requests_per_second
+        self._weather_data_timezone = weather_data_timezone
+
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._bodies: Dict[Tuple, Tuple[bytes, str]] = {}
+        self._method_bodies: Dict[str, Tuple[bytes, str]] = {}
+        self._scripted_responses: List[Tuple[int, bytes, float]] = []
+        self._client_ports: Set[int] = set()
+        self._throttling_tokens = 0.0
+        self._throttling_updated_at = None
+        self._requests_count = 0
+        self._errors_count = 0
+        self._throttled_count = 0
+
+        self._http_server: Optional[_SoftMAPIStandInHTTPServer] = None
+        self._server_thread: Optional[threading.Thread] = None
+
+        logger.debug(
+            f"Creating instance:"
+            f"host: {self._host}"
+            f"port: {self._port}"
+            f"latency: {self._latency}"
+            f"latency_jitter: {self._latency_jitter}"
+            f"weather_forecast_rows_count: {self._weather_forecast_rows_count}"
+            f"temp_graph_rows_count: {self._temp_graph_rows_count}"
+            f"error_rate: {self._error_rate}"
+            f"error_status_code: {self._error_status_code}"
+            f"max_requests_per_second: {self._max_requests_per_second}"
+            f"weather_data_timezone: {self._weather_data_timezone}"
+        )
+
+    @property
+    def api_base(self) -> str:
+        if self._http_server is None:
+            raise RuntimeError("Stand-in server is not started")
+        host, port = self._http_server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def latency(self) -> float:
+        return self._latency
+
+    @latency.setter
+    def latency(self, latency: float) -> None:
+        with self._lock:
+            self._latency = latency
+
+    @property
+    def requests_count(self) -> int:
+        return self._requests_count
+
+    @property
+    def client_ports(self) -> Set[int]:
+        with self._lock:
+            return set(self._client_ports)
+
+    @property
+    def errors_count(self) -> int:
+        return self._errors_count
+
+    @property
+    def throttled_count(self) -> int:
+        return self._throttled_count
+
+    def set_body(self, method: str, body: bytes) -> None:
+        # Replaces generated body of the method, ETag follows the body content
+        with self._lock:
+            self._method_bodies[method] = body, f"\"{hashlib.sha256(body).hexdigest()[:32]}\""
+
+    def enqueue_responses(self, responses: List[Tuple[int, bytes, float]]) -> None:
+        # Next requests get these (status code, body, delay) responses instead of regular ones
+        with self._lock:
+            self._scripted_responses.extend(responses)
+
+    def start(self) -> "SoftMAPIStandInServer":
+        if self._http_server is not None:
+            return self
+        self._http_server = _SoftMAPIStandInHTTPServer((self._host, self._port), _SoftMAPIStandInHandler)
+        self._http_server.stand_in = self
+        self._server_thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+        self._server_thread.start()
+        logger.debug(f"Stand-in server is started at {self.api_base}")
+        return self
+
+    def stop(self) -> None:
+        if self._http_server is None:
+            return
+        self._http_server.shutdown()
+        self._http_server.server_close()
+        self._server_thread.join()
+        self._http_server = None
+        self._server_thread = None
+
+    def __enter__(self) -> "SoftMAPIStandInServer":
+        return self.start()
+
+    def __exit__(self, *args) -> None:
+        self.stop()
+
+    def handle_request(self,
+                       url: SplitResult,
+                       if_none_match: Optional[str] = None,
+                       client_port: Optional[int] = None
+                       ) -> Tuple[int, bytes, Dict[str, str]]:
+        with self._lock:
+            self._requests_count += 1
+            if client_port is not None:
+                self._client_ports.add(client_port)
+            scripted_response = None
+            if self._scripted_responses:
+                scripted_response = self._scripted_responses.pop(0)
+        if scripted_response is not None:
+            status_code, body, delay = scripted_response
+            time.sleep(delay)
+            return status_code, body, {}
+
+        with self._lock:
+            delay = self._latency + self._random.uniform(0, self._latency_jitter)
+            is_throttled = not self._take_throttling_token()
+            is_failed = not is_throttled and self._random.random() < self._error_rate
+            if is_throttled:
+                self._throttled_count += 1
+            elif is_failed:
+                self._errors_count += 1
+        time.sleep(delay)
+
+        if is_throttled:
+            return THROTTLING_STATUS_CODE, b"", {"Retry-After": "1"}
+        if is_failed:
+            return self._error_status_code, b"", {}
+        if url.path != "/JSON":
+            return 404, b"", {}
+
+        query = parse_qs(url.query)
+        method = query.get("method", [None])[0]
+        boiler_id = None
+        if method == "ai_getTempGraphic":
+            try:
+                boiler_id = int(json.loads(query["argument"][0])["boiler_id"])
+            except (KeyError, TypeError, ValueError):
+                return 400, b"", {}
+        elif method not in ("getPrognozT", "getTempGraphic"):
+            return 404, b"", {}
+
+        body, etag = self._get_body(method, boiler_id)
+        headers = {"ETag": etag}
+        if if_none_match == etag:
+            return 304, b"", headers
+        return 200, body, headers
+
+    def _take_throttling_token(self) -> bool:
+        if self._max_requests_per_second is None:
+            return True
+        # Token bucket allows bursts of up to a second of requests
+        now = time.monotonic()
+        bucket_size = max(1.0, self._max_requests_per_second)
+        if self._throttling_updated_at is None:
+            self._throttling_tokens = bucket_size
+        else:
+            elapsed = now - self._throttling_updated_at
+            self._throttling_tokens = min(
+                bucket_size,
+                self._throttling_tokens + elapsed * self._max_requests_per_second
+            )
+        self._throttling_updated_at = now
+        if self._throttling_tokens < 1:
+            return False
+        self._throttling_tokens -= 1
+        return True
+
+    def _get_body(self, method: str, boiler_id: Optional[int]) -> Tuple[bytes, str]:
+        forecast_date = None
+        if method == "getPrognozT":
+            forecast_date = pd.Timestamp.now(tz=self._weather_data_timezone).date()
+        body_key = (method, boiler_id, forecast_date)
+        with self._lock:
+            cached_body = self._method_bodies.get(method) or self._bodies.get(body_key)
+        if cached_body is not None:
+            return cached_body
+
+        if method == "getPrognozT":
+            body = self._make_weather_forecast_body(forecast_date)
+        elif method == "getTempGraphic":
+            body = self._make_lysva_temp_graph_body()
+        else:
+            body = self._make_chernushka_temp_graph_body(boiler_id)
+        cached_body = body, f"\"{hashlib.sha256(body).hexdigest()[:32]}\""
+        with self._lock:
+            self._bodies[body_key] = cached_body
+        return cached_body
+
+    def _make_weather_forecast_body(self, forecast_date: datetime.date) -> bytes:
+        # Forecast starts at the local midnight of the current day like the real one
+        timestamps = pd.date_range(forecast_date, periods=self._weather_forecast_rows_count, freq="H")
+        temps = 10 * np.sin(np.arange(self._weather_forecast_rows_count) * 2 * np.pi / 24) - 10
+        return json.dumps([
+            {
+                soft_m_column_names.LYSVA_WEATHER_DATE: timestamp.strftime("%Y-%m-%d"),
+                soft_m_column_names.LYSVA_WEATHER_TIME: timestamp.strftime("%H:%M"),
+                soft_m_column_names.LYSVA_WEATHER_TEMP: round(float(temp), 1)
+            }
+            for timestamp, temp in zip(timestamps, temps)
+        ]).encode("utf-8")
+
+    def _make_temp_graph(self, temp_shift: float):
+        weather_temps = np.linspace(10, -40, self._temp_graph_rows_count).round(1)
+        forward_temps = (60 + temp_shift - weather_temps).round(1)
+        backward_temps = (45 + temp_shift / 2 - weather_temps / 2).round(1)
+        return zip(weather_temps.tolist(), forward_temps.tolist(), backward_temps.tolist())
+
+    def _make_lysva_temp_graph_body(self) -> bytes:
+        return json.dumps([
+            {
+                soft_m_column_names.LYSVA_TEMP_GRAPH_WEATHER_TEMP: weather_temp,
+                soft_m_column_names.LYSVA_TEMP_GRAPH_TEMP_AT_IN: forward_temp,
+                soft_m_column_names.LYSVA_TEMP_GRAPH_TEMP_AT_OUT: backward_temp
+            }
+            for weather_temp, forward_temp, backward_temp in self._make_temp_graph(0)
+        ]).encode("utf-8")
+
+    def _make_chernushka_temp_graph_body(self, boiler_id: int) -> bytes:
+        # Each boiler gets its own temp graph so that mixed up boiler ids are noticeable
+        return json.dumps({"data": [
+            {
+                soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_WEATHER_TEMP: weather_temp,
+                soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_TEMP_AT_IN: forward_temp,
+                soft_m_column_names.CHERNUSHKA_TEMP_GRAPH_TEMP_AT_OUT: backward_temp
+            }
+            for weather_temp, forward_temp, backward_temp in self._make_temp_graph(boiler_id)
+        ]}).encode("utf-8")
@@ -0,0 +1,79 @@
+import pytest
+import requests
+from boiler.constants import column_names
+from dateutil.tz import gettz
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_loader import \
+    SoftMChernushkaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+from soft_m_api_stand_in_server import SoftMAPIStandInServer
+
+
+class TestSoftMAPIStandInServer:
+
+    @pytest.fixture
+    def transport(self):
+        transport = SoftMSyncHTTPTransport(max_retries=0)
+        yield transport
+        transport.close()
+
+    def test_weather_forecast_is_loaded(self, transport):
+        with SoftMAPIStandInServer(weather_forecast_rows_count=48) as server:
+            loader = SoftMSyncWeatherForecastOnlineLoader(
+                reader=SoftMSyncWeatherForecastJSONReader(weather_data_timezone=gettz("Asia/Yekaterinburg")),
+                server_address=server.api_base,
+                transport=transport
+            )
+            weather_df = loader.load_weather()
+
+        assert len(weather_df) == 48
+        assert weather_df[column_names.TIMESTAMP].is_monotonic_increasing
+        assert weather_df[column_names.WEATHER_TEMP].notna().all()
+
+    def test_chernushka_temp_graph_depends_on_boiler_id(self, transport):
+        with SoftMAPIStandInServer(temp_graph_rows_count=11) as server:
+            temp_graphs_dfs = [
+                SoftMChernushkaSyncTempGraphOnlineLoader(
+                    reader=SoftMChernushkaSyncTempGraphOnlineReader(),
+                    boiler_id=boiler_id,
+                    api_base=server.api_base,
+                    transport=transport
+                ).load_temp_graph()
+                for boiler_id in (1, 2)
+            ]
+
+        assert len(temp_graphs_dfs[0]) == 11
+        assert not temp_graphs_dfs[0].equals(temp_graphs_dfs[1])
+
+    def test_unknown_method_and_etag(self):
+        with SoftMAPIStandInServer() as server:
+            unknown_method_response = requests.get(f"{server.api_base}/JSON", params={"method": "unknown"})
+            response = requests.get(f"{server.api_base}/JSON", params={"method": "getTempGraphic"})
+            not_modified_response = requests.get(
+                f"{server.api_base}/JSON",
+                params={"method": "getTempGraphic"},
+                headers={"If-None-Match": response.headers["ETag"]}
+            )
+
+        assert unknown_method_response.status_code == 404
+        assert response.status_code == 200
+        assert not_modified_response.status_code == 304
+
+    def test_errors_and_throttling(self):
+        with SoftMAPIStandInServer(error_rate=1.0) as server:
+            response = requests.get(f"{server.api_base}/JSON", params={"method": "getTempGraphic"})
+            assert response.status_code == 500
+            assert server.errors_count == 1
+
+        with SoftMAPIStandInServer(max_requests_per_second=2) as server:
+            status_codes = [
+                requests.get(f"{server.api_base}/JSON", params={"method": "getTempGraphic"}).status_code
+                for _ in range(4)
+            ]
+            assert status_codes[:2] == [200, 200]
+            assert 429 in status_codes[2:]
+            assert server.throttled_count == status_codes.count(429)
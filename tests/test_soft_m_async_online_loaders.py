@@ -0,0 +1,106 @@
+import asyncio
+import json
+import time
+
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from dateutil.tz import gettz
+
+from boiler_softm.io.async_gathering import gather_with_server_limit
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.temp_graph.io.soft_m_chernushka_async_temp_graph_online_loader import \
+    SoftMChernushkaAsyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.io.soft_m_lysva_async_temp_graph_online_loader import SoftMLysvaAsyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from boiler_softm.weather.io.soft_m_async_weather_forecast_online_loader import SoftMAsyncWeatherForecastOnlineLoader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+
+
+class TestSoftMAsyncOnlineLoaders:
+    timezone = gettz("Asia/Yekaterinburg")
+    request_delay = 0.3
+
+    @pytest.fixture
+    def stub_server(self, isolated_soft_m_api_stand_in_server):
+        isolated_soft_m_api_stand_in_server.set_body("getPrognozT", json.dumps([
+            {"date": "2021-03-01", "time": "12:00", "temp": -5.5},
+            {"date": "2021-03-01", "time": "15:00", "temp": -3.0}
+        ]).encode("utf-8"))
+        isolated_soft_m_api_stand_in_server.set_body("getTempGraphic", json.dumps([
+            {"t": -10, "in_t": 70.5, "out_t": 50.1}
+        ]).encode("utf-8"))
+        isolated_soft_m_api_stand_in_server.set_body("ai_getTempGraphic", json.dumps({"data": [
+            {"t": -10, "forward_t": 68.0, "backward_t": 48.2}
+        ]}).encode("utf-8"))
+        isolated_soft_m_api_stand_in_server.latency = self.request_delay
+        return isolated_soft_m_api_stand_in_server
+
+    @pytest.fixture
+    def transport(self):
+        transport = SoftMSyncHTTPTransport()
+        yield transport
+        transport.close()
+
+    @pytest.fixture
+    def loaders(self, stub_server, transport):
+        return [
+            SoftMAsyncWeatherForecastOnlineLoader(
+                reader=SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone),
+                server_address=stub_server.api_base,
+                transport=transport
+            ),
+            SoftMLysvaAsyncTempGraphOnlineLoader(
+                reader=SoftMLysvaSyncTempGraphOnlineReader(),
+                api_base=stub_server.api_base,
+                transport=transport
+            ),
+            SoftMChernushkaAsyncTempGraphOnlineLoader(
+                reader=SoftMChernushkaSyncTempGraphOnlineReader(),
+                boiler_id=1,
+                api_base=stub_server.api_base,
+                transport=transport
+            ),
+            SoftMChernushkaAsyncTempGraphOnlineLoader(
+                reader=SoftMChernushkaSyncTempGraphOnlineReader(),
+                boiler_id=2,
+                api_base=stub_server.api_base,
+                transport=transport
+            )
+        ]
+
+    @staticmethod
+    def _load_all(loaders, max_concurrent_requests_per_server):
+        weather_loader, *temp_graph_loaders = loaders
+        server_awaitables = [(weather_loader.server_address, weather_loader.load_weather())]
+        for loader in temp_graph_loaders:
+            server_awaitables.append((loader.api_base, loader.load_temp_graph()))
+        return asyncio.run(gather_with_server_limit(server_awaitables, max_concurrent_requests_per_server))
+
+    def test_async_loaders(self, loaders):
+        weather_df, lysva_temp_graph_df, *chernushka_temp_graph_dfs = self._load_all(loaders, 4)
+
+        assert list(weather_df[column_names.TIMESTAMP]) == [
+            pd.Timestamp("2021-03-01 12:00", tz=self.timezone),
+            pd.Timestamp("2021-03-01 15:00", tz=self.timezone)
+        ]
+        assert list(weather_df[column_names.WEATHER_TEMP]) == [-5.5, -3.0]
+        assert list(lysva_temp_graph_df[column_names.FORWARD_PIPE_COOLANT_TEMP]) == [70.5]
+        for temp_graph_df in chernushka_temp_graph_dfs:
+            assert list(temp_graph_df[column_names.FORWARD_PIPE_COOLANT_TEMP]) == [68.0]
+
+    def test_requests_are_concurrent(self, loaders):
+        start_time = time.perf_counter()
+        self._load_all(loaders, 4)
+        elapsed_time = time.perf_counter() - start_time
+
+        assert elapsed_time < 2.5 * self.request_delay
+
+    def test_requests_are_limited_per_server(self, loaders):
+        start_time = time.perf_counter()
+        self._load_all(loaders, 1)
+        elapsed_time = time.perf_counter() - start_time
+
+        assert elapsed_time >= len(loaders) * self.request_delay
@@ -16,7 +16,7 @@ class TestSoftMChernushkaSyncTempGraphOnlineLoader:
         return SoftMChernushkaSyncTempGraphOnlineReader()
 
     @pytest.fixture
-    def loader(self, reader, is_need_proxy, proxy_address):
+    def loader(self, reader, is_need_proxy, proxy_address, chernushka_api_base):
         http_proxy = None
         https_proxy = None
         if is_need_proxy:
@@ -24,6 +24,7 @@ class TestSoftMChernushkaSyncTempGraphOnlineLoader:
             https_proxy = proxy_address
         loader = SoftMChernushkaSyncTempGraphOnlineLoader(
             reader=reader,
+            api_base=chernushka_api_base,
             http_proxy=http_proxy,
             https_proxy=https_proxy
         )
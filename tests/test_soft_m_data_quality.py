@@ -0,0 +1,83 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from boiler_softm.data_processing.data_quality import ClipRule, RangeToNaNRule, ScaleIfAboveRule, \
+    SoftMDataQualityStage, SpikeSuppressionRule
+
+
+class TestSoftMDataQuality:
+
+    @pytest.fixture
+    def water_temps(self):
+        random_state = np.random.RandomState(42)
+        water_temps = random_state.uniform(40, 95, 1000)
+        is_incorrect = random_state.rand(1000) < 0.3
+        water_temps[is_incorrect] *= 100
+        water_temps[random_state.rand(1000) < 0.05] = np.nan
+        return water_temps
+
+    def test_scale_if_above_equals_per_element_division(self, water_temps):
+        expected_temps = pd.Series(water_temps).apply(
+            lambda water_temp: water_temp > 100 and water_temp / 100 or water_temp
+        ).to_numpy()
+        temps = water_temps.copy()
+
+        is_affected = ScaleIfAboveRule("t", 100, 100).apply(temps)
+
+        np.testing.assert_array_equal(temps, expected_temps)
+        assert is_affected.sum() == (water_temps > 100).sum()
+
+    def test_clip_and_range_to_nan(self):
+        values = np.array([-1.0, 0.0, 5.0, 10.0, 11.0, np.nan])
+
+        clipped_values = values.copy()
+        is_clipped = ClipRule("p", min_value=0, max_value=10).apply(clipped_values)
+        masked_values = values.copy()
+        is_masked = RangeToNaNRule("p", min_value=0).apply(masked_values)
+
+        np.testing.assert_array_equal(clipped_values, [0.0, 0.0, 5.0, 10.0, 10.0, np.nan])
+        np.testing.assert_array_equal(is_clipped, [True, False, False, False, True, False])
+        np.testing.assert_array_equal(masked_values, [np.nan, 0.0, 5.0, 10.0, 11.0, np.nan])
+        np.testing.assert_array_equal(is_masked, [True, False, False, False, False, False])
+
+    def test_spike_suppression(self):
+        values = np.array([50.0, 51.0, 90.0, 52.0, 53.0, 80.0, 81.0, 10.0, 80.0])
+
+        is_affected = SpikeSuppressionRule("t", max_jump=20).apply(values)
+
+        np.testing.assert_array_equal(np.isnan(values), [False, False, True, False, False, False, False, True, False])
+        assert is_affected.sum() == 2
+
+    def test_stage_applies_rules_of_column_in_order_and_counts_rows(self):
+        df = pd.DataFrame({
+            "t": [6000.0, 60.0, 250.0, 61.0],
+            "v": [-1.0, 2.0, 3.0, 100.0]
+        })
+        stage = SoftMDataQualityStage([
+            ScaleIfAboveRule("t", 100, 100),
+            RangeToNaNRule("t", min_value=30),
+            ClipRule("v", min_value=0, name="negative_volume")
+        ])
+
+        df = stage.apply_to_df(df)
+        stage.apply_to_df(pd.DataFrame({"t": [1.0], "v": [1.0]}))
+
+        np.testing.assert_array_equal(df["t"], [60.0, 60.0, np.nan, 61.0])
+        np.testing.assert_array_equal(df["v"], [0.0, 2.0, 3.0, 100.0])
+        assert stage.affected_rows_counts == {"scale_if_above:t": 2, "range_to_nan:t": 2, "negative_volume": 1}
+        assert stage.last_affected_rows_counts == {"scale_if_above:t": 0, "range_to_nan:t": 1, "negative_volume": 0}
+
+    def test_rules_names_must_be_unique(self):
+        with pytest.raises(ValueError):
+            SoftMDataQualityStage([ClipRule("v", min_value=0), ClipRule("v", max_value=10)])
+
+    def test_stage_is_picklable(self):
+        stage = SoftMDataQualityStage([ClipRule("v", min_value=0)])
+        stage.apply_to_df(pd.DataFrame({"v": [-1.0]}))
+
+        unpickled_stage = pickle.loads(pickle.dumps(stage))
+
+        assert unpickled_stage.affected_rows_counts == {"clip:v": 1}
@@ -0,0 +1,92 @@
+import io
+
+import pandas as pd
+import pytest
+from boiler.constants import circuit_types
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters, processing
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.batch_ingestion import SoftMHeatingObjBatchIngestor, SoftMHeatingObjIngestionJob
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor
+
+
+class TestSoftMHeatingObjBatchIngestor:
+    timezone = gettz("Asia/Yekaterinburg")
+    start_timestamp = pd.Timestamp("2021-03-01 00:00", tz=timezone)
+    end_timestamp = start_timestamp + 20 * TIME_TICK
+
+    @pytest.fixture
+    def csv_content(self):
+        rows = ["dTimeStamp;nTC;t1;t2"]
+        for i in range(0, 20, 2):
+            timestamp = f"01.03.2021 {(3 * i) // 60}:{(3 * i) % 60:02d}"
+            rows.append(f"{timestamp};1;{70 + i},5;{50 + i},25")
+        return "\n".join(rows).encode("utf-8")
+
+    @pytest.fixture
+    def reader(self):
+        return SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=SoftMVectorizedTimestampParsingAlgorithm(timezone=self.timezone),
+            need_columns=converting_parameters.LYSVA_APARTMENT_HOUSE_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_APARTMENT_HOUSE_FLOAT_COLUMNS,
+            water_temp_columns=[],
+            need_circuit=circuit_types.HEATING
+        )
+
+    @pytest.fixture
+    def processor(self):
+        timestamp_round_algorithm = CeilTimestampRoundAlgorithm(round_step=TIME_TICK)
+        return SoftMHeatingObjProcessor(
+            columns_to_interpolate=processing.APARTMENT_HOUSE_NEED_INTERPOLATE_COLUMNS[1:],
+            timestamp_round_algorithm=timestamp_round_algorithm,
+            timestamp_interpolation_algorithm=TimestampInterpolationAlgorithm(timestamp_round_algorithm, TIME_TICK),
+            border_values_interpolation_algorithm=LinearInsideValueInterpolationAlgorithm(),
+            internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm(),
+            timestamp_filter_algorithm=LeftClosedTimestampFilterAlgorithm()
+        )
+
+    def test_ingest(self, csv_content, reader, processor, tmp_path):
+        csv_path = tmp_path / "apartment_house.csv"
+        csv_path.write_bytes(csv_content)
+        jobs = [
+            SoftMHeatingObjIngestionJob("from_path", str(csv_path), reader),
+            SoftMHeatingObjIngestionJob(
+                "from_stream", io.BytesIO(csv_content), reader, processor, self.start_timestamp, self.end_timestamp
+            ),
+            SoftMHeatingObjIngestionJob("missing", str(tmp_path / "missing.csv"), reader)
+        ]
+
+        results = SoftMHeatingObjBatchIngestor(max_workers=2).ingest(jobs)
+
+        pd.testing.assert_frame_equal(
+            results["from_path"].heating_obj_df,
+            reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+        )
+        pd.testing.assert_frame_equal(
+            results["from_stream"].heating_obj_df,
+            processor.process_heating_obj(
+                reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content)),
+                self.start_timestamp,
+                self.end_timestamp
+            )
+        )
+        assert not results["missing"].is_successful
+        assert "FileNotFoundError" in results["missing"].error
+
+    def test_duplicated_heating_obj_ids_are_rejected(self, csv_content, reader):
+        jobs = [
+            SoftMHeatingObjIngestionJob("heating_obj", csv_content, reader),
+            SoftMHeatingObjIngestionJob("heating_obj", csv_content, reader)
+        ]
+
+        with pytest.raises(ValueError):
+            SoftMHeatingObjBatchIngestor(max_workers=1).ingest(jobs)
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants import processing
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.heating_obj.batch_processing import SoftMHeatingObjBatchProcessor
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor
+
+
+class TestSoftMHeatingObjBatchProcessor:
+    timezone = gettz("Asia/Yekaterinburg")
+    time_tick = TIME_TICK
+    start_timestamp = pd.Timestamp("2021-03-01 00:00", tz=timezone)
+    heating_objs_count = 5
+
+    @pytest.fixture
+    def heating_objs_dfs(self):
+        random_state = np.random.RandomState(42)
+        heating_objs_dfs = {}
+        for heating_obj_number in range(self.heating_objs_count):
+            rows_count = random_state.randint(20, 150)
+            timestamps = self.start_timestamp + pd.to_timedelta(
+                np.sort(random_state.randint(-20 * 180, 220 * 180, rows_count)), unit="s"
+            )
+            heating_obj_df = pd.DataFrame({column_names.TIMESTAMP: timestamps})
+            for column_name in processing.BOILER_NEED_INTERPOLATE_COLUMNS:
+                values = random_state.uniform(0, 100, rows_count)
+                values[random_state.rand(rows_count) < 0.2] = np.nan
+                heating_obj_df[column_name] = values
+            heating_objs_dfs[f"heating_obj_{heating_obj_number}"] = heating_obj_df
+        return heating_objs_dfs
+
+    @pytest.fixture
+    def timestamp_round_algorithm(self):
+        return CeilTimestampRoundAlgorithm(round_step=self.time_tick)
+
+    @pytest.fixture
+    def batch_processor(self, timestamp_round_algorithm):
+        return SoftMHeatingObjBatchProcessor(
+            columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+            timestamp_round_algorithm=timestamp_round_algorithm,
+            time_tick=self.time_tick
+        )
+
+    @pytest.fixture
+    def processor(self, timestamp_round_algorithm):
+        return SoftMHeatingObjProcessor(
+            columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+            timestamp_round_algorithm=timestamp_round_algorithm,
+            timestamp_interpolation_algorithm=TimestampInterpolationAlgorithm(
+                timestamp_round_algorithm,
+                self.time_tick
+            ),
+            border_values_interpolation_algorithm=LinearInsideValueInterpolationAlgorithm(),
+            internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm(),
+            timestamp_filter_algorithm=LeftClosedTimestampFilterAlgorithm()
+        )
+
+    @pytest.mark.parametrize("start_tick, end_tick", [(0, 200), (-10, 230), (17, 123)])
+    def test_batch_processing_equals_processing(self,
+                                                heating_objs_dfs,
+                                                batch_processor,
+                                                processor,
+                                                start_tick,
+                                                end_tick):
+        min_required_timestamp = self.start_timestamp + start_tick * self.time_tick
+        max_required_timestamp = self.start_timestamp + end_tick * self.time_tick
+        processed_dfs = batch_processor.process_heating_objs(
+            heating_objs_dfs,
+            min_required_timestamp,
+            max_required_timestamp
+        )
+
+        assert list(processed_dfs) == list(heating_objs_dfs)
+        for heating_obj_id, heating_obj_df in heating_objs_dfs.items():
+            expected_df = processor.process_heating_obj(
+                heating_obj_df,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+            expected_df = expected_df[[column_names.TIMESTAMP] + processing.BOILER_NEED_INTERPOLATE_COLUMNS]
+            pd.testing.assert_frame_equal(
+                processed_dfs[heating_obj_id].reset_index(drop=True),
+                expected_df.reset_index(drop=True),
+                check_freq=False
+            )
+
+    def test_stacked_df_equals_per_heating_obj_dfs(self, heating_objs_dfs, batch_processor):
+        max_required_timestamp = self.start_timestamp + 200 * self.time_tick
+        processed_dfs = batch_processor.process_heating_objs(
+            heating_objs_dfs,
+            self.start_timestamp,
+            max_required_timestamp
+        )
+        stacked_df = batch_processor.process_heating_objs_to_stacked_df(
+            heating_objs_dfs,
+            self.start_timestamp,
+            max_required_timestamp
+        )
+
+        for heating_obj_id, processed_df in processed_dfs.items():
+            heating_obj_df = stacked_df[stacked_df["heating_obj_id"] == heating_obj_id].drop(columns="heating_obj_id")
+            pd.testing.assert_frame_equal(
+                heating_obj_df.reset_index(drop=True),
+                processed_df.reset_index(drop=True),
+                check_freq=False
+            )
+
+    def test_batch_processing_requires_window(self, heating_objs_dfs, batch_processor):
+        with pytest.raises(ValueError):
+            batch_processor.process_heating_objs(heating_objs_dfs, None, None)
+
+    def test_rows_without_timestamp_are_dropped(self, heating_objs_dfs, batch_processor, processor):
+        max_required_timestamp = self.start_timestamp + 200 * self.time_tick
+        heating_obj_df = heating_objs_dfs["heating_obj_0"]
+        heating_obj_df.loc[[0, 5], column_names.TIMESTAMP] = pd.NaT
+        processed_dfs = batch_processor.process_heating_objs(
+            heating_objs_dfs,
+            self.start_timestamp,
+            max_required_timestamp
+        )
+
+        expected_df = processor.process_heating_obj(heating_obj_df, self.start_timestamp, max_required_timestamp)
+        expected_df = expected_df[[column_names.TIMESTAMP] + processing.BOILER_NEED_INTERPOLATE_COLUMNS]
+        pd.testing.assert_frame_equal(
+            processed_dfs["heating_obj_0"].reset_index(drop=True),
+            expected_df.reset_index(drop=True),
+            check_freq=False
+        )
+
+    def test_no_heating_objs_give_empty_results(self, batch_processor):
+        max_required_timestamp = self.start_timestamp + 200 * self.time_tick
+
+        assert batch_processor.process_heating_objs({}, self.start_timestamp, max_required_timestamp) == {}
+        regular_grid_frames = batch_processor.process_heating_objs_to_regular_grid(
+            {},
+            self.start_timestamp,
+            max_required_timestamp
+        )
+        assert regular_grid_frames == {}
+        stacked_df = batch_processor.process_heating_objs_to_stacked_df(
+            {},
+            self.start_timestamp,
+            max_required_timestamp
+        )
+        assert len(stacked_df) == 0
+        assert list(stacked_df.columns) == (
+            ["heating_obj_id", column_names.TIMESTAMP] + processing.BOILER_NEED_INTERPOLATE_COLUMNS
+        )
+
+    def test_regular_grid_frames_equal_per_heating_obj_dfs(self, heating_objs_dfs, batch_processor):
+        min_required_timestamp = self.start_timestamp + 17 * self.time_tick
+        max_required_timestamp = self.start_timestamp + 123 * self.time_tick
+        processed_dfs = batch_processor.process_heating_objs(
+            heating_objs_dfs,
+            min_required_timestamp,
+            max_required_timestamp
+        )
+        regular_grid_frames = batch_processor.process_heating_objs_to_regular_grid(
+            heating_objs_dfs,
+            min_required_timestamp,
+            max_required_timestamp
+        )
+
+        assert list(regular_grid_frames) == list(processed_dfs)
+        for heating_obj_id, processed_df in processed_dfs.items():
+            pd.testing.assert_frame_equal(
+                regular_grid_frames[heating_obj_id].to_df(),
+                processed_df.reset_index(drop=True),
+                check_freq=False
+            )
+
+    def test_empty_window_regular_grid_frames_equal_per_heating_obj_frames(self,
+                                                                           heating_objs_dfs,
+                                                                           batch_processor,
+                                                                           processor):
+        required_timestamp = self.start_timestamp + 17.5 * self.time_tick
+        expected_start = self.start_timestamp + 18 * self.time_tick
+        regular_grid_frames = batch_processor.process_heating_objs_to_regular_grid(
+            heating_objs_dfs,
+            required_timestamp,
+            required_timestamp
+        )
+
+        for heating_obj_id, heating_obj_df in heating_objs_dfs.items():
+            frame = processor.process_heating_obj_to_regular_grid(
+                heating_obj_df,
+                required_timestamp,
+                required_timestamp,
+                time_tick=self.time_tick
+            )
+            batch_frame = regular_grid_frames[heating_obj_id]
+            assert len(frame) == len(batch_frame) == 0
+            assert frame.start == batch_frame.start == expected_start
+            assert frame.columns == batch_frame.columns
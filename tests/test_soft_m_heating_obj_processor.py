@@ -0,0 +1,155 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm, \
+    FloorTimestampRoundAlgorithm, NearestTimestampRoundAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
+from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants import processing
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
+from boiler_softm.heating_obj.processing import SoftMHeatingObjProcessor, SoftMHeatingObjProcessingState
+
+
+class TestSoftMHeatingObjProcessor:
+    timezone = gettz("Asia/Yekaterinburg")
+    time_tick = TIME_TICK
+    start_timestamp = pd.Timestamp("2021-03-01 00:00", tz=timezone)
+    end_timestamp = start_timestamp + (200 * time_tick)
+
+    @pytest.fixture
+    def heating_obj_df(self):
+        random_state = np.random.RandomState(42)
+        rows_count = 150
+        timestamps = self.start_timestamp + pd.to_timedelta(
+            np.sort(random_state.randint(0, 200 * 180, rows_count)), unit="s"
+        )
+        heating_obj_df = pd.DataFrame({column_names.TIMESTAMP: timestamps})
+        for column_name in processing.BOILER_NEED_INTERPOLATE_COLUMNS:
+            values = random_state.uniform(0, 100, rows_count)
+            values[random_state.rand(rows_count) < 0.1] = np.nan
+            heating_obj_df[column_name] = values
+        return heating_obj_df
+
+    @pytest.fixture
+    def timestamp_round_algorithm(self):
+        return CeilTimestampRoundAlgorithm(round_step=self.time_tick)
+
+    def _make_processor(self, timestamp_round_algorithm, **kwargs):
+        return SoftMHeatingObjProcessor(
+            columns_to_interpolate=processing.BOILER_NEED_INTERPOLATE_COLUMNS,
+            timestamp_round_algorithm=timestamp_round_algorithm,
+            timestamp_interpolation_algorithm=TimestampInterpolationAlgorithm(
+                timestamp_round_algorithm,
+                self.time_tick
+            ),
+            border_values_interpolation_algorithm=LinearInsideValueInterpolationAlgorithm(),
+            internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm(),
+            timestamp_filter_algorithm=LeftClosedTimestampFilterAlgorithm(),
+            **kwargs
+        )
+
+    def test_processor(self, heating_obj_df, timestamp_round_algorithm):
+        processor = self._make_processor(timestamp_round_algorithm)
+        processed_df = processor.process_heating_obj(heating_obj_df, self.start_timestamp, self.end_timestamp)
+
+        assert processed_df[column_names.TIMESTAMP].min() == self.start_timestamp
+        assert processed_df[column_names.TIMESTAMP].max() == self.end_timestamp - self.time_tick
+        assert processed_df[processing.BOILER_NEED_INTERPOLATE_COLUMNS].isna().sum().sum() == 0
+        assert (processed_df[column_names.TIMESTAMP].diff().dropna() == self.time_tick).all()
+
+    def test_copy_free_processing_equals_copying_processing(self, heating_obj_df, timestamp_round_algorithm):
+        copying_processor = self._make_processor(timestamp_round_algorithm)
+        copy_free_processor = self._make_processor(timestamp_round_algorithm, copy_input_df=False)
+        input_df = heating_obj_df.copy()
+
+        expected_df = copying_processor.process_heating_obj(input_df, self.start_timestamp, self.end_timestamp)
+        pd.testing.assert_frame_equal(input_df, heating_obj_df)
+        processed_df = copy_free_processor.process_heating_obj(input_df, self.start_timestamp, self.end_timestamp)
+
+        pd.testing.assert_frame_equal(processed_df, expected_df)
+
+    def test_incremental_processing_equals_full_processing(self, heating_obj_df, timestamp_round_algorithm):
+        processor = self._make_processor(timestamp_round_algorithm)
+        expected_df = processor.process_heating_obj(heating_obj_df, None, None)
+
+        state = None
+        processed_dfs = []
+        for batch_start in range(0, len(heating_obj_df), 17):
+            batch_df = heating_obj_df.iloc[batch_start:batch_start + 17]
+            processed_df, state = processor.process_new_heating_obj(batch_df, state)
+            processed_dfs.append(processed_df)
+            state = SoftMHeatingObjProcessingState.from_dict(json.loads(json.dumps(state.to_dict())))
+        processed_df = pd.concat(processed_dfs, ignore_index=True)
+
+        assert len(processed_df) > 0.9 * len(expected_df)
+        expected_df = expected_df[expected_df[column_names.TIMESTAMP] <= processed_df[column_names.TIMESTAMP].max()]
+        pd.testing.assert_frame_equal(processed_df, expected_df.reset_index(drop=True))
+
+    @pytest.mark.parametrize("round_algorithm_class", [
+        CeilTimestampRoundAlgorithm,
+        FloorTimestampRoundAlgorithm,
+        NearestTimestampRoundAlgorithm
+    ])
+    @pytest.mark.parametrize("min_ticks_offset, max_ticks_offset", [
+        (0, 200),
+        (-15, 230),
+        (40, 120),
+        (None, 100),
+        (30, None),
+        (None, None),
+        (250, 300)
+    ])
+    def test_fused_processing_equals_chained_processing(self,
+                                                        heating_obj_df,
+                                                        round_algorithm_class,
+                                                        min_ticks_offset,
+                                                        max_ticks_offset):
+        timestamp_round_algorithm = round_algorithm_class(round_step=self.time_tick)
+        chained_processor = self._make_processor(timestamp_round_algorithm)
+        fused_processor = self._make_processor(
+            timestamp_round_algorithm,
+            grid_resampler=SoftMGridResampler(timestamp_round_algorithm, self.time_tick)
+        )
+        heating_obj_df["circuit_id"] = np.arange(len(heating_obj_df), dtype=np.int64)
+        heating_obj_df.loc[[0, 70], column_names.TIMESTAMP] = pd.NaT
+        heating_obj_df = heating_obj_df.sample(frac=1, random_state=1)
+        min_required_timestamp = None
+        if min_ticks_offset is not None:
+            min_required_timestamp = self.start_timestamp + min_ticks_offset * self.time_tick + pd.Timedelta(seconds=7)
+        max_required_timestamp = None
+        if max_ticks_offset is not None:
+            max_required_timestamp = self.start_timestamp + max_ticks_offset * self.time_tick - pd.Timedelta(seconds=5)
+
+        expected_df = chained_processor.process_heating_obj(
+            heating_obj_df,
+            min_required_timestamp,
+            max_required_timestamp
+        )
+        processed_df = fused_processor.process_heating_obj(
+            heating_obj_df,
+            min_required_timestamp,
+            max_required_timestamp
+        )
+
+        pd.testing.assert_frame_equal(processed_df, expected_df, check_index_type=False, check_freq=False)
+
+    def test_fused_processing_of_column_without_values(self, heating_obj_df, timestamp_round_algorithm):
+        chained_processor = self._make_processor(timestamp_round_algorithm)
+        fused_processor = self._make_processor(
+            timestamp_round_algorithm,
+            grid_resampler=SoftMGridResampler(timestamp_round_algorithm, self.time_tick)
+        )
+        heating_obj_df[processing.BOILER_NEED_INTERPOLATE_COLUMNS[0]] = np.nan
+
+        expected_df = chained_processor.process_heating_obj(heating_obj_df, self.start_timestamp, self.end_timestamp)
+        processed_df = fused_processor.process_heating_obj(heating_obj_df, self.start_timestamp, self.end_timestamp)
+
+        pd.testing.assert_frame_equal(processed_df, expected_df, check_index_type=False)
@@ -0,0 +1,133 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.io.soft_m_json_columns_decoder import SoftMJSONColumnsDecoder, get_available_json_backends
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+
+
+@pytest.mark.parametrize("json_backend", get_available_json_backends())
+class TestSoftMJSONColumnsDecoder:
+    timezone = gettz("Asia/Yekaterinburg")
+
+    @pytest.fixture
+    def records(self):
+        random_state = np.random.RandomState(42)
+        return [
+            {
+                "int_value": int(value),
+                "float_value": float(value) / 7,
+                "optional_value": None if value % 5 == 0 else float(value),
+                "str_value": f"value {value}"
+            }
+            for value in random_state.randint(-1000, 1000, 500)
+        ]
+
+    @pytest.fixture
+    def weather_forecast(self):
+        return [
+            {"date": "2021-03-01", "time": f"{hour:02}:00", "temp": hour - 12}
+            for hour in range(24)
+        ]
+
+    @pytest.fixture
+    def temp_graph(self):
+        return [
+            {"t": weather_temp, "in_t": 60 - weather_temp + 0.5, "out_t": 45 - weather_temp / 2}
+            for weather_temp in range(10, -41, -1)
+        ]
+
+    def test_decoder(self, json_backend, records):
+        decoder = SoftMJSONColumnsDecoder(backend=json_backend)
+        df = decoder.decode_from_binary_stream(io.BytesIO(json.dumps(records).encode("utf-8")))
+
+        pd.testing.assert_frame_equal(df, pd.DataFrame(records).fillna(np.nan))
+
+    def test_decoder_with_records_path(self, json_backend, records):
+        decoder = SoftMJSONColumnsDecoder(records_path="data", backend=json_backend)
+        df = decoder.decode_from_binary_stream(io.BytesIO(json.dumps({"data": records}).encode("utf-8")))
+        empty_df = decoder.decode_from_binary_stream(io.BytesIO(b'{"status": "error"}'))
+
+        pd.testing.assert_frame_equal(df, pd.DataFrame(records).fillna(np.nan))
+        assert empty_df.empty
+
+    def test_decoder_with_missing_keys(self, json_backend):
+        records = [{"a": 1, "b": "x"}, {"a": 2}, {"c": 1.5}]
+        decoder = SoftMJSONColumnsDecoder(backend=json_backend)
+        df = decoder.decode_from_binary_stream(io.BytesIO(json.dumps(records).encode("utf-8")))
+
+        pd.testing.assert_frame_equal(df, pd.DataFrame(records))
+
+    def test_weather_reader(self, json_backend, weather_forecast):
+        content = json.dumps(weather_forecast).encode("utf-8")
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone, json_backend=json_backend)
+        weather_df = reader.read_weather_from_binary_stream(io.BytesIO(content))
+
+        expected_df = pd.read_json(io.BytesIO(content), convert_dates=False)
+        expected_df = expected_df.rename(columns=converting_parameters.LYSVA_WEATHER_INFO_COLUMN_EQUALS)
+        expected_df[column_names.TIMESTAMP] = pd.to_datetime(
+            expected_df.pop("date").str.cat(expected_df.pop("time"), sep=" ")
+        ).dt.tz_localize(self.timezone)
+        pd.testing.assert_frame_equal(weather_df, expected_df)
+
+    def test_temp_graph_readers(self, json_backend, temp_graph):
+        lysva_content = json.dumps(temp_graph).encode("utf-8")
+        lysva_reader = SoftMLysvaSyncTempGraphOnlineReader(json_backend=json_backend)
+        lysva_temp_graph_df = lysva_reader.read_temp_graph_from_binary_stream(io.BytesIO(lysva_content))
+        expected_df = pd.read_json(io.BytesIO(lysva_content)).rename(columns=converting_parameters.LYSVA_TEMP_GRAPH_COLUMN_NAMES_EQUALS)
+        pd.testing.assert_frame_equal(lysva_temp_graph_df, expected_df)
+
+        chernushka_temp_graph = [
+            {"t": point["t"], "forward_t": point["in_t"], "backward_t": point["out_t"]}
+            for point in temp_graph
+        ]
+        chernushka_content = json.dumps({"data": chernushka_temp_graph}).encode("utf-8")
+        chernushka_reader = SoftMChernushkaSyncTempGraphOnlineReader(json_backend=json_backend)
+        chernushka_temp_graph_df = chernushka_reader.read_temp_graph_from_binary_stream(
+            io.BytesIO(chernushka_content)
+        )
+        expected_df = pd.DataFrame(chernushka_temp_graph).rename(columns=converting_parameters.CHERNUSHKA_TEMP_GRAPH_COLUMN_NAMES_EQUALS)
+        pd.testing.assert_frame_equal(chernushka_temp_graph_df, expected_df)
+
+    def test_string_encoded_numbers(self, json_backend, weather_forecast, temp_graph):
+        records = [
+            {"float_value": "-5.5", "int_value": "3", "optional_value": "1", "str_value": "1.5"},
+            {"float_value": "2", "int_value": " 4", "optional_value": None, "str_value": "x"}
+        ]
+        content = json.dumps(records).encode("utf-8")
+        df = SoftMJSONColumnsDecoder(backend=json_backend).decode_from_binary_stream(io.BytesIO(content))
+        pd.testing.assert_frame_equal(df, pd.read_json(io.BytesIO(content)))
+
+        weather_forecast = [{**item, "temp": str(item["temp"] + 0.5)} for item in weather_forecast]
+        content = json.dumps(weather_forecast).encode("utf-8")
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone, json_backend=json_backend)
+        weather_df = reader.read_weather_from_binary_stream(io.BytesIO(content))
+        assert weather_df[column_names.WEATHER_TEMP].dtype == np.float64
+        assert weather_df[column_names.WEATHER_TEMP].iloc[0] == -11.5
+
+        temp_graph = [{key: str(value) for key, value in point.items()} for point in temp_graph]
+        content = json.dumps(temp_graph).encode("utf-8")
+        lysva_reader = SoftMLysvaSyncTempGraphOnlineReader(json_backend=json_backend)
+        temp_graph_df = lysva_reader.read_temp_graph_from_binary_stream(io.BytesIO(content))
+        expected_df = pd.read_json(io.BytesIO(content)).rename(
+            columns=converting_parameters.LYSVA_TEMP_GRAPH_COLUMN_NAMES_EQUALS
+        )
+        pd.testing.assert_frame_equal(temp_graph_df, expected_df)
+
+    @pytest.mark.parametrize("content", [b'[{"data": []}]', b'"Internal error"', b'{"data": "Internal error"}'])
+    def test_records_path_mismatch(self, json_backend, content):
+        if json_backend == "ijson":
+            pytest.skip("Incremental parser yields no records for a mismatching path")
+        decoder = SoftMJSONColumnsDecoder(records_path="data", backend=json_backend)
+
+        with pytest.raises(ValueError, match="records path data"):
+            decoder.decode_from_binary_stream(io.BytesIO(content))
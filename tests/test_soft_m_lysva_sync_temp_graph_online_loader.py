@@ -14,7 +14,7 @@ class TestSoftMLysvaSyncTempGraphOnlineLoader:
         return SoftMLysvaSyncTempGraphOnlineReader()
 
     @pytest.fixture
-    def loader(self, reader, is_need_proxy, proxy_address):
+    def loader(self, reader, is_need_proxy, proxy_address, lysva_api_base):
         http_proxy = None
         https_proxy = None
         if is_need_proxy:
@@ -22,6 +22,7 @@ class TestSoftMLysvaSyncTempGraphOnlineLoader:
             https_proxy = proxy_address
         loader = SoftMLysvaSyncTempGraphOnlineLoader(
             reader=reader,
+            api_base=lysva_api_base,
             http_proxy=http_proxy,
             https_proxy=https_proxy
         )
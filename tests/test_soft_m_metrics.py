@@ -0,0 +1,89 @@
+import io
+
+import pytest
+from boiler.constants import circuit_types, column_names
+from dateutil.tz import gettz
+
+from boiler_softm import metrics
+from boiler_softm.constants import converting_parameters
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+
+
+class TestSoftMMetrics:
+    csv_content = (
+        "dTimeStamp;nTC;t1;t2;v1;v2;p1;p2\n"
+        "2021-01-01 00:00:00.000;1;60,5;40,1;1,5;1,4;5,1;4,1\n"
+        "2021-01-01 00:00:00.000;2;6150;40,2;1,6;1,5;5,2;4,2\n"
+        "01.01.2021 0:03;2;61,7;40,3;1,7;1,6;5,3;4,3\n"
+    ).encode("utf-8")
+
+    @pytest.fixture
+    def reader(self):
+        return SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=SoftMVectorizedTimestampParsingAlgorithm(timezone=gettz("Asia/Yekaterinburg")),
+            need_columns=converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_BOILER_FLOAT_COLUMNS,
+            water_temp_columns=[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            need_circuit=circuit_types.HOT_WATER
+        )
+
+    @pytest.fixture
+    def in_memory_sink(self):
+        sink = metrics.InMemoryMetricsSink()
+        metrics.set_metrics_sink(sink, trace_memory=True)
+        yield sink
+        metrics.set_metrics_sink(None)
+
+    def test_reader_stages_are_recorded(self, reader, in_memory_sink):
+        heating_obj_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(self.csv_content))
+
+        stage_names = [record["stage_name"] for record in in_memory_sink.records]
+        assert stage_names[-1] == "heating_obj_csv_reader.read_heating_obj_from_binary_stream"
+        assert "heating_obj_csv_reader.parse_timestamp" in stage_names
+
+        exclude_record, = in_memory_sink.get_stage_records("heating_obj_csv_reader.exclude_unused_circuits")
+        assert exclude_record["rows_in"] == 3
+        assert exclude_record["rows_out"] == len(heating_obj_df) == 2
+        for record in in_memory_sink.records:
+            assert record["seconds"] >= 0
+            assert record["allocated_bytes"] >= 0
+
+        read_record, = in_memory_sink.get_stage_records(
+            "heating_obj_csv_reader.read_heating_obj_from_binary_stream"
+        )
+        assert read_record["allocated_bytes"] >= exclude_record["allocated_bytes"]
+
+        read_csv_record, = in_memory_sink.get_stage_records("heating_obj_csv_reader.read_csv")
+        assert read_csv_record["rows_out"] == 3
+
+    def test_csv_chunks_reading_is_recorded(self, reader, in_memory_sink):
+        chunks = list(reader.iter_heating_obj_chunks_from_binary_stream(io.BytesIO(self.csv_content), chunk_size=2))
+
+        read_csv_records = in_memory_sink.get_stage_records("heating_obj_csv_reader.read_csv")
+        assert [record["rows_out"] for record in read_csv_records] == [2, 1]
+        assert len(read_csv_records) == len(chunks)
+
+    def test_prometheus_text(self, reader):
+        sink = metrics.PrometheusTextMetricsSink()
+        metrics.set_metrics_sink(sink)
+        try:
+            reader.read_heating_obj_from_binary_stream(io.BytesIO(self.csv_content))
+            reader.read_heating_obj_from_binary_stream(io.BytesIO(self.csv_content))
+        finally:
+            metrics.set_metrics_sink(None)
+
+        text = sink.to_prometheus_text()
+        assert "# TYPE boiler_softm_stage_seconds_total counter" in text
+        assert 'boiler_softm_stage_calls_total{stage="heating_obj_csv_reader.parse_timestamp"} 2' in text
+        assert 'boiler_softm_stage_rows_in_total{stage="heating_obj_csv_reader.exclude_unused_circuits"} 6' in text
+
+    def test_disabled_metrics_record_nothing(self, reader):
+        sink = metrics.InMemoryMetricsSink()
+        metrics.set_metrics_sink(sink)
+        metrics.set_metrics_sink(None)
+
+        reader.read_heating_obj_from_binary_stream(io.BytesIO(self.csv_content))
+
+        assert sink.records == []
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.regular_grid_frame import SoftMRegularGridFrame
+
+
+class TestSoftMRegularGridFrame:
+    timezone = gettz("Asia/Yekaterinburg")
+    time_tick = TIME_TICK
+    start_timestamp = pd.Timestamp("2021-03-01 00:00", tz=timezone)
+    rows_count = 100
+
+    @pytest.fixture
+    def processed_df(self):
+        random_state = np.random.RandomState(42)
+        return pd.DataFrame({
+            column_names.TIMESTAMP: pd.date_range(
+                self.start_timestamp,
+                periods=self.rows_count,
+                freq=self.time_tick
+            ),
+            column_names.FORWARD_PIPE_COOLANT_TEMP: random_state.uniform(40, 90, self.rows_count),
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: random_state.uniform(30, 50, self.rows_count)
+        })
+
+    def test_frame_is_converted_back_to_df(self, processed_df):
+        frame = SoftMRegularGridFrame.from_df(processed_df, self.time_tick)
+
+        assert len(frame) == self.rows_count
+        assert frame.end == self.start_timestamp + self.rows_count * self.time_tick
+        pd.testing.assert_frame_equal(frame.to_df(), processed_df, check_freq=False)
+
+    def test_float32_frame_halves_memory(self, processed_df):
+        frame = SoftMRegularGridFrame.from_df(processed_df, self.time_tick, dtype=np.float32)
+
+        assert frame.values.flags.c_contiguous
+        assert frame.nbytes * 2 < processed_df.memory_usage(index=False, deep=True).sum()
+        np.testing.assert_allclose(
+            frame.get_column(column_names.FORWARD_PIPE_COOLANT_TEMP),
+            processed_df[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            rtol=1e-6
+        )
+
+    @pytest.mark.parametrize(
+        "min_offset, max_offset",
+        [(None, None), (0, 100), (-50, 10), (17.5, 42), (42, 17), (90, 150), (200, 300), (None, 1.25)]
+    )
+    def test_slicing_equals_filtering(self, processed_df, min_offset, max_offset):
+        frame = SoftMRegularGridFrame.from_df(processed_df, self.time_tick)
+        min_timestamp = None
+        if min_offset is not None:
+            min_timestamp = self.start_timestamp + min_offset * self.time_tick
+        max_timestamp = None
+        if max_offset is not None:
+            max_timestamp = self.start_timestamp + max_offset * self.time_tick
+
+        sliced_frame = frame.slice_by_timestamp(min_timestamp, max_timestamp)
+        expected_df = LeftClosedTimestampFilterAlgorithm().filter_df_by_min_max_timestamp(
+            processed_df,
+            min_timestamp,
+            max_timestamp
+        )
+
+        assert np.shares_memory(sliced_frame.values, frame.values) or len(sliced_frame) == 0
+        pd.testing.assert_frame_equal(sliced_frame.to_df(), expected_df.reset_index(drop=True), check_freq=False)
+
+    def test_empty_df_gives_empty_frame(self, processed_df):
+        empty_df = processed_df.iloc[0:0]
+        frame = SoftMRegularGridFrame.from_df(empty_df, self.time_tick, start=self.start_timestamp)
+
+        assert len(frame) == 0
+        assert frame.start == frame.end == self.start_timestamp
+        pd.testing.assert_frame_equal(frame.to_df(), empty_df, check_freq=False, check_index_type=False)
+        with pytest.raises(ValueError):
+            SoftMRegularGridFrame.from_df(empty_df, self.time_tick)
+
+    def test_irregular_timestamps_are_rejected(self, processed_df):
+        irregular_df = processed_df.drop(index=10)
+
+        with pytest.raises(ValueError):
+            SoftMRegularGridFrame.from_df(irregular_df, self.time_tick)
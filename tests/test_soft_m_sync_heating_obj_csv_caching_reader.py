@@ -0,0 +1,120 @@
+import io
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import circuit_types, column_names
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_caching_reader import \
+    SoftMSyncHeatingObjCSVCachingReader
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+
+
+class TestSoftMSyncHeatingObjCSVCachingReader:
+    timezone = gettz("Asia/Yekaterinburg")
+
+    @pytest.fixture
+    def csv_content(self):
+        rows = ["dTimeStamp;nTC;t1;t2;v1;v2;p1;p2"]
+        for i in range(20):
+            timestamp = f"2021-03-01 {(3 * i) // 60:02d}:{(3 * i) % 60:02d}:00.000"
+            rows.append(f"{timestamp};1;{70 + i},5;{50 + i},25;1,5;1,25;5,5;4,5")
+            rows.append(f"{timestamp};2;{5500 + i};{40 + i},75;0,5;0,25;3,5;2,5")
+        return "\n".join(rows).encode("utf-8")
+
+    def _make_reader(self, need_circuit=circuit_types.HOT_WATER):
+        return SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=SoftMVectorizedTimestampParsingAlgorithm(timezone=self.timezone),
+            need_columns=converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_BOILER_FLOAT_COLUMNS,
+            water_temp_columns=[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            need_circuit=need_circuit
+        )
+
+    def test_cached_reading_equals_reading(self, csv_content, tmp_path):
+        reader = self._make_reader()
+        caching_reader = SoftMSyncHeatingObjCSVCachingReader(reader, str(tmp_path))
+        expected_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        first_df = caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+        cached_df = caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        pd.testing.assert_frame_equal(first_df, expected_df)
+        pd.testing.assert_frame_equal(cached_df, expected_df)
+        assert len(os.listdir(tmp_path)) == 1
+
+    def test_cached_float_columns_are_memory_mapped(self, csv_content, tmp_path):
+        caching_reader = SoftMSyncHeatingObjCSVCachingReader(self._make_reader(), str(tmp_path))
+        caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        cached_df = caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        for column_name in cached_df.select_dtypes("float").columns:
+            values = cached_df[column_name].values
+            while values is not None and not isinstance(values, np.memmap):
+                values = values.base
+            assert isinstance(values, np.memmap), column_name
+
+    def test_entries_of_reader_configs_coexist(self, csv_content, tmp_path, monkeypatch):
+        hot_water_reader = self._make_reader()
+        heating_reader = self._make_reader(need_circuit=circuit_types.HEATING)
+        expected_dfs = {
+            circuit_type: reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+            for circuit_type, reader in ((circuit_types.HOT_WATER, hot_water_reader),
+                                         (circuit_types.HEATING, heating_reader))
+        }
+        caching_readers = {
+            circuit_types.HOT_WATER: SoftMSyncHeatingObjCSVCachingReader(hot_water_reader, str(tmp_path)),
+            circuit_types.HEATING: SoftMSyncHeatingObjCSVCachingReader(heating_reader, str(tmp_path))
+        }
+        for caching_reader in caching_readers.values():
+            caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+        assert len(os.listdir(tmp_path)) == 2
+
+        def fail_reading(self, binary_stream):
+            raise AssertionError("Cached data is read again")
+
+        monkeypatch.setattr(SoftMSyncHeatingObjCSVReader, "read_heating_obj_from_binary_stream", fail_reading)
+        for circuit_type, caching_reader in caching_readers.items():
+            cached_df = caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+            pd.testing.assert_frame_equal(cached_df, expected_dfs[circuit_type])
+        assert len(os.listdir(tmp_path)) == 2
+
+    def test_failed_store_leaves_no_temp_entry(self, csv_content, tmp_path, monkeypatch):
+        caching_reader = SoftMSyncHeatingObjCSVCachingReader(self._make_reader(), str(tmp_path))
+
+        def fail_saving(*args, **kwargs):
+            raise KeyboardInterrupt()
+
+        monkeypatch.setattr(np, "save", fail_saving)
+        with pytest.raises(KeyboardInterrupt):
+            caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+        assert os.listdir(tmp_path) == []
+
+    def test_stale_temp_entries_are_removed(self, csv_content, tmp_path):
+        stale_temp_entry_path = tmp_path / ".stale"
+        stale_temp_entry_path.mkdir()
+        (stale_temp_entry_path / "0.npy").write_bytes(b"0" * 100)
+        stale_time = time.time() - 2 * 60 * 60
+        os.utime(stale_temp_entry_path, (stale_time, stale_time))
+        fresh_temp_entry_path = tmp_path / ".fresh"
+        fresh_temp_entry_path.mkdir()
+        caching_reader = SoftMSyncHeatingObjCSVCachingReader(self._make_reader(), str(tmp_path))
+
+        caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        assert not stale_temp_entry_path.exists()
+        assert fresh_temp_entry_path.exists()
+
+    def test_lru_eviction(self, csv_content, tmp_path):
+        caching_reader = SoftMSyncHeatingObjCSVCachingReader(self._make_reader(), str(tmp_path), 1)
+
+        caching_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        assert os.listdir(tmp_path) == []
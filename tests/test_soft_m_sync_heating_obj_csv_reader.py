@@ -0,0 +1,120 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import circuit_types, column_names
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.data_processing.data_quality import RangeToNaNRule, ScaleIfAboveRule, SoftMDataQualityStage
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_multi_circuit_csv_reader import \
+    SoftMSyncHeatingObjMultiCircuitCSVReader
+
+
+class TestSoftMSyncHeatingObjCSVReader:
+    timezone = gettz("Asia/Yekaterinburg")
+
+    @pytest.fixture
+    def csv_content(self):
+        rows = ["dTimeStamp;nTC;t1;t2;v1;v2;p1;p2;nUnused"]
+        for i in range(20):
+            minutes = 3 * i
+            if i % 2:
+                timestamp = f"01.03.2021 {minutes // 60}:{minutes % 60:02d}"
+            else:
+                timestamp = f"2021-03-01 {minutes // 60:02d}:{minutes % 60:02d}:00.000"
+            rows.append(f"{timestamp};1;{70 + i},5;{50 + i},25;1,5;1,25;5,5;4,5;0")
+            rows.append(f"{timestamp};2;{5500 + i};{40 + i},75;0,5;0,25;3,5;2,5;0")
+        return "\n".join(rows).encode("utf-8")
+
+    @pytest.fixture
+    def timestamp_parser(self):
+        return SoftMVectorizedTimestampParsingAlgorithm(timezone=self.timezone)
+
+    def _make_reader(self, timestamp_parser, need_circuit=circuit_types.HOT_WATER, **kwargs):
+        water_temp_columns = []
+        if need_circuit == circuit_types.HOT_WATER:
+            water_temp_columns = [column_names.FORWARD_PIPE_COOLANT_TEMP]
+        return SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=timestamp_parser,
+            need_columns=converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_BOILER_FLOAT_COLUMNS,
+            water_temp_columns=water_temp_columns,
+            need_circuit=need_circuit,
+            **kwargs
+        )
+
+    def test_read_heating_obj(self, timestamp_parser, csv_content):
+        reader = self._make_reader(timestamp_parser)
+        heating_obj_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        assert len(heating_obj_df) == 20
+        assert list(heating_obj_df.columns) == converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS
+        assert (heating_obj_df[column_names.FORWARD_PIPE_COOLANT_TEMP] < 100).all()
+        assert heating_obj_df[column_names.TIMESTAMP].is_monotonic_increasing
+
+    def test_data_quality_rules(self, timestamp_parser, csv_content):
+        data_quality_stage = SoftMDataQualityStage([
+            ScaleIfAboveRule(column_names.FORWARD_PIPE_COOLANT_TEMP, 100, 100),
+            RangeToNaNRule(column_names.BACKWARD_PIPE_COOLANT_TEMP, max_value=50)
+        ])
+        reader = self._make_reader(timestamp_parser, data_quality_stage=data_quality_stage)
+        heating_obj_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        assert (heating_obj_df[column_names.FORWARD_PIPE_COOLANT_TEMP] < 100).all()
+        assert heating_obj_df[column_names.BACKWARD_PIPE_COOLANT_TEMP].isna().sum() == 10
+        assert reader.data_quality_stage.affected_rows_counts == {
+            f"scale_if_above:{column_names.FORWARD_PIPE_COOLANT_TEMP}": 20,
+            f"range_to_nan:{column_names.BACKWARD_PIPE_COOLANT_TEMP}": 10
+        }
+
+    def test_csv_columns_projection(self, timestamp_parser):
+        reader = SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=timestamp_parser,
+            need_columns=converting_parameters.LYSVA_APARTMENT_HOUSE_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_APARTMENT_HOUSE_FLOAT_COLUMNS,
+            water_temp_columns=[],
+            need_circuit=circuit_types.HEATING
+        )
+
+        assert reader.get_csv_columns_dtypes() == {
+            "nTC": str,
+            "dTimeStamp": str,
+            "t1": np.float64,
+            "t2": np.float64
+        }
+
+    def test_chunked_reading_equals_full_reading(self, timestamp_parser, csv_content):
+        full_reader = self._make_reader(timestamp_parser)
+        chunked_reader = self._make_reader(timestamp_parser, chunk_size=7)
+
+        full_df = full_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+        chunked_df = chunked_reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+
+        pd.testing.assert_frame_equal(chunked_df, full_df)
+
+    def test_iter_chunks(self, timestamp_parser, csv_content):
+        reader = self._make_reader(timestamp_parser)
+        chunks = list(reader.iter_heating_obj_chunks_from_binary_stream(io.BytesIO(csv_content), chunk_size=10))
+
+        assert len(chunks) == 4
+        assert sum(len(chunk) for chunk in chunks) == 20
+
+    @pytest.mark.parametrize("chunk_size", [None, 9])
+    def test_multi_circuit_reading_equals_single_circuit_reading(self, timestamp_parser, csv_content, chunk_size):
+        circuit_readers = [
+            self._make_reader(timestamp_parser, need_circuit=circuit_types.HEATING),
+            self._make_reader(timestamp_parser, need_circuit=circuit_types.HOT_WATER)
+        ]
+        multi_circuit_reader = SoftMSyncHeatingObjMultiCircuitCSVReader(circuit_readers, chunk_size=chunk_size)
+
+        circuits_dfs = multi_circuit_reader.read_heating_obj_circuits_from_binary_stream(io.BytesIO(csv_content))
+
+        assert set(circuits_dfs) == {circuit_types.HEATING, circuit_types.HOT_WATER}
+        for reader in circuit_readers:
+            expected_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(csv_content))
+            pd.testing.assert_frame_equal(circuits_dfs[reader.need_circuit], expected_df)
@@ -0,0 +1,81 @@
+import io
+
+import pandas as pd
+import pytest
+from boiler.constants import circuit_types, column_names
+from dateutil.tz import gettz
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_reader import SoftMSyncHeatingObjCSVReader
+from boiler_softm.heating_obj.io.soft_m_sync_heating_obj_csv_tail_reader import SoftMSyncHeatingObjCSVTailReader
+
+
+class TestSoftMSyncHeatingObjCSVTailReader:
+    timezone = gettz("Asia/Yekaterinburg")
+    header = "dTimeStamp;nTC;t1;t2;v1;v2;p1;p2\n"
+
+    @pytest.fixture
+    def reader(self):
+        return SoftMSyncHeatingObjCSVReader(
+            timestamp_parser=SoftMVectorizedTimestampParsingAlgorithm(timezone=self.timezone),
+            need_columns=converting_parameters.LYSVA_BOILER_AVAILABLE_COLUMNS,
+            float_columns=converting_parameters.LYSVA_BOILER_FLOAT_COLUMNS,
+            water_temp_columns=[column_names.FORWARD_PIPE_COOLANT_TEMP],
+            need_circuit=circuit_types.HOT_WATER
+        )
+
+    @pytest.fixture
+    def file_path(self, tmp_path):
+        file_path = tmp_path / "heating_obj.csv"
+        file_path.write_text(self.header)
+        return file_path
+
+    @staticmethod
+    def _make_lines(start, stop):
+        lines = []
+        for i in range(start, stop):
+            timestamp = f"2021-03-01 {(3 * i) // 60:02d}:{(3 * i) % 60:02d}:00.000"
+            lines.append(f"{timestamp};1;{70 + i},5;{50 + i},25;1,5;1,25;5,5;4,5\n")
+            lines.append(f"{timestamp};2;{5500 + i};{40 + i},75;0,5;0,25;3,5;2,5\n")
+        return "".join(lines)
+
+    @staticmethod
+    def _append(file_path, content):
+        with open(file_path, "a") as f:
+            f.write(content)
+
+    def test_reads_only_appended_rows(self, reader, file_path):
+        tail_reader = SoftMSyncHeatingObjCSVTailReader(reader, str(file_path))
+        self._append(file_path, self._make_lines(0, 10))
+        assert len(tail_reader.read_heating_obj()) == 10
+
+        self._append(file_path, self._make_lines(10, 13))
+        new_df = tail_reader.read_heating_obj()
+
+        full_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(file_path.read_bytes()))
+        pd.testing.assert_frame_equal(new_df, full_df.iloc[10:])
+
+    def test_partial_line_is_read_later(self, reader, file_path):
+        tail_reader = SoftMSyncHeatingObjCSVTailReader(reader, str(file_path), merge_with_previous=True)
+        lines = self._make_lines(0, 5)
+        self._append(file_path, lines[:-10])
+        assert len(tail_reader.read_heating_obj()) == 4
+
+        self._append(file_path, lines[-10:])
+        merged_df = tail_reader.read_heating_obj()
+
+        full_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(file_path.read_bytes()))
+        pd.testing.assert_frame_equal(merged_df, full_df)
+
+    def test_truncated_file_is_fully_read(self, reader, file_path):
+        tail_reader = SoftMSyncHeatingObjCSVTailReader(reader, str(file_path), merge_with_previous=True)
+        self._append(file_path, self._make_lines(0, 10))
+        tail_reader.read_heating_obj()
+
+        file_path.write_text(self.header + self._make_lines(20, 23))
+        merged_df = tail_reader.read_heating_obj()
+
+        full_df = reader.read_heating_obj_from_binary_stream(io.BytesIO(file_path.read_bytes()))
+        pd.testing.assert_frame_equal(merged_df, full_df)
@@ -0,0 +1,95 @@
+import json
+import time
+
+import pytest
+import requests
+from boiler.constants import column_names
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_loader import SoftMLysvaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from soft_m_api_stand_in_server import SoftMAPIStandInServer
+
+
+class TestSoftMSyncHTTPTransport:
+    temp_graph = [
+        {"t": -10, "in_t": 70.5, "out_t": 50.1},
+        {"t": 0, "in_t": 55.0, "out_t": 42.3}
+    ]
+
+    @pytest.fixture
+    def stub_server(self, isolated_soft_m_api_stand_in_server):
+        isolated_soft_m_api_stand_in_server.set_body("getTempGraphic", json.dumps(self.temp_graph).encode("utf-8"))
+        return isolated_soft_m_api_stand_in_server
+
+    @pytest.fixture
+    def api_base(self, stub_server):
+        return stub_server.api_base
+
+    def test_connections_are_reused(self, stub_server, api_base):
+        latencies = []
+        transport = SoftMSyncHTTPTransport(latency_callback=lambda url, status, latency: latencies.append(latency))
+        for _ in range(5):
+            with transport.get(f"{api_base}/JSON", params={"method": "getTempGraphic"}) as response:
+                assert json.loads(response.raw.read()) == self.temp_graph
+        transport.close()
+
+        assert stub_server.requests_count == 5
+        assert len(stub_server.client_ports) == 1
+        assert len(latencies) == 5
+        assert transport.last_latency == latencies[-1]
+
+    def test_failed_requests_are_retried(self, stub_server, api_base):
+        stub_server.enqueue_responses([(503, b"", 0), (502, b"", 0)])
+        transport = SoftMSyncHTTPTransport(max_retries=2, backoff_factor=0.01)
+        with transport.get(f"{api_base}/JSON", params={"method": "getTempGraphic"}) as response:
+            assert response.status_code == 200
+        transport.close()
+
+        assert stub_server.requests_count == 3
+
+    def test_retries_are_bounded(self, stub_server, api_base):
+        stub_server.enqueue_responses([(503, b"", 0)] * 3)
+        transport = SoftMSyncHTTPTransport(max_retries=1, backoff_factor=0.01)
+        with transport.get(f"{api_base}/JSON", params={"method": "getTempGraphic"}) as response:
+            assert response.status_code == 503
+        transport.close()
+
+        assert stub_server.requests_count == 2
+
+    def test_retry_after_is_respected(self):
+        with SoftMAPIStandInServer(max_requests_per_second=1) as server:
+            transport = SoftMSyncHTTPTransport(max_retries=1, backoff_factor=0.01)
+            with transport.get(f"{server.api_base}/JSON", params={"method": "getTempGraphic"}) as response:
+                assert response.status_code == 200
+            start_time = time.monotonic()
+            with transport.get(f"{server.api_base}/JSON", params={"method": "getTempGraphic"}) as response:
+                assert response.status_code == 200
+            elapsed_time = time.monotonic() - start_time
+            transport.close()
+
+        assert server.throttled_count == 1
+        assert elapsed_time >= 1
+
+    def test_stalled_server_times_out(self, stub_server, api_base):
+        stub_server.enqueue_responses([(200, b"[]", 1)])
+        transport = SoftMSyncHTTPTransport(read_timeout=0.1, max_retries=0)
+        with pytest.raises(requests.Timeout):
+            with transport.get(f"{api_base}/JSON", params={"method": "getTempGraphic"}):
+                pass
+        transport.close()
+
+    def test_loader_uses_transport(self, stub_server, api_base):
+        transport = SoftMSyncHTTPTransport()
+        loader = SoftMLysvaSyncTempGraphOnlineLoader(
+            reader=SoftMLysvaSyncTempGraphOnlineReader(),
+            api_base=api_base,
+            transport=transport
+        )
+        temp_graph_df = loader.load_temp_graph()
+        loader.load_temp_graph()
+        transport.close()
+
+        assert list(temp_graph_df[column_names.WEATHER_TEMP]) == [-10, 0]
+        assert list(temp_graph_df[column_names.FORWARD_PIPE_COOLANT_TEMP]) == [70.5, 55.0]
+        assert len(stub_server.client_ports) == 1
@@ -0,0 +1,156 @@
+import datetime
+import json
+
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_loader import \
+    SoftMChernushkaSyncTempGraphOnlineLoader
+from boiler_softm.temp_graph.io.soft_m_chernushka_sync_temp_graph_online_reader import \
+    SoftMChernushkaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.io.soft_m_sync_temp_graph_caching_loader import SoftMSyncTempGraphCachingLoader
+
+
+class _Clock:
+
+    def __init__(self):
+        self.time = 1_600_000_000.0
+
+    def __call__(self):
+        return self.time
+
+
+class TestSoftMSyncTempGraphCachingLoader:
+    refresh_interval = datetime.timedelta(hours=1)
+    temp_graph = [
+        {"t": -10, "forward_t": 68.0, "backward_t": 48.2},
+        {"t": 0, "forward_t": 55.0, "backward_t": 41.0}
+    ]
+
+    @pytest.fixture
+    def stub_server(self, isolated_soft_m_api_stand_in_server):
+        isolated_soft_m_api_stand_in_server.set_body(
+            "ai_getTempGraphic",
+            json.dumps({"data": self.temp_graph}).encode("utf-8")
+        )
+        return isolated_soft_m_api_stand_in_server
+
+    @pytest.fixture
+    def online_loader(self, stub_server):
+        transport = SoftMSyncHTTPTransport(max_retries=0)
+        yield SoftMChernushkaSyncTempGraphOnlineLoader(
+            reader=SoftMChernushkaSyncTempGraphOnlineReader(),
+            boiler_id=1,
+            api_base=stub_server.api_base,
+            transport=transport
+        )
+        transport.close()
+
+    @pytest.fixture
+    def clock(self):
+        return _Clock()
+
+    def _make_caching_loader(self, online_loader, clock, cache_dir):
+        return SoftMSyncTempGraphCachingLoader(
+            online_loader,
+            cache_dir=str(cache_dir),
+            refresh_interval=self.refresh_interval,
+            clock=clock
+        )
+
+    def test_temp_graph_is_cached_in_memory(self, stub_server, online_loader, clock, tmp_path):
+        caching_loader = self._make_caching_loader(online_loader, clock, tmp_path)
+        temp_graph_df = caching_loader.load_temp_graph()
+        cached_temp_graph_df = caching_loader.load_temp_graph()
+
+        assert stub_server.requests_count == 1
+        pd.testing.assert_frame_equal(temp_graph_df, online_loader.load_temp_graph())
+        pd.testing.assert_frame_equal(cached_temp_graph_df, temp_graph_df)
+
+    def test_temp_graph_is_cached_on_disk(self, stub_server, online_loader, clock, tmp_path):
+        temp_graph_df = self._make_caching_loader(online_loader, clock, tmp_path).load_temp_graph()
+        cached_temp_graph_df = self._make_caching_loader(online_loader, clock, tmp_path).load_temp_graph()
+
+        assert stub_server.requests_count == 1
+        pd.testing.assert_frame_equal(cached_temp_graph_df, temp_graph_df)
+
+    def test_changes_are_detected(self, stub_server, online_loader, clock, tmp_path):
+        caching_loader = self._make_caching_loader(online_loader, clock, tmp_path)
+        caching_loader.load_temp_graph()
+        content_hash = caching_loader.content_hash
+
+        clock.time += self.refresh_interval.total_seconds()
+        caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        assert caching_loader.content_hash == content_hash
+
+        changed_temp_graph = [{"t": -10, "forward_t": 70.0, "backward_t": 50.0}]
+        stub_server.set_body("ai_getTempGraphic", json.dumps({"data": changed_temp_graph}).encode("utf-8"))
+        clock.time += self.refresh_interval.total_seconds()
+        stale_temp_graph_df = caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        temp_graph_df = caching_loader.load_temp_graph()
+
+        assert stub_server.requests_count == 3
+        assert len(stale_temp_graph_df) == len(self.temp_graph)
+        assert caching_loader.content_hash != content_hash
+        assert list(temp_graph_df[column_names.FORWARD_PIPE_COOLANT_TEMP]) == [70.0]
+
+    def test_last_good_temp_graph_is_served_on_failure(self, stub_server, online_loader, clock, tmp_path):
+        expected_df = self._make_caching_loader(online_loader, clock, tmp_path).load_temp_graph()
+        stub_server.enqueue_responses([(503, b"", 0)])
+        clock.time += self.refresh_interval.total_seconds()
+
+        caching_loader = self._make_caching_loader(online_loader, clock, tmp_path)
+        temp_graph_df = caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+
+        assert stub_server.requests_count == 2
+        pd.testing.assert_frame_equal(temp_graph_df, expected_df)
+        pd.testing.assert_frame_equal(caching_loader.load_temp_graph(), expected_df)
+
+    def test_invalid_temp_graph_does_not_replace_last_good_one(self, stub_server, online_loader, clock, tmp_path):
+        expected_df = self._make_caching_loader(online_loader, clock, tmp_path).load_temp_graph()
+        stub_server.set_body("ai_getTempGraphic", json.dumps({"data": None}).encode("utf-8"))
+        clock.time += self.refresh_interval.total_seconds()
+
+        caching_loader = self._make_caching_loader(online_loader, clock, tmp_path)
+        caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        with pytest.raises(ValueError):
+            caching_loader.refresh()
+
+        assert stub_server.requests_count == 3
+        pd.testing.assert_frame_equal(caching_loader.load_temp_graph(), expected_df)
+        pd.testing.assert_frame_equal(
+            self._make_caching_loader(online_loader, clock, tmp_path).load_temp_graph(),
+            expected_df
+        )
+
+    def test_failed_refresh_is_retried_after_retry_interval(self, stub_server, online_loader, clock, tmp_path):
+        caching_loader = SoftMSyncTempGraphCachingLoader(
+            online_loader,
+            cache_dir=str(tmp_path),
+            refresh_interval=self.refresh_interval,
+            refresh_retry_interval=datetime.timedelta(minutes=5),
+            clock=clock
+        )
+        caching_loader.load_temp_graph()
+        stub_server.enqueue_responses([(503, b"", 0)])
+        clock.time += self.refresh_interval.total_seconds()
+
+        caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        assert stub_server.requests_count == 2
+
+        clock.time += datetime.timedelta(minutes=4).total_seconds()
+        caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        assert stub_server.requests_count == 2
+
+        clock.time += datetime.timedelta(minutes=1).total_seconds()
+        caching_loader.load_temp_graph()
+        caching_loader.wait_for_refresh()
+        assert stub_server.requests_count == 3
@@ -0,0 +1,140 @@
+import datetime
+import json
+import threading
+import time
+
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from dateutil.tz import gettz
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_caching_loader import SoftMSyncWeatherForecastCachingLoader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+
+
+class _Clock:
+
+    def __init__(self):
+        self.time = 0.0
+
+    def __call__(self):
+        return self.time
+
+
+class TestSoftMSyncWeatherForecastCachingLoader:
+    timezone = gettz("Asia/Yekaterinburg")
+    ttl = datetime.timedelta(minutes=30)
+    stale_ttl = datetime.timedelta(hours=1)
+    refresh_retry_interval = datetime.timedelta(minutes=5)
+    weather_forecast = [
+        {"date": "2021-03-01", "time": f"{hour:02}:00", "temp": -float(hour)}
+        for hour in range(0, 24, 3)
+    ]
+
+    @pytest.fixture
+    def stub_server(self, isolated_soft_m_api_stand_in_server):
+        isolated_soft_m_api_stand_in_server.set_body("getPrognozT", json.dumps(self.weather_forecast).encode("utf-8"))
+        return isolated_soft_m_api_stand_in_server
+
+    @pytest.fixture
+    def online_loader(self, stub_server):
+        transport = SoftMSyncHTTPTransport(max_retries=0)
+        yield SoftMSyncWeatherForecastOnlineLoader(
+            reader=SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone),
+            server_address=stub_server.api_base,
+            transport=transport
+        )
+        transport.close()
+
+    @pytest.fixture
+    def clock(self):
+        return _Clock()
+
+    @pytest.fixture
+    def caching_loader(self, online_loader, clock):
+        return SoftMSyncWeatherForecastCachingLoader(
+            online_loader,
+            ttl=self.ttl,
+            stale_ttl=self.stale_ttl,
+            refresh_retry_interval=self.refresh_retry_interval,
+            clock=clock
+        )
+
+    def test_windows_are_sliced_from_cache(self, stub_server, online_loader, caching_loader):
+        windows = [
+            (None, None),
+            (pd.Timestamp("2021-03-01 03:00", tz=self.timezone), pd.Timestamp("2021-03-01 12:00", tz=self.timezone)),
+            (pd.Timestamp("2021-03-01 10:00", tz=self.timezone), None)
+        ]
+        for start_datetime, end_datetime in windows:
+            weather_df = caching_loader.load_weather(start_datetime, end_datetime)
+            expected_df = online_loader.load_weather(start_datetime, end_datetime)
+            pd.testing.assert_frame_equal(weather_df, expected_df)
+
+        assert stub_server.requests_count == 1 + len(windows)
+
+    def test_expired_cache_is_revalidated(self, stub_server, caching_loader, clock):
+        expected_df = caching_loader.load_weather()
+        clock.time += self.ttl.total_seconds() + self.stale_ttl.total_seconds() + 1
+        weather_df = caching_loader.load_weather()
+
+        assert stub_server.requests_count == 2
+        pd.testing.assert_frame_equal(weather_df, expected_df)
+
+    def test_stale_cache_is_served_while_refreshing(self, stub_server, caching_loader, clock):
+        caching_loader.load_weather()
+        new_weather_forecast = [{"date": "2021-03-02", "time": "00:00", "temp": 1.0}]
+        stub_server.set_body("getPrognozT", json.dumps(new_weather_forecast).encode("utf-8"))
+        stub_server.latency = 0.2
+        clock.time += self.ttl.total_seconds() + 1
+
+        stale_weather_df = caching_loader.load_weather()
+        assert len(stale_weather_df) == len(self.weather_forecast)
+
+        caching_loader.invalidate()
+        clock.time += 1
+        weather_df = caching_loader.load_weather()
+        assert list(weather_df[column_names.WEATHER_TEMP]) == [1.0]
+
+    def test_concurrent_callers_share_request(self, stub_server, caching_loader):
+        stub_server.latency = 0.3
+        weather_dfs = []
+        threads = [
+            threading.Thread(target=lambda: weather_dfs.append(caching_loader.load_weather()))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert stub_server.requests_count == 1
+        assert len(weather_dfs) == 8
+        for weather_df in weather_dfs:
+            assert len(weather_df) == len(self.weather_forecast)
+
+    def test_error_is_raised_without_cache(self, stub_server, caching_loader):
+        stub_server.enqueue_responses([(200, b"not json", 0)])
+        with pytest.raises(ValueError):
+            caching_loader.load_weather()
+        assert len(caching_loader.load_weather()) == len(self.weather_forecast)
+
+    def test_failed_refresh_is_retried_after_retry_interval(self, stub_server, caching_loader, clock):
+        caching_loader.load_weather()
+        stub_server.enqueue_responses([(503, b"", 0)] * 100)
+        clock.time += self.ttl.total_seconds() + 1
+
+        for _ in range(50):
+            assert len(caching_loader.load_weather()) == len(self.weather_forecast)
+            time.sleep(0.002)
+        assert stub_server.requests_count == 2
+
+        requests_count = stub_server.requests_count
+        clock.time += self.refresh_retry_interval.total_seconds()
+        assert len(caching_loader.load_weather()) == len(self.weather_forecast)
+        deadline = time.monotonic() + 5
+        while stub_server.requests_count == requests_count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert stub_server.requests_count == requests_count + 1
@@ -0,0 +1,124 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+from boiler.data_processing.beetween_filter_algorithm import FullClosedTimestampFilterAlgorithm
+from boiler.data_processing.beetween_filter_algorithm import LeftClosedTimestampFilterAlgorithm
+from dateutil.tz import gettz
+
+from boiler_softm.io.soft_m_sync_http_transport import SoftMSyncHTTPTransport
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
+from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
+
+
+class TestSoftMSyncWeatherForecastJSONReader:
+    timezone = gettz("Asia/Yekaterinburg")
+
+    @pytest.fixture
+    def weather_forecast(self):
+        random_state = np.random.RandomState(42)
+        timestamps = pd.date_range("2021-03-01", periods=2000, freq="H")
+        return [
+            {"date": timestamp.strftime("%Y-%m-%d"), "time": timestamp.strftime("%H:%M"), "temp": round(temp, 1)}
+            for timestamp, temp in zip(timestamps, random_state.uniform(-30, 10, len(timestamps)))
+        ]
+
+    @staticmethod
+    def _to_binary_stream(weather_forecast):
+        return io.BytesIO(json.dumps(weather_forecast).encode("utf-8"))
+
+    def test_timestamps_equal_string_parsing(self, weather_forecast):
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone)
+        weather_df = reader.read_weather_from_binary_stream(self._to_binary_stream(weather_forecast))
+
+        expected_timestamps = pd.to_datetime(
+            pd.Series([f"{item['date']} {item['time']}" for item in weather_forecast])
+        ).dt.tz_localize(self.timezone)
+        pd.testing.assert_series_equal(weather_df[column_names.TIMESTAMP], expected_timestamps, check_names=False)
+        assert list(weather_df[column_names.WEATHER_TEMP]) == [item["temp"] for item in weather_forecast]
+
+    def test_dst_timestamps_equal_localization(self):
+        timezone = gettz("Europe/Berlin")
+        timestamps = pd.date_range("2021-03-27", "2021-11-01", freq="30min")
+        weather_forecast = [
+            {"date": timestamp.strftime("%Y-%m-%d"), "time": timestamp.strftime("%H:%M"), "temp": 0.0}
+            for timestamp in timestamps
+        ]
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=timezone)
+        weather_df = reader.read_weather_from_binary_stream(self._to_binary_stream(weather_forecast))
+
+        expected_timestamps = timestamps.tz_localize(timezone, ambiguous=False, nonexistent="shift_forward")
+        assert list(weather_df[column_names.TIMESTAMP]) == list(expected_timestamps)
+
+    def test_dst_transitions_are_deterministic(self):
+        timezone = gettz("Europe/Berlin")
+        weather_forecast = [
+            {"date": "2021-03-28", "time": "02:30", "temp": 1.0},
+            {"date": "2021-10-31", "time": "02:30", "temp": 2.0}
+        ]
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=timezone)
+        weather_df = reader.read_weather_from_binary_stream(self._to_binary_stream(weather_forecast))
+
+        assert list(weather_df[column_names.TIMESTAMP]) == [
+            pd.Timestamp("2021-03-28 03:00", tz=timezone),
+            pd.Timestamp("2021-10-31 01:30", tz="UTC").tz_convert(timezone)
+        ]
+
+        strict_reader = SoftMSyncWeatherForecastJSONReader(
+            weather_data_timezone=timezone,
+            ambiguous_timestamp_policy="raise",
+            nonexistent_timestamp_policy="raise"
+        )
+        with pytest.raises(Exception):
+            strict_reader.read_weather_from_binary_stream(self._to_binary_stream(weather_forecast))
+
+    def test_window_keeps_rows_in_window(self, weather_forecast):
+        reader = SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone)
+        start_datetime = pd.Timestamp("2021-03-20 05:00", tz="UTC")
+        end_datetime = pd.Timestamp("2021-03-22 21:00", tz="UTC")
+        weather_df = reader.read_weather_from_binary_stream(
+            self._to_binary_stream(weather_forecast),
+            start_datetime,
+            end_datetime
+        )
+        full_weather_df = reader.read_weather_from_binary_stream(self._to_binary_stream(weather_forecast))
+        timestamps = full_weather_df[column_names.TIMESTAMP]
+        in_window_df = full_weather_df[(timestamps >= start_datetime) & (timestamps <= end_datetime)]
+
+        assert len(weather_df) < len(full_weather_df)
+        assert set(in_window_df[column_names.TIMESTAMP]) <= set(weather_df[column_names.TIMESTAMP])
+
+    @pytest.mark.parametrize(
+        "timestamp_filter_algorithm",
+        [LeftClosedTimestampFilterAlgorithm(), FullClosedTimestampFilterAlgorithm()]
+    )
+    def test_loader_window_equals_filtering(self,
+                                            weather_forecast,
+                                            isolated_soft_m_api_stand_in_server,
+                                            timestamp_filter_algorithm):
+        isolated_soft_m_api_stand_in_server.set_body("getPrognozT", json.dumps(weather_forecast).encode("utf-8"))
+        transport = SoftMSyncHTTPTransport()
+        loader = SoftMSyncWeatherForecastOnlineLoader(
+            reader=SoftMSyncWeatherForecastJSONReader(weather_data_timezone=self.timezone),
+            timestamp_filter_algorithm=timestamp_filter_algorithm,
+            server_address=isolated_soft_m_api_stand_in_server.api_base,
+            transport=transport
+        )
+        full_weather_df, _ = loader.load_weather_if_modified()
+        windows = [
+            (pd.Timestamp("2021-03-20 00:00", tz=self.timezone), pd.Timestamp("2021-03-21 00:00", tz=self.timezone)),
+            (pd.Timestamp("2021-03-20 23:00", tz="UTC"), None),
+            (None, pd.Timestamp("2021-03-02 03:00", tz=self.timezone))
+        ]
+        for start_datetime, end_datetime in windows:
+            weather_df = loader.load_weather(start_datetime, end_datetime)
+            expected_df = timestamp_filter_algorithm.filter_df_by_min_max_timestamp(
+                full_weather_df,
+                start_datetime,
+                end_datetime
+            )
+            pd.testing.assert_frame_equal(weather_df, expected_df, check_index_type=False)
+        transport.close()
@@ -16,7 +16,7 @@ class TestSoftMSyncWeatherForecastOnlineLoader:
         return SoftMSyncWeatherForecastJSONReader(weather_data_timezone=gettz("Asia/Yekaterinburg"))
 
     @pytest.fixture
-    def loader(self, reader, is_need_proxy, proxy_address):
+    def loader(self, reader, is_need_proxy, proxy_address, lysva_api_base):
         http_proxy = None
         https_proxy = None
         if is_need_proxy:
@@ -24,6 +24,7 @@ class TestSoftMSyncWeatherForecastOnlineLoader:
             https_proxy = proxy_address
         loader = SoftMSyncWeatherForecastOnlineLoader(
             reader=reader,
+            server_address=lysva_api_base,
             http_proxy=http_proxy,
             https_proxy=https_proxy
         )
@@ -0,0 +1,87 @@
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from boiler.constants import column_names
+
+from boiler_softm.constants import processing
+from boiler_softm.temp_graph.io.soft_m_lysva_sync_temp_graph_online_reader import SoftMLysvaSyncTempGraphOnlineReader
+from boiler_softm.temp_graph.temp_graph_lookup import SoftMTempGraphLookup
+
+
+class TestSoftMTempGraphLookup:
+
+    @pytest.fixture
+    def temp_graph_df(self):
+        weather_temps = np.arange(10, -41, -1, dtype=np.float64)
+        return pd.DataFrame({
+            column_names.WEATHER_TEMP: weather_temps,
+            column_names.FORWARD_PIPE_COOLANT_TEMP: 60 - weather_temps,
+            column_names.BACKWARD_PIPE_COOLANT_TEMP: 45 - weather_temps / 2
+        })
+
+    @pytest.fixture
+    def weather_temps(self):
+        random_state = np.random.RandomState(42)
+        weather_temps = pd.Series(random_state.uniform(-50, 20, 1000), index=np.arange(1000) * 2)
+        weather_temps.iloc[[0, 10]] = [-5.0, np.nan]
+        return weather_temps
+
+    @staticmethod
+    def _lookup_by_filtering(temp_graph_df, weather_temp, lookup_method):
+        graph_weather_temps = temp_graph_df[column_names.WEATHER_TEMP]
+        if lookup_method == processing.TEMP_GRAPH_LOOKUP_FLOOR:
+            points_df = temp_graph_df[graph_weather_temps <= weather_temp]
+            if points_df.empty:
+                points_df = temp_graph_df[graph_weather_temps == graph_weather_temps.min()]
+            point = points_df.loc[points_df[column_names.WEATHER_TEMP].idxmax()]
+        else:
+            distances = (graph_weather_temps - weather_temp).abs()
+            point = temp_graph_df[distances == distances.min()].sort_values(column_names.WEATHER_TEMP).iloc[0]
+        return point[column_names.FORWARD_PIPE_COOLANT_TEMP], point[column_names.BACKWARD_PIPE_COOLANT_TEMP]
+
+    @pytest.mark.parametrize("lookup_method", [processing.TEMP_GRAPH_LOOKUP_NEAREST, processing.TEMP_GRAPH_LOOKUP_FLOOR])
+    def test_lookup_equals_filtering(self, temp_graph_df, weather_temps, lookup_method):
+        temp_graph_lookup = SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df, lookup_method)
+        required_temps_df = temp_graph_lookup.lookup(weather_temps)
+
+        assert required_temps_df.index.equals(weather_temps.index)
+        for weather_temp, (forward_temp, backward_temp) in zip(weather_temps, required_temps_df.to_numpy()):
+            if np.isnan(weather_temp):
+                assert np.isnan(forward_temp) and np.isnan(backward_temp)
+            else:
+                assert (forward_temp, backward_temp) == self._lookup_by_filtering(
+                    temp_graph_df,
+                    weather_temp,
+                    lookup_method
+                )
+
+    def test_linear_lookup(self, temp_graph_df):
+        temp_graph_lookup = SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df)
+        forward_temps, backward_temps = temp_graph_lookup.lookup_arrays(
+            np.array([-5.5, 12.0, -45.0]),
+            processing.TEMP_GRAPH_LOOKUP_LINEAR
+        )
+
+        np.testing.assert_allclose(forward_temps, [65.5, 50.0, 100.0])
+        np.testing.assert_allclose(backward_temps, [47.75, 40.0, 65.0])
+
+    def test_nearest_lookup_ties_to_colder_point(self, temp_graph_df):
+        temp_graph_lookup = SoftMTempGraphLookup.from_temp_graph_df(temp_graph_df)
+        forward_temps, _ = temp_graph_lookup.lookup_arrays(np.array([-5.5, -5.0]))
+
+        np.testing.assert_allclose(forward_temps, [66.0, 65.0])
+
+    def test_reader_produces_lookup(self, temp_graph_df):
+        temp_graph_json = json.dumps([
+            {"t": weather_temp, "in_t": forward_temp, "out_t": backward_temp}
+            for weather_temp, forward_temp, backward_temp in temp_graph_df.to_numpy()
+        ]).encode("utf-8")
+        reader = SoftMLysvaSyncTempGraphOnlineReader()
+        temp_graph_lookup = reader.read_temp_graph_lookup_from_binary_stream(io.BytesIO(temp_graph_json))
+        forward_temps, backward_temps = temp_graph_lookup.lookup_arrays(np.array([-20.0]))
+
+        np.testing.assert_allclose(forward_temps, [80.0])
+        np.testing.assert_allclose(backward_temps, [55.0])
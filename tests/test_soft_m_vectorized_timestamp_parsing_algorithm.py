@@ -0,0 +1,60 @@
+import pandas as pd
+import pytest
+from dateutil.tz import gettz
+# noinspection PyProtectedMember
+from pandas.api.types import is_datetime64tz_dtype
+
+from boiler_softm.constants import converting_parameters
+from boiler_softm.data_processing.vectorized_timestamp_parsing_algorithm import \
+    SoftMVectorizedTimestampParsingAlgorithm
+
+
+class TestSoftMVectorizedTimestampParsingAlgorithm:
+    timezone = gettz("Asia/Yekaterinburg")
+
+    @pytest.fixture
+    def datetime_series(self):
+        return pd.Series([
+            "2021-03-01 00:03:00.000",
+            "01.03.2021 0:06",
+            "2021-03-01 00:09:00.000",
+            "01.03.2021 10:12",
+            "2021-03-01T00:15"
+        ])
+
+    @pytest.fixture
+    def fallback_parser(self):
+        class IsoFormatParser:
+            def __init__(self, timezone):
+                self._timezone = timezone
+
+            def parse_datetime(self, datetime_as_str):
+                return pd.Timestamp(datetime_as_str, tz=self._timezone)
+
+        return IsoFormatParser(self.timezone)
+
+    @pytest.fixture
+    def parser(self, fallback_parser):
+        return SoftMVectorizedTimestampParsingAlgorithm(
+            timezone=self.timezone,
+            fallback_parser=fallback_parser
+        )
+
+    def test_parse_series_equals_per_row_parsing(self, parser, datetime_series):
+        parsed = parser.parse_series(datetime_series)
+        expected = datetime_series.apply(parser.parse_datetime)
+
+        assert is_datetime64tz_dtype(parsed)
+        pd.testing.assert_series_equal(parsed, expected)
+
+    def test_pattern_match_counts(self, parser, datetime_series):
+        parser.parse_series(datetime_series)
+
+        iso_pattern, dotted_pattern = converting_parameters.LYSVA_HEATING_OBJ_TIMESTAMP_PARSING_PATTERNS
+        assert parser.last_pattern_match_counts == {iso_pattern: 2, dotted_pattern: 2}
+        assert parser.last_fallback_count == 1
+
+    def test_not_matched_without_fallback(self, datetime_series):
+        parser = SoftMVectorizedTimestampParsingAlgorithm(timezone=self.timezone)
+        with pytest.raises(ValueError):
+            parser.parse_series(datetime_series)
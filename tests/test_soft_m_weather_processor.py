@@ -1,17 +1,20 @@
+import numpy as np
 import pytest
 import pandas as pd
 from dateutil.tz import gettz
 from boiler.constants import column_names, dataset_prototypes
 from boiler.data_processing.beetween_filter_algorithm import FullClosedTimestampFilterAlgorithm
-from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm
+from boiler.data_processing.timestamp_round_algorithm import CeilTimestampRoundAlgorithm, FloorTimestampRoundAlgorithm
 from boiler.data_processing.timestamp_interpolator_algorithm import TimestampInterpolationAlgorithm
 from boiler.data_processing.value_interpolation_algorithm import LinearInsideValueInterpolationAlgorithm
 from boiler.data_processing.value_interpolation_algorithm import LinearOutsideValueInterpolationAlgorithm
 
 from boiler_softm.constants.time_tick import TIME_TICK
+from boiler_softm.data_processing.grid_resampler import SoftMGridResampler
 from boiler_softm.weather.io.soft_m_sync_weather_forecast_online_loader import SoftMSyncWeatherForecastOnlineLoader
 from boiler_softm.weather.io.soft_m_sync_weather_forecast_json_reader import SoftMSyncWeatherForecastJSONReader
 from boiler_softm.weather.processing import SoftMWeatherProcessor
+from boiler_softm.weather.processing_cache import SoftMWeatherProcessingCache
 
 
 class TestSoftMWeatherProcessor:
@@ -25,7 +28,7 @@ class TestSoftMWeatherProcessor:
         return SoftMSyncWeatherForecastJSONReader(weather_data_timezone=gettz("Asia/Yekaterinburg"))
 
     @pytest.fixture
-    def loader(self, reader, is_need_proxy, proxy_address):
+    def loader(self, reader, is_need_proxy, proxy_address, lysva_api_base):
         http_proxy = None
         https_proxy = None
         if is_need_proxy:
@@ -33,6 +36,7 @@ class TestSoftMWeatherProcessor:
             https_proxy = proxy_address
         loader = SoftMSyncWeatherForecastOnlineLoader(
             reader=reader,
+            server_address=lysva_api_base,
             http_proxy=http_proxy,
             https_proxy=https_proxy
         )
@@ -44,6 +48,22 @@ class TestSoftMWeatherProcessor:
 
     @pytest.fixture
     def processor(self, timestamp_round_algorithm):
+        return self._make_processor(timestamp_round_algorithm)
+
+    @pytest.fixture
+    def weather_df(self):
+        random_state = np.random.RandomState(42)
+        timestamps = pd.date_range(
+            self.start_timestamp.floor("H") - pd.Timedelta(hours=2),
+            self.end_timestamp.ceil("H") + pd.Timedelta(hours=2),
+            freq="H"
+        )
+        return pd.DataFrame({
+            column_names.TIMESTAMP: timestamps,
+            column_names.WEATHER_TEMP: random_state.uniform(-30, 30, len(timestamps))
+        })
+
+    def _make_processor(self, timestamp_round_algorithm, **kwargs):
         return SoftMWeatherProcessor(
             timestamp_round_algorithm=timestamp_round_algorithm,
             timestamp_interpolation_algorithm=TimestampInterpolationAlgorithm(
@@ -52,7 +72,8 @@ class TestSoftMWeatherProcessor:
             ),
             timestamp_filter_algorithm=FullClosedTimestampFilterAlgorithm(),
             border_values_interpolation_algorithm=LinearInsideValueInterpolationAlgorithm(),
-            internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm()
+            internal_values_interpolation_algorithm=LinearOutsideValueInterpolationAlgorithm(),
+            **kwargs
         )
 
     def test_processor(self, loader, processor, timestamp_round_algorithm):
@@ -77,3 +98,135 @@ class TestSoftMWeatherProcessor:
         timestamp_list = processed_forecast[column_names.TIMESTAMP].to_list()
         for i in range(0, len(timestamp_list)-1):
             assert timestamp_list[i] + self.time_tick == timestamp_list[i+1]
+
+    def test_copy_free_processing_equals_copying_processing(self, processor, weather_df, timestamp_round_algorithm):
+        copy_free_processor = self._make_processor(timestamp_round_algorithm, copy_input_df=False)
+        input_df = weather_df.copy()
+
+        expected_df = processor.process_weather_df(input_df, self.start_timestamp, self.end_timestamp)
+        pd.testing.assert_frame_equal(input_df, weather_df)
+        processed_df = copy_free_processor.process_weather_df(input_df, self.start_timestamp, self.end_timestamp)
+
+        pd.testing.assert_frame_equal(processed_df, expected_df)
+
+    def test_regular_grid_equals_processed_df(self, processor, weather_df):
+        expected_df = processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        frame = processor.process_weather_df_to_regular_grid(
+            weather_df,
+            self.start_timestamp,
+            self.end_timestamp,
+            time_tick=self.time_tick
+        )
+
+        pd.testing.assert_frame_equal(
+            frame.to_df(),
+            expected_df[[column_names.TIMESTAMP, column_names.WEATHER_TEMP]].reset_index(drop=True),
+            check_freq=False
+        )
+
+    def test_fused_processing_equals_chained_processing(self, processor, weather_df, timestamp_round_algorithm):
+        fused_processor = self._make_processor(
+            timestamp_round_algorithm,
+            grid_resampler=SoftMGridResampler(timestamp_round_algorithm, self.time_tick)
+        )
+        weather_df = pd.concat([weather_df, weather_df.iloc[[3, 5]]], ignore_index=True)
+        weather_df.loc[0, column_names.TIMESTAMP] = pd.NaT
+        weather_df = weather_df.sample(frac=1, random_state=1)
+
+        for min_required_timestamp, max_required_timestamp in (
+                (self.start_timestamp, self.end_timestamp),
+                (self.start_timestamp - pd.Timedelta(hours=5), self.end_timestamp + pd.Timedelta(hours=5)),
+                (None, None)
+        ):
+            expected_df = processor.process_weather_df(weather_df, min_required_timestamp, max_required_timestamp)
+            processed_df = fused_processor.process_weather_df(
+                weather_df,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+            pd.testing.assert_frame_equal(processed_df, expected_df, check_index_type=False, check_freq=False)
+
+    @pytest.mark.parametrize("is_need_grid_resampler", [False, True])
+    def test_cached_processing_equals_processing(self, processor, weather_df, is_need_grid_resampler):
+        timestamp_round_algorithm = FloorTimestampRoundAlgorithm(round_step=self.time_tick)
+        processor = self._make_processor(timestamp_round_algorithm)
+        kwargs = {}
+        if is_need_grid_resampler:
+            kwargs["grid_resampler"] = SoftMGridResampler(timestamp_round_algorithm, self.time_tick)
+        processing_cache = SoftMWeatherProcessingCache()
+        caching_processor = self._make_processor(timestamp_round_algorithm, processing_cache=processing_cache, **kwargs)
+        hour = pd.Timedelta(hours=1)
+        windows = (
+            (self.start_timestamp, self.end_timestamp),
+            (self.start_timestamp + hour, self.end_timestamp - hour),
+            (self.start_timestamp - 10 * hour, self.end_timestamp),
+            (self.start_timestamp - 5 * hour, None),
+            (None, self.end_timestamp + 10 * hour),
+            (None, None),
+            (self.start_timestamp + 2 * hour, self.start_timestamp - hour),
+            (self.start_timestamp - 30 * hour, self.start_timestamp - 20 * hour)
+        )
+
+        for min_required_timestamp, max_required_timestamp in windows:
+            expected_df = processor.process_weather_df(weather_df, min_required_timestamp, max_required_timestamp)
+            processed_df = caching_processor.process_weather_df(
+                weather_df,
+                min_required_timestamp,
+                max_required_timestamp
+            )
+            pd.testing.assert_frame_equal(processed_df, expected_df, check_index_type=False, check_freq=False)
+
+        assert len(processing_cache) == 1
+        assert processing_cache.hits_count == 4
+        assert processing_cache.misses_count == 4
+
+    def test_cached_result_is_not_changed_by_caller(self, processor, weather_df, timestamp_round_algorithm):
+        caching_processor = self._make_processor(
+            timestamp_round_algorithm,
+            processing_cache=SoftMWeatherProcessingCache()
+        )
+        expected_df = processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+
+        processed_df = caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        processed_df[column_names.WEATHER_TEMP] = 0.0
+        processed_df = caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+
+        pd.testing.assert_frame_equal(processed_df, expected_df, check_index_type=False)
+
+    def test_processing_cache_keys(self, processor, weather_df, timestamp_round_algorithm):
+        processing_cache = SoftMWeatherProcessingCache(max_entries_count=2)
+        caching_processor = self._make_processor(timestamp_round_algorithm, processing_cache=processing_cache)
+        floor_round_algorithm = FloorTimestampRoundAlgorithm(round_step=self.time_tick)
+        other_caching_processor = self._make_processor(floor_round_algorithm, processing_cache=processing_cache)
+        changed_weather_df = weather_df.copy()
+        changed_weather_df.loc[3, column_names.WEATHER_TEMP] += 1
+
+        caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        processed_df = other_caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        pd.testing.assert_frame_equal(
+            processed_df,
+            self._make_processor(floor_round_algorithm).process_weather_df(
+                weather_df,
+                self.start_timestamp,
+                self.end_timestamp
+            ),
+            check_index_type=False
+        )
+        processed_df = caching_processor.process_weather_df(
+            changed_weather_df,
+            self.start_timestamp,
+            self.end_timestamp
+        )
+        pd.testing.assert_frame_equal(
+            processed_df,
+            processor.process_weather_df(changed_weather_df, self.start_timestamp, self.end_timestamp),
+            check_index_type=False
+        )
+        assert processing_cache.misses_count == 3
+        assert len(processing_cache) == 2
+
+        # Entry of the first processor is the least recently used one and is evicted
+        caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        assert processing_cache.misses_count == 4
+        other_caching_processor.process_weather_df(weather_df, self.start_timestamp, self.end_timestamp)
+        assert processing_cache.misses_count == 5